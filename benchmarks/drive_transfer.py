@@ -0,0 +1,147 @@
+"""
+Drive transfer benchmark: uploads a generated file through the resumable
+upload path and downloads it back through the parallel ranged download path,
+against the fake Drive endpoints running in a separate process. Reports
+throughput and this process's peak RSS above its baseline, which should stay
+near `drive_download_prefetch` × `drive_chunk_size_bytes` whatever the size.
+
+Usage (from the repository root):
+
+    python -m benchmarks.drive_transfer --size-mb 1024 --chunk-mb 8 --prefetch 4 \\
+        --drive-latency-ms 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+from benchmarks.scenarios import DEFAULT_ENV, ROOT_DIR, SRC_DIR, free_port, spawn
+
+MB = 1024 * 1024
+
+
+def write_source(path: Path, size: int) -> str:
+    """Writes `size` pseudo-random bytes in 8 MB blocks; returns the MD5."""
+    digest = hashlib.md5()
+    block = os.urandom(8 * MB)
+    with path.open("wb") as out:
+        for start in range(0, size, len(block)):
+            data = block[: min(len(block), size - start)]
+            out.write(data)
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class PeakRss:
+    """Samples this process's RSS while a transfer runs."""
+
+    def __init__(self) -> None:
+        self._process = psutil.Process()
+        self.baseline = self._process.memory_info().rss
+        self.peak = self.baseline
+        self._task = None
+
+    async def _sample(self) -> None:
+        while True:
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            await asyncio.sleep(0.05)
+
+    async def __aenter__(self) -> "PeakRss":
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._task.cancel()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+def report(direction: str, size: int, elapsed: float, rss: PeakRss) -> None:
+    print(
+        f"{direction:<9} {size / MB:8.0f} MB {elapsed:8.2f} s "
+        f"{size / MB / elapsed:8.1f} MB/s  "
+        f"peak RSS +{(rss.peak - rss.baseline) / MB:.0f} MB",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace, fake_url: str, workdir: Path) -> int:
+    # Imported after the settings environment is in place
+    from google.oauth2.credentials import Credentials
+
+    from services.drive_service import download_file, get_file_metadata, upload_file
+
+    creds = Credentials("fake-token")
+    size = args.size_mb * MB
+    source = workdir / "source.bin"
+    expected_md5 = write_source(source, size)
+
+    async with PeakRss() as rss:
+        started = time.perf_counter()
+        uploaded = await upload_file(creds, "bench", source)
+        report("upload", size, time.perf_counter() - started, rss)
+
+    # Only the downloaded copy is needed from here on
+    source.unlink()
+    metadata = await get_file_metadata(creds, "bench", uploaded["id"])
+    target = workdir / "download.bin"
+    async with PeakRss() as rss:
+        started = time.perf_counter()
+        downloaded = await download_file(creds, "bench", metadata, target)
+        report("download", size, time.perf_counter() - started, rss)
+
+    if downloaded["md5Checksum"] != expected_md5:
+        print("CHECKSUM MISMATCH after the round trip", file=sys.stderr)
+        return 1
+    return 0
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    port = free_port()
+    fake_url = f"http://127.0.0.1:{port}/"
+    fake_args = [sys.executable, "-m", "benchmarks.fake_google", "--port", str(port)]
+    fake_args += [
+        f"--drive-latency-ms={args.drive_latency_ms}",
+        f"--drive-error-rate={args.drive_error_rate}",
+    ]
+    fake_env = {**os.environ, "PYTHONPATH": str(ROOT_DIR)}
+
+    os.environ.update(
+        {
+            "GOOGLE_API_ENDPOINT": fake_url,
+            "GOOGLE_TOKEN_URI": f"{fake_url}token",
+            "DRIVE_CHUNK_SIZE_BYTES": str(args.chunk_mb * MB),
+            "DRIVE_DOWNLOAD_PREFETCH": str(args.prefetch),
+        }
+    )
+
+    async with spawn(fake_args, fake_env, f"{fake_url}_stats"):
+        with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+            return await run(args, fake_url, Path(workdir))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Drive transfer benchmark")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    parser.add_argument("--prefetch", type=int, default=4)
+    parser.add_argument("--drive-latency-ms", type=float, default=0.0)
+    parser.add_argument("--drive-error-rate", type=float, default=0.0)
+    parser.add_argument("--workdir", help="Directory for the temporary files")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(SRC_DIR))
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,724 @@
+"""
+Local fake of the Google endpoints the service talks to.
+
+Serves the Gmail REST API subset used by the tools (send, with a recipient
+limit per message, list, get, batch, history, batchModify, labels, watch,
+stop, profile), the Drive files subset
+(resumable uploads, metadata, ranged `alt=media` downloads), Calendar
+`freeBusy` (deterministic busy blocks per calendar id), the OAuth2 token
+endpoint (issuing ID tokens signed with a local key set), the key set itself
+and OAuth2 userinfo, with configurable latency and error injection per
+endpoint group. Uploaded Drive files are kept in a temporary directory;
+`POST /_drive/seed?size=<bytes>` adds a generated file of any size without
+using disk. Point the service at it with:
+
+    GOOGLE_API_ENDPOINT=http://127.0.0.1:<port>/
+    GOOGLE_TOKEN_URI=http://127.0.0.1:<port>/token
+    GOOGLE_CERTS_URI=http://127.0.0.1:<port>/oauth2/v3/certs
+
+Standalone usage:
+
+    python -m benchmarks.fake_google --port 9100 --gmail-latency-ms 80 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Dict, List, Optional, Tuple
+
+import rsa
+import uvicorn
+from google.auth import crypt, jwt
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Recipients (To + Cc + Bcc) accepted per sent message
+MAX_RECIPIENTS = 100
+
+
+@dataclass
+class FaultConfig:
+    """Latency and error injection for one endpoint group."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    async def apply(self) -> Optional[Response]:
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            return JSONResponse(
+                {
+                    "error": {
+                        "code": self.error_status,
+                        "message": "Injected fault",
+                        "status": "UNAVAILABLE",
+                    }
+                },
+                status_code=self.error_status,
+            )
+        return None
+
+
+@dataclass
+class FakeGoogleConfig:
+    gmail: FaultConfig = field(default_factory=FaultConfig)
+    drive: FaultConfig = field(default_factory=FaultConfig)
+    calendar: FaultConfig = field(default_factory=FaultConfig)
+    token: FaultConfig = field(default_factory=FaultConfig)
+    token_expires_in: int = 3600
+
+
+def _b64_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8)
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class FakeKeySet:
+    """RSA signing key for fake ID tokens, published as a JWK set."""
+
+    def __init__(self, kid: str = "fake-key-1"):
+        self.kid = kid
+        self._public_key, private_key = rsa.newkeys(2048)
+        self._signer = crypt.RSASigner.from_string(
+            private_key.save_pkcs1("PEM"), key_id=kid
+        )
+
+    def jwks(self) -> dict:
+        return {
+            "keys": [
+                {
+                    "kid": self.kid,
+                    "kty": "RSA",
+                    "alg": "RS256",
+                    "use": "sig",
+                    "n": _b64_uint(self._public_key.n),
+                    "e": _b64_uint(self._public_key.e),
+                }
+            ]
+        }
+
+    def id_token(self, audience: str, subject: str, lifetime: int = 3600) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": audience,
+            "azp": audience,
+            "sub": subject,
+            "email": "user@example.com",
+            "iat": now,
+            "exp": now + lifetime,
+        }
+        return jwt.encode(self._signer, payload).decode("ascii")
+
+
+@dataclass
+class FakeMailbox:
+    messages: Dict[str, dict] = field(default_factory=dict)
+    history: List[dict] = field(default_factory=list)
+    history_ids: "itertools.count[int]" = field(
+        default_factory=lambda: itertools.count(1000)
+    )
+    sent: int = 0
+    modified: int = 0
+    watching: bool = False
+
+    @property
+    def history_id(self) -> int:
+        return int(self.history[-1]["id"]) if self.history else 999
+
+    def add(self, raw: str, label_ids: List[str]) -> dict:
+        message_id = uuid.uuid4().hex[:16]
+        history_id = str(next(self.history_ids))
+        message = {
+            "id": message_id,
+            "threadId": message_id,
+            "labelIds": label_ids,
+            "historyId": history_id,
+            "raw": raw,
+            "snippet": base64.urlsafe_b64decode(raw.encode("ascii"))[:100].decode(
+                "utf-8", "replace"
+            ),
+            "sizeEstimate": len(raw),
+        }
+        self.messages[message_id] = message
+        self.history.append(
+            {
+                "id": history_id,
+                "messagesAdded": [
+                    {"message": {"id": message_id, "labelIds": label_ids}}
+                ],
+            }
+        )
+        return message
+
+
+# Generated Drive files repeat this block
+PATTERN_BLOCK = random.Random(0).randbytes(1024 * 1024)
+
+
+@dataclass
+class FakeDriveFile:
+    id: str
+    name: str
+    mime_type: str
+    size: int = 0
+    md5: str = ""
+    # Uploaded files live on disk; seeded files are generated from the pattern
+    path: Optional[str] = None
+
+    def resource(self) -> dict:
+        return {
+            "kind": "drive#file",
+            "id": self.id,
+            "name": self.name,
+            "mimeType": self.mime_type,
+            "size": str(self.size),
+            "md5Checksum": self.md5,
+        }
+
+    def read(self, start: int, end: int) -> bytes:
+        """Bytes `start`..`end` (inclusive)."""
+        if self.path is not None:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start + 1)
+        block = len(PATTERN_BLOCK)
+        parts = []
+        offset = start
+        while offset <= end:
+            index = offset % block
+            length = min(block - index, end - offset + 1)
+            parts.append(PATTERN_BLOCK[index : index + length])
+            offset += length
+        return b"".join(parts)
+
+
+@dataclass
+class FakeUploadSession:
+    file: FakeDriveFile
+    total: int
+    received: int = 0
+    digest: "hashlib._Hash" = field(default_factory=hashlib.md5)
+
+
+class FakeDrive:
+    def __init__(self) -> None:
+        self.files: Dict[str, FakeDriveFile] = {}
+        self.sessions: Dict[str, FakeUploadSession] = {}
+        self.uploaded_bytes = 0
+        self.downloaded_bytes = 0
+        self._dir = tempfile.TemporaryDirectory(prefix="fake-drive-")
+
+    def seed(self, size: int, name: str = "seeded.bin") -> FakeDriveFile:
+        file = FakeDriveFile(
+            id=uuid.uuid4().hex, name=name, mime_type="application/octet-stream"
+        )
+        file.size = size
+        digest = hashlib.md5()
+        for start in range(0, size, len(PATTERN_BLOCK)):
+            digest.update(file.read(start, min(start + len(PATTERN_BLOCK), size) - 1))
+        file.md5 = digest.hexdigest()
+        self.files[file.id] = file
+        return file
+
+    def start_upload(self, metadata: dict, mime_type: str, total: int) -> str:
+        file_id = uuid.uuid4().hex
+        file = FakeDriveFile(
+            id=file_id,
+            name=metadata.get("name", "untitled"),
+            mime_type=metadata.get("mimeType") or mime_type,
+            path=os.path.join(self._dir.name, file_id),
+        )
+        open(file.path, "wb").close()
+        upload_id = uuid.uuid4().hex
+        self.sessions[upload_id] = FakeUploadSession(file=file, total=total)
+        return upload_id
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """`bytes=<start>-<end>` (end optional) as inclusive offsets."""
+    if not header.startswith("bytes="):
+        return None
+    first, _, last = header[len("bytes=") :].partition("-")
+    start = int(first)
+    end = min(int(last) if last else size - 1, size - 1)
+    if start > end:
+        return None
+    return start, end
+
+
+def create_fake_google_app(
+    config: Optional[FakeGoogleConfig] = None,
+) -> Starlette:
+    config = config or FakeGoogleConfig()
+    mailbox = FakeMailbox()
+    drive = FakeDrive()
+    keys = FakeKeySet()
+
+    async def token(request: Request) -> Response:
+        if fault := await config.token.apply():
+            return fault
+        form = await request.form()
+        grant_type = form.get("grant_type")
+        if grant_type not in ("refresh_token", "authorization_code"):
+            return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+
+        token: dict = {
+            "access_token": f"fake-{uuid.uuid4().hex}",
+            "expires_in": config.token_expires_in,
+            "token_type": "Bearer",
+            "refresh_token": "fake-refresh-token",
+            "scope": "https://www.googleapis.com/auth/gmail.send",
+        }
+        if grant_type == "authorization_code":
+            # The client id comes as form data or as HTTP Basic credentials
+            client_id = form.get("client_id")
+            if not client_id and request.headers.get("authorization", "").startswith(
+                "Basic "
+            ):
+                basic = request.headers["authorization"].split(" ", 1)[1]
+                client_id = base64.b64decode(basic).decode().split(":", 1)[0]
+            token["id_token"] = keys.id_token(str(client_id), "fake-google-id")
+            token["scope"] = f"openid {token['scope']}"
+        return JSONResponse(token)
+
+    async def certs(request: Request) -> Response:
+        if fault := await config.token.apply():
+            return fault
+        return JSONResponse(keys.jwks())
+
+    async def userinfo(request: Request) -> Response:
+        if fault := await config.token.apply():
+            return fault
+        return JSONResponse({"id": "fake-google-id", "email": "user@example.com"})
+
+    async def send(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        body = await request.json()
+        headers = BytesParser(policy=HTTP).parsebytes(
+            base64.urlsafe_b64decode(body["raw"].encode("ascii")), headersonly=True
+        )
+        recipients = sum(
+            len(headers[name].split(","))
+            for name in ("To", "Cc", "Bcc")
+            if headers[name]
+        )
+        if recipients > MAX_RECIPIENTS:
+            return JSONResponse(
+                {"error": {"code": 400, "message": "Too many recipients"}},
+                status_code=400,
+            )
+        message = mailbox.add(body["raw"], ["SENT"])
+        mailbox.sent += 1
+        return JSONResponse(
+            {"id": message["id"], "threadId": message["threadId"], "labelIds": ["SENT"]}
+        )
+
+    async def list_messages(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        page_size = min(int(request.query_params.get("maxResults", 100)), 500)
+        offset = int(request.query_params.get("pageToken") or 0)
+        ids = list(mailbox.messages)[offset : offset + page_size]
+        result: dict = {
+            "messages": [{"id": i, "threadId": i} for i in ids],
+            "resultSizeEstimate": len(mailbox.messages),
+        }
+        if offset + page_size < len(mailbox.messages):
+            result["nextPageToken"] = str(offset + page_size)
+        return JSONResponse(result)
+
+    def render_message(message_id: str, fmt: str) -> Optional[dict]:
+        message = mailbox.messages.get(message_id)
+        if message is None:
+            return None
+        if fmt == "raw":
+            return message
+        return {k: v for k, v in message.items() if k != "raw"}
+
+    async def batch_modify(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        body = await request.json()
+        if len(body.get("ids", [])) > 1000:
+            return JSONResponse(
+                {"error": {"code": 400, "message": "Too many ids"}}, status_code=400
+            )
+        for message_id in body.get("ids", []):
+            message = mailbox.messages.get(message_id)
+            if message is None:
+                continue
+            labels = set(message["labelIds"]) | set(body.get("addLabelIds", []))
+            message["labelIds"] = sorted(labels - set(body.get("removeLabelIds", [])))
+        mailbox.modified += len(body.get("ids", []))
+        return Response(status_code=204)
+
+    async def labels(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        return JSONResponse(
+            {
+                "labels": [
+                    {"id": "INBOX", "name": "INBOX", "type": "system"},
+                    {"id": "UNREAD", "name": "UNREAD", "type": "system"},
+                    {"id": "Label_1", "name": "Receipts", "type": "user"},
+                ]
+            }
+        )
+
+    async def get_message(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        message = render_message(
+            request.path_params["id"], request.query_params.get("format", "full")
+        )
+        if message is None:
+            return JSONResponse(
+                {"error": {"code": 404, "message": "Not Found"}}, status_code=404
+            )
+        return JSONResponse(message)
+
+    async def history(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        start = int(request.query_params.get("startHistoryId", 0))
+        records = [h for h in mailbox.history if int(h["id"]) > start]
+        return JSONResponse(
+            {
+                "history": records,
+                "historyId": records[-1]["id"] if records else str(start),
+            }
+        )
+
+    async def batch(request: Request) -> Response:
+        """multipart/mixed batch of GET message requests."""
+        if fault := await config.gmail.apply():
+            return fault
+        content_type = request.headers["content-type"]
+        envelope = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: "
+            + content_type.encode()
+            + b"\r\n\r\n"
+            + await request.body()
+        )
+
+        boundary = uuid.uuid4().hex
+        parts = []
+        for part in envelope.iter_parts():
+            request_line = part.get_payload(decode=True).split(b"\r\n", 1)[0].decode()
+            _, url, _ = request_line.split(" ", 2)
+            path, _, query = url.partition("?")
+            message_id = path.rstrip("/").rsplit("/", 1)[-1]
+            fmt = "raw" if "format=raw" in query else "full"
+            message = render_message(message_id, fmt)
+            status = "200 OK" if message else "404 Not Found"
+            payload = json.dumps(message or {"error": {"code": 404}})
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'].strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+        return Response(body, media_type=f"multipart/mixed; boundary={boundary}")
+
+    async def watch(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        mailbox.watching = True
+        expiration = int((time.time() + 7 * 24 * 3600) * 1000)
+        return JSONResponse(
+            {"historyId": str(mailbox.history_id), "expiration": str(expiration)}
+        )
+
+    async def stop(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        mailbox.watching = False
+        return Response(status_code=204)
+
+    async def profile(request: Request) -> Response:
+        if fault := await config.gmail.apply():
+            return fault
+        return JSONResponse(
+            {
+                "emailAddress": "user@example.com",
+                "messagesTotal": len(mailbox.messages),
+                "historyId": str(mailbox.history_id),
+            }
+        )
+
+    def drive_error(status: int, message: str) -> Response:
+        return JSONResponse(
+            {"error": {"code": status, "message": message}}, status_code=status
+        )
+
+    async def drive_get_file(request: Request) -> Response:
+        if fault := await config.drive.apply():
+            return fault
+        file = drive.files.get(request.path_params["id"])
+        if file is None:
+            return drive_error(404, "File not found")
+        if request.query_params.get("alt") != "media":
+            return JSONResponse(file.resource())
+
+        byte_range = _parse_range(request.headers.get("range", ""), file.size)
+        if byte_range is None:
+            start, end, status = 0, file.size - 1, 200
+        else:
+            (start, end), status = byte_range, 206
+        data = await asyncio.to_thread(file.read, start, end)
+        drive.downloaded_bytes += len(data)
+        headers = {"Content-Range": f"bytes {start}-{end}/{file.size}"}
+        return Response(
+            data,
+            status_code=status,
+            media_type="application/octet-stream",
+            headers=headers if status == 206 else None,
+        )
+
+    async def drive_start_upload(request: Request) -> Response:
+        if fault := await config.drive.apply():
+            return fault
+        if request.query_params.get("uploadType") != "resumable":
+            return drive_error(400, "Only resumable uploads are supported")
+        body = await request.body()
+        upload_id = drive.start_upload(
+            json.loads(body) if body else {},
+            request.headers.get("x-upload-content-type", "application/octet-stream"),
+            int(request.headers.get("x-upload-content-length", -1)),
+        )
+        location = request.url.include_query_params(upload_id=upload_id)
+        return Response(status_code=200, headers={"Location": str(location)})
+
+    async def drive_upload_chunk(request: Request) -> Response:
+        """PUT of `Content-Range: bytes <start>-<end>/<total>` or `bytes */<total>`."""
+        session = drive.sessions.get(request.query_params.get("upload_id", ""))
+        if session is None:
+            return drive_error(404, "Upload session not found")
+        if fault := await config.drive.apply():
+            # Read the chunk before failing, or the client blocks sending it
+            async for _ in request.stream():
+                pass
+            return fault
+
+        content_range = request.headers.get("content-range", "")
+        spec, _, total = content_range.removeprefix("bytes ").partition("/")
+        if total != "*":
+            session.total = int(total)
+        if spec != "*":
+            start = int(spec.split("-")[0])
+            if start != session.received:
+                # Out of order; the client resumes from the reported range
+                return Response(
+                    status_code=308,
+                    headers={"Range": f"bytes=0-{session.received - 1}"},
+                )
+            with open(session.file.path, "ab") as f:
+                async for data in request.stream():
+                    f.write(data)
+                    session.digest.update(data)
+                    session.received += len(data)
+                    drive.uploaded_bytes += len(data)
+
+        if session.received < session.total:
+            headers = (
+                {"Range": f"bytes=0-{session.received - 1}"} if session.received else {}
+            )
+            return Response(status_code=308, headers=headers)
+
+        file = session.file
+        file.size = session.received
+        file.md5 = session.digest.hexdigest()
+        drive.files[file.id] = file
+        drive.sessions.pop(request.query_params["upload_id"])
+        return JSONResponse(file.resource())
+
+    async def drive_seed(request: Request) -> Response:
+        file = await asyncio.to_thread(
+            drive.seed,
+            int(request.query_params["size"]),
+            request.query_params.get("name", "seeded.bin"),
+        )
+        return JSONResponse(file.resource())
+
+    freebusy_queries = 0
+
+    async def freebusy(request: Request) -> Response:
+        """Busy half-hours are derived from the calendar id; `missing*` ids fail."""
+        nonlocal freebusy_queries
+        if fault := await config.calendar.apply():
+            return fault
+        body = await request.json()
+        if len(body.get("items", [])) > 50:
+            return JSONResponse(
+                {"error": {"code": 400, "message": "Too many calendars"}},
+                status_code=400,
+            )
+        freebusy_queries += 1
+
+        time_min = datetime.fromisoformat(body["timeMin"])
+        time_max = datetime.fromisoformat(body["timeMax"])
+        slot = timedelta(minutes=30)
+        calendars = {}
+        for item in body.get("items", []):
+            calendar_id = item["id"]
+            if calendar_id.startswith("missing"):
+                calendars[calendar_id] = {
+                    "errors": [{"domain": "global", "reason": "notFound"}],
+                    "busy": [],
+                }
+                continue
+            busy = []
+            start = time_min
+            while start < time_max:
+                seed = f"{calendar_id}:{int(start.timestamp()) // 1800}"
+                if random.Random(seed).random() < 0.3:
+                    end = min(start + slot, time_max)
+                    busy.append(
+                        {
+                            "start": start.isoformat().replace("+00:00", "Z"),
+                            "end": end.isoformat().replace("+00:00", "Z"),
+                        }
+                    )
+                start += slot
+            calendars[calendar_id] = {"busy": busy}
+
+        return JSONResponse(
+            {
+                "kind": "calendar#freeBusy",
+                "timeMin": body["timeMin"],
+                "timeMax": body["timeMax"],
+                "calendars": calendars,
+            }
+        )
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(
+            {
+                "sent": mailbox.sent,
+                "modified": mailbox.modified,
+                "messages": len(mailbox.messages),
+                "drive_files": len(drive.files),
+                "drive_uploaded_bytes": drive.uploaded_bytes,
+                "drive_downloaded_bytes": drive.downloaded_bytes,
+                "freebusy_queries": freebusy_queries,
+            }
+        )
+
+    gmail = "/gmail/v1/users/{user_id}"
+    app = Starlette(
+        routes=[
+            Route("/token", token, methods=["POST"]),
+            Route("/oauth2/v3/certs", certs, methods=["GET"]),
+            Route("/oauth2/v2/userinfo", userinfo, methods=["GET"]),
+            Route(f"{gmail}/messages/send", send, methods=["POST"]),
+            Route(f"{gmail}/messages", list_messages, methods=["GET"]),
+            Route(f"{gmail}/messages/batchModify", batch_modify, methods=["POST"]),
+            Route(f"{gmail}/labels", labels, methods=["GET"]),
+            Route(f"{gmail}/messages/{{id}}", get_message, methods=["GET"]),
+            Route(f"{gmail}/history", history, methods=["GET"]),
+            Route(f"{gmail}/watch", watch, methods=["POST"]),
+            Route(f"{gmail}/stop", stop, methods=["POST"]),
+            Route(f"{gmail}/profile", profile, methods=["GET"]),
+            Route("/batch", batch, methods=["POST"]),
+            Route("/batch/gmail/v1", batch, methods=["POST"]),
+            Route("/drive/v3/files/{id}", drive_get_file, methods=["GET"]),
+            Route("/upload/drive/v3/files", drive_start_upload, methods=["POST"]),
+            Route("/upload/drive/v3/files", drive_upload_chunk, methods=["PUT"]),
+            Route("/_drive/seed", drive_seed, methods=["POST"]),
+            Route("/calendar/v3/freeBusy", freebusy, methods=["POST"]),
+            Route("/_stats", stats, methods=["GET"]),
+        ]
+    )
+    app.state.config = config
+    app.state.mailbox = mailbox
+    app.state.drive = drive
+    app.state.keys = keys
+    return app
+
+
+class ServerThread:
+    """Runs an ASGI app with uvicorn in a background thread."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 0):
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host=host, port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        sock = self.server.servers[0].sockets[0]
+        host, port = sock.getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "ServerThread":
+        self._thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    for group in ("gmail", "drive", "calendar", "token"):
+        parser.add_argument(f"--{group}-latency-ms", type=float, default=0.0)
+        parser.add_argument(f"--{group}-jitter-ms", type=float, default=0.0)
+        parser.add_argument(f"--{group}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{group}-error-status", type=int, default=503)
+
+
+def config_from_arguments(args: argparse.Namespace) -> FakeGoogleConfig:
+    def fault(group: str) -> FaultConfig:
+        return FaultConfig(
+            latency_ms=getattr(args, f"{group}_latency_ms"),
+            jitter_ms=getattr(args, f"{group}_jitter_ms"),
+            error_rate=getattr(args, f"{group}_error_rate"),
+            error_status=getattr(args, f"{group}_error_status"),
+        )
+
+    return FakeGoogleConfig(
+        gmail=fault("gmail"),
+        drive=fault("drive"),
+        calendar=fault("calendar"),
+        token=fault("token"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Google APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_fake_google_app(config_from_arguments(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
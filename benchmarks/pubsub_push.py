@@ -0,0 +1,96 @@
+"""
+Local stand-in for Pub/Sub push delivery of Gmail `users.watch` notifications.
+
+Posts push envelopes, in the format Pub/Sub uses, to the MCP server's
+`/webhooks/gmail` route. It can redeliver a share of the messages to exercise
+de-duplication, and reports the status codes it got back:
+
+    python -m benchmarks.pubsub_push --url http://127.0.0.1:8000/webhooks/gmail \\
+        --token "$GMAIL_PUSH_TOKEN" \\
+        --email user@example.com --history-id 1000 --count 50 --duplicate-rate 0.2
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import json
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import httpx
+
+SUBSCRIPTION = "projects/bench/subscriptions/gmail-push"
+
+
+def push_envelope(
+    email_address: str, history_id: int, message_id: Optional[str] = None
+) -> dict:
+    data = json.dumps({"emailAddress": email_address, "historyId": history_id})
+    message_id = message_id or uuid.uuid4().hex
+    return {
+        "message": {
+            "data": base64.b64encode(data.encode()).decode("ascii"),
+            "messageId": message_id,
+            "message_id": message_id,
+            "publishTime": datetime.now(timezone.utc).isoformat(),
+            "attributes": {},
+        },
+        "subscription": SUBSCRIPTION,
+    }
+
+
+async def deliver(
+    url: str,
+    email_address: str,
+    start_history_id: int,
+    count: int,
+    duplicate_rate: float = 0.0,
+    token: Optional[str] = None,
+    bearer: Optional[str] = None,
+) -> Dict[int, int]:
+    """Posts `count` notifications; returns a histogram of response statuses."""
+    statuses: Dict[int, int] = collections.Counter()
+    headers = {"Authorization": f"Bearer {bearer}"} if bearer else {}
+    params = {"token": token} if token else {}
+
+    async with httpx.AsyncClient(headers=headers, params=params) as client:
+        for i in range(count):
+            envelope = push_envelope(email_address, start_history_id + i)
+            deliveries = 2 if random.random() < duplicate_rate else 1
+            for _ in range(deliveries):
+                response = await client.post(url, json=envelope)
+                statuses[response.status_code] += 1
+
+    return dict(statuses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pub/Sub push stand-in")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/webhooks/gmail")
+    parser.add_argument("--email", default="user@example.com")
+    parser.add_argument("--history-id", type=int, default=1000)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--token", help="Shared secret (GMAIL_PUSH_TOKEN)")
+    parser.add_argument("--bearer", help="OIDC token for GMAIL_PUSH_AUDIENCE")
+    args = parser.parse_args()
+
+    statuses = asyncio.run(
+        deliver(
+            args.url,
+            args.email,
+            args.history_id,
+            args.count,
+            duplicate_rate=args.duplicate_rate,
+            token=args.token,
+            bearer=args.bearer,
+        )
+    )
+    print(json.dumps(statuses))
+
+
+if __name__ == "__main__":
+    main()
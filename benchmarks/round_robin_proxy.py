@@ -0,0 +1,79 @@
+"""
+Minimal HTTP reverse proxy that sends each request to the next upstream in
+turn, with no session affinity. Used to run stateless MCP replicas behind a
+non-sticky load balancer:
+
+    python -m benchmarks.round_robin_proxy --port 9200 \\
+        --upstream http://127.0.0.1:9001 --upstream http://127.0.0.1:9002
+"""
+
+import argparse
+import itertools
+from typing import List
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+# Hop-by-hop headers are not forwarded
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "upgrade", "host"}
+
+
+def create_proxy_app(upstreams: List[str]) -> Starlette:
+    targets = itertools.cycle([upstream.rstrip("/") for upstream in upstreams])
+    client = httpx.AsyncClient(timeout=None, limits=httpx.Limits(max_connections=None))
+
+    async def proxy(request: Request) -> StreamingResponse:
+        url = f"{next(targets)}{request.url.path}"
+        if request.url.query:
+            url = f"{url}?{request.url.query}"
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_HEADERS
+        ]
+
+        upstream_request = client.build_request(
+            request.method, url, headers=headers, content=await request.body()
+        )
+        response = await client.send(upstream_request, stream=True)
+        # SSE responses are streamed through as they arrive
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in HOP_HEADERS | {"content-length"}
+            },
+            background=BackgroundTask(response.aclose),
+        )
+
+    methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+    return Starlette(
+        routes=[Route("/{path:path}", proxy, methods=methods)],
+        on_shutdown=[client.aclose],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Round-robin HTTP proxy")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--upstream", action="append", required=True)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_proxy_app(args.upstream),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
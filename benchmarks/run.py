@@ -0,0 +1,109 @@
+"""
+Load-test and benchmark runner.
+
+Starts the fake Google server and a disposable Postgres, seeds fixtures and runs
+the selected scenarios, printing p50/p99 latency, throughput and peak RSS per
+scenario. With `--baseline` it exits non-zero when any scenario regresses by more
+than `--tolerance`.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run --requests 500 --concurrency 16 \\
+        --gmail-latency-ms 80 --output bench.json
+    python -m benchmarks.run --baseline bench.json --tolerance 0.15
+    python -m benchmarks.run --scenario mcp-stdio --scenario mcp-http \\
+        --scenario mcp-inprocess
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from benchmarks.fake_google import (
+    ServerThread,
+    add_fault_arguments,
+    config_from_arguments,
+    create_fake_google_app,
+)
+from benchmarks.postgres import disposable_postgres, seed
+from benchmarks.scenarios import DEFAULT_ENV, SCENARIOS, SRC_DIR, BenchContext
+from benchmarks.stats import compare_with_baseline, write_results
+
+GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
+
+
+async def run(args: argparse.Namespace, database_url: str, fake_url: str) -> int:
+    seed_data = await seed(GMAIL_SCOPES)
+    ctx = BenchContext(
+        database_url=database_url,
+        fake_google_url=fake_url,
+        seed=seed_data,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        replicas=args.replicas,
+    )
+
+    results = []
+    for name in args.scenario:
+        result = await SCENARIOS[name](ctx)
+        print(result.format(), flush=True)
+        results.append(result)
+
+    if args.output:
+        write_results(Path(args.output), results)
+
+    if args.baseline:
+        regressions = compare_with_baseline(
+            results, Path(args.baseline), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="google-service benchmarks")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default: all)",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--replicas",
+        type=lambda value: [int(n) for n in value.split(",")],
+        default=[1, 2, 4],
+        help="Comma-separated replica counts for mcp-stateless-scaling",
+    )
+    parser.add_argument("--database-url", help="Use an existing database instead")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare with a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(SCENARIOS)
+
+    # The seeding step uses the service's own settings and Prisma client
+    sys.path.insert(0, str(SRC_DIR))
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+
+    fake_app = create_fake_google_app(config_from_arguments(args))
+    with ServerThread(fake_app) as fake_google:
+        if args.database_url:
+            os.environ["POSTGRES_DATABASE_URL"] = args.database_url
+            return asyncio.run(run(args, args.database_url, fake_google.url))
+
+        with disposable_postgres() as database_url:
+            os.environ["POSTGRES_DATABASE_URL"] = database_url
+            return asyncio.run(run(args, database_url, fake_google.url))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
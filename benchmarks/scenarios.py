@@ -0,0 +1,281 @@
+"""
+Benchmark scenarios: `send_gmail` over both MCP transports and the FastAPI
+`/api/v1/auth` routes, each against a freshly spawned service process,
+`send_gmail` against stateless MCP replicas behind a round-robin proxy, and
+`send_gmail` through the in-process client (`google_mcp.client`), whose
+latency against the transport scenarios is the per-call transport overhead.
+"""
+
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import psutil
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.postgres import SeedData
+from benchmarks.stats import ScenarioResult, run_load
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT_DIR / "src"
+MCP_MAIN = SRC_DIR / "google_mcp" / "main.py"
+
+# Settings required by `config.settings_config.Settings`, unless already set
+DEFAULT_ENV = {
+    "ENV": "bench",
+    "PROJECT_NAME": "google-service-bench",
+    "PROJECT_VERSION": "bench",
+    "BACKEND_CORS_ORIGINS": "[]",
+    "ALLOWED_HOSTS": "[]",
+    "MCP_HOST": "127.0.0.1",
+    "MCP_PORT": "0",
+    "MCP_TRANSPORT": "stdio",
+    "GOOGLE_REDIRECT_URI": "http://127.0.0.1/api/v1/auth/callback",
+    "GOOGLE_AUTH_URI": "http://127.0.0.1/auth",
+    # The fake endpoints are plain http and return their own scopes
+    "OAUTHLIB_INSECURE_TRANSPORT": "1",
+    "OAUTHLIB_RELAX_TOKEN_SCOPE": "1",
+}
+
+
+@dataclass
+class BenchContext:
+    database_url: str
+    fake_google_url: str
+    seed: SeedData
+    requests: int
+    concurrency: int
+    extra_env: Optional[Dict[str, str]] = None
+    # Replica counts compared by the scaling scenario
+    replicas: Sequence[int] = (1, 2, 4)
+
+    def service_env(self, **overrides: str) -> Dict[str, str]:
+        env = {**DEFAULT_ENV, **os.environ}
+        env.update(
+            {
+                "PYTHONPATH": os.pathsep.join([str(SRC_DIR), str(ROOT_DIR)]),
+                "POSTGRES_DATABASE_URL": self.database_url,
+                "GOOGLE_API_ENDPOINT": self.fake_google_url,
+                "GOOGLE_TOKEN_URI": f"{self.fake_google_url}token",
+                "GOOGLE_CERTS_URI": f"{self.fake_google_url}oauth2/v3/certs",
+            }
+        )
+        env.update(self.extra_env or {})
+        env.update(overrides)
+        return env
+
+    def send_arguments(self, i: int) -> dict:
+        return {
+            "gmail_user_id": self.seed.user_token_id,
+            "to": [f"bench-{i}@example.com"],
+            "subject": f"Benchmark message {i}",
+            "body": "Hello from the benchmark harness.",
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_http(url: str, timeout: float = 30.0) -> None:
+    async with httpx.AsyncClient() as client:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            with contextlib.suppress(httpx.HTTPError):
+                if (await client.get(url)).status_code == 200:
+                    return
+            if asyncio.get_running_loop().time() > deadline:
+                raise TimeoutError(f"{url} did not become ready")
+            await asyncio.sleep(0.2)
+
+
+@contextlib.asynccontextmanager
+async def spawn(
+    args: list, env: Dict[str, str], ready_url: str
+) -> AsyncIterator[subprocess.Popen]:
+    process = subprocess.Popen(args, cwd=SRC_DIR, env=env)
+    try:
+        await wait_for_http(ready_url)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _send_with_session(
+    name: str, session: ClientSession, ctx: BenchContext, pid: Optional[int]
+) -> ScenarioResult:
+    await session.initialize()
+
+    async def call(i: int) -> None:
+        result = await session.call_tool("send_gmail", ctx.send_arguments(i))
+        if result.isError:
+            raise RuntimeError(result.content)
+
+    return await run_load(name, call, ctx.requests, ctx.concurrency, pid=pid)
+
+
+async def mcp_stdio(ctx: BenchContext) -> ScenarioResult:
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(MCP_MAIN)],
+        env=ctx.service_env(MCP_TRANSPORT="stdio"),
+        cwd=str(SRC_DIR),
+    )
+    async with stdio_client(params) as (read, write):
+        children = psutil.Process().children()
+        pid = children[-1].pid if children else None
+        async with ClientSession(read, write) as session:
+            return await _send_with_session("mcp-stdio/send_gmail", session, ctx, pid)
+
+
+async def mcp_streamable_http(ctx: BenchContext) -> ScenarioResult:
+    port = free_port()
+    env = ctx.service_env(MCP_TRANSPORT="streamable-http", MCP_PORT=str(port))
+    base = f"http://127.0.0.1:{port}"
+
+    async with spawn([sys.executable, str(MCP_MAIN)], env, f"{base}/healthz") as proc:
+        async with streamablehttp_client(f"{base}/mcp") as (read, write, _):
+            async with ClientSession(read, write) as session:
+                return await _send_with_session(
+                    "mcp-http/send_gmail", session, ctx, proc.pid
+                )
+
+
+async def mcp_inprocess(ctx: BenchContext) -> ScenarioResult:
+    """
+    `send_gmail` through `google_mcp.client` in this process. Peak RSS
+    includes the harness and the fake Google server.
+    """
+    os.environ.update(ctx.service_env())
+    from config.settings_config import get_settings
+
+    get_settings.cache_clear()
+    from db.prisma.utils import prisma
+    from google_mcp.client import GoogleServiceClient
+
+    # Seeding disconnected the client that `get_db` keeps
+    if not prisma.is_connected():
+        await prisma.connect()
+
+    client = GoogleServiceClient()
+
+    async def call(i: int) -> None:
+        await client.send_gmail(**ctx.send_arguments(i))
+
+    return await run_load(
+        "mcp-inprocess/send_gmail", call, ctx.requests, ctx.concurrency, pid=os.getpid()
+    )
+
+
+async def _stateless_fleet(ctx: BenchContext, replicas: int) -> ScenarioResult:
+    """`replicas` stateless MCP servers behind `benchmarks.round_robin_proxy`."""
+    async with contextlib.AsyncExitStack() as stack:
+        upstreams = []
+        for _ in range(replicas):
+            port = free_port()
+            env = ctx.service_env(
+                MCP_TRANSPORT="streamable-http",
+                MCP_PORT=str(port),
+                MCP_STATELESS_HTTP="true",
+                MCP_JSON_RESPONSE="true",
+            )
+            base = f"http://127.0.0.1:{port}"
+            await stack.enter_async_context(
+                spawn([sys.executable, str(MCP_MAIN)], env, f"{base}/healthz")
+            )
+            upstreams.append(base)
+
+        proxy_port = free_port()
+        proxy_args = [sys.executable, "-m", "benchmarks.round_robin_proxy"]
+        proxy_args += ["--port", str(proxy_port)]
+        for upstream in upstreams:
+            proxy_args += ["--upstream", upstream]
+        proxy = f"http://127.0.0.1:{proxy_port}"
+        await stack.enter_async_context(
+            spawn(proxy_args, ctx.service_env(), f"{proxy}/healthz")
+        )
+
+        read, write, _ = await stack.enter_async_context(
+            streamablehttp_client(f"{proxy}/mcp")
+        )
+        session = await stack.enter_async_context(ClientSession(read, write))
+        # Replica RSS is not sampled: the load spans several processes
+        return await _send_with_session(
+            f"mcp-stateless-x{replicas}/send_gmail", session, ctx, None
+        )
+
+
+async def mcp_stateless_scaling(ctx: BenchContext) -> ScenarioResult:
+    """
+    Throughput of 1..N stateless replicas behind a round-robin proxy; reports
+    the largest fleet with the throughput of each size and its scaling
+    efficiency (throughput / (replicas × single-replica throughput)).
+    """
+    results = {}
+    for replicas in sorted(ctx.replicas):
+        results[replicas] = await _stateless_fleet(ctx, replicas)
+        print(f"  {results[replicas].format()}", flush=True)
+
+    smallest, largest = min(results), max(results)
+    per_replica = results[smallest].throughput_rps / smallest
+    result = results[largest]
+    for replicas, fleet in results.items():
+        result.extra[f"throughput_rps_x{replicas}"] = fleet.throughput_rps
+        if per_replica:
+            result.extra[f"efficiency_x{replicas}"] = fleet.throughput_rps / (
+                replicas * per_replica
+            )
+    return result
+
+
+async def api_auth(ctx: BenchContext) -> ScenarioResult:
+    """`GET /api/v1/auth` followed by the OAuth callback for the issued state."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    args = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)]
+
+    async with spawn(args, ctx.service_env(), f"{base}/api/monitoring/healthz") as proc:
+        async with httpx.AsyncClient(base_url=base) as client:
+
+            async def call(i: int) -> None:
+                response = await client.get(
+                    "/api/v1/auth",
+                    params={"client_id": ctx.seed.client_id, "auth_type": "gmail"},
+                )
+                response.raise_for_status()
+                state = parse_qs(urlparse(response.json()["url"]).query)["state"][0]
+
+                callback = await client.get(
+                    "/api/v1/auth/callback", params={"state": state, "code": "fake"}
+                )
+                if callback.status_code != 302:
+                    raise RuntimeError(f"callback returned {callback.status_code}")
+
+            return await run_load(
+                "api/auth+callback", call, ctx.requests, ctx.concurrency, pid=proc.pid
+            )
+
+
+SCENARIOS: Dict[str, Callable[[BenchContext], "asyncio.Future[ScenarioResult]"]] = {
+    "mcp-stdio": mcp_stdio,
+    "mcp-http": mcp_streamable_http,
+    "mcp-inprocess": mcp_inprocess,
+    "mcp-stateless-scaling": mcp_stateless_scaling,
+    "api-auth": api_auth,
+}
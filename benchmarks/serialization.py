@@ -0,0 +1,140 @@
+"""
+Serialization benchmark: the cost of encoding FastAPI responses with the stdlib
+`JSONResponse` and with `ORJSONResponse`, and the size of MCP tool results in
+compact and verbose mode, encoded the way FastMCP sends them.
+
+Usage (from the repository root, with the usual settings in the environment):
+
+    python -m benchmarks.serialization --recipients 1000 --repeat 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+import pydantic_core
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from benchmarks.scenarios import DEFAULT_ENV, SRC_DIR
+
+
+def api_payloads(items: int) -> Dict[str, Any]:
+    """Representative API bodies: an error and a large validation error."""
+    return {
+        "error": {
+            "error": "HTTP_ERROR",
+            "message": "User token not found",
+            "timestamp": time.time(),
+            "path": "/api/v1/auth/callback",
+        },
+        "validation_error": {
+            "error": "VALIDATION_ERROR",
+            "message": "Request validation failed",
+            "details": [
+                {
+                    "type": "value_error",
+                    "loc": ["body", "recipients", i, "email"],
+                    "msg": "value is not a valid email address",
+                    "input": f"user-{i}@",
+                }
+                for i in range(items)
+            ],
+            "timestamp": time.time(),
+            "path": "/api/v1/clients",
+        },
+    }
+
+
+def tool_results(recipients: int) -> Dict[str, Dict[str, Any]]:
+    """Verbose and compact results of `send_gmail` and `send_gmail_merge`."""
+    from google_mcp.results import compact_result
+    from services.gmail_service import SEND_RESULT_FIELDS, merge_result
+
+    to = [f"recipient-{i}@example.com" for i in range(recipients)]
+    send = {
+        "success": True,
+        "message_id": "18c2f0a9b7d4e123",
+        "subject": "Quarterly update for the whole team",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "recipients": {"to": to, "cc": [], "bcc": []},
+        "total_recipients": len(to),
+    }
+    # One failed row in a hundred
+    rows = [
+        (
+            {"index": i, "email": email, "success": True, "message_id": f"18c{i:013x}"}
+            if i % 100
+            else {"index": i, "email": email, "success": False, "error": "Bad row"}
+        )
+        for i, email in enumerate(to)
+    ]
+    return {
+        "send_gmail": {
+            "verbose": send,
+            "compact": compact_result(send, SEND_RESULT_FIELDS),
+        },
+        "send_gmail_merge": {
+            "verbose": merge_result(rows, 2.5, verbose=True),
+            "compact": merge_result(rows, 2.5),
+        },
+    }
+
+
+def per_call_us(func: Callable[[], Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serialization benchmark")
+    parser.add_argument("--recipients", type=int, default=1000)
+    parser.add_argument("--validation-errors", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    # `services.gmail_service` reads the service's settings on import
+    sys.path.insert(0, str(SRC_DIR))
+    for key, value in DEFAULT_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.setdefault("GOOGLE_TOKEN_URI", "http://127.0.0.1/token")
+
+    print("FastAPI response encoding (per response)")
+    for name, payload in api_payloads(args.validation_errors).items():
+        stdlib = per_call_us(lambda: JSONResponse(payload), args.repeat)
+        fast = per_call_us(lambda: ORJSONResponse(payload), args.repeat)
+        print(
+            f"  {name:<18} stdlib {stdlib:9.1f} us  orjson {fast:9.1f} us  "
+            f"{stdlib / fast:5.1f}x"
+        )
+
+    print(f"MCP tool result size ({args.recipients} recipients, as sent by FastMCP)")
+    for name, modes in tool_results(args.recipients).items():
+        sizes = {
+            mode: len(pydantic_core.to_json(result, fallback=str, indent=2))
+            for mode, result in modes.items()
+        }
+        encode_us = {
+            mode: per_call_us(
+                lambda result=result: pydantic_core.to_json(
+                    result, fallback=str, indent=2
+                ),
+                args.repeat,
+            )
+            for mode, result in modes.items()
+        }
+        print(
+            f"  {name:<18} verbose {sizes['verbose']:9,d} B "
+            f"({encode_us['verbose']:7.1f} us)  "
+            f"compact {sizes['compact']:7,d} B ({encode_us['compact']:6.1f} us)  "
+            f"{sizes['verbose'] / sizes['compact']:6.1f}x smaller"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
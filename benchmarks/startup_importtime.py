@@ -0,0 +1,114 @@
+"""
+Startup import-time benchmark for the MCP server.
+
+Runs the imports `google_mcp/main.py` performs before accepting its first connection
+under `python -X importtime`, reports the slowest top-level packages and fails when
+the median total exceeds the budget or when a module that must stay lazy is imported.
+
+Usage (from the repository root, with the usual settings in the environment):
+
+    python benchmarks/startup_importtime.py --runs 5 --budget-ms 1000
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT_DIR / "src"
+
+# Imports done by `python src/google_mcp/main.py` before `mcp.run(...)`
+STARTUP_CODE = (
+    "import google_mcp.main; import google_mcp.custom_routes; import google_mcp.tools"
+)
+
+# Modules that must only be imported on the first tool call
+LAZY_MODULES = [
+    "googleapiclient",
+    "db.prisma.generated.client",
+    "services.gmail_service",
+    "services.auth_service",
+    "services.drive_service",
+    "services.calendar_service",
+]
+
+
+def measure_once() -> dict[str, tuple[int, int]]:
+    """Returns {module: (self_us, cumulative_us)} for one interpreter start."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), str(ROOT_DIR), env.get("PYTHONPATH")])
+    )
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup imports failed:\n{proc.stderr[-4000:]}")
+
+    modules: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    totals: list[float] = []
+    by_package: dict[str, list[float]] = defaultdict(list)
+    imported: set[str] = set()
+
+    for _ in range(args.runs):
+        modules = measure_once()
+        imported.update(modules)
+        totals.append(sum(self_us for self_us, _ in modules.values()) / 1000)
+
+        packages: dict[str, float] = defaultdict(float)
+        for name, (self_us, _) in modules.items():
+            packages[name.split(".")[0]] += self_us / 1000
+        for package, ms in packages.items():
+            by_package[package].append(ms)
+
+    median_total = statistics.median(totals)
+    print(f"startup imports: median {median_total:.1f} ms over {args.runs} runs")
+    print(f"{'package':<32} {'median ms':>10}")
+    ranked = sorted(
+        by_package.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for package, samples in ranked[: args.top]:
+        print(f"{package:<32} {statistics.median(samples):>10.1f}")
+
+    failed = False
+    eager = [
+        module
+        for module in LAZY_MODULES
+        if any(name == module or name.startswith(f"{module}.") for name in imported)
+    ]
+    if eager:
+        print(f"FAIL: modules imported eagerly at startup: {', '.join(eager)}")
+        failed = True
+    if median_total > args.budget_ms:
+        print(f"FAIL: {median_total:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
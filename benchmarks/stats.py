@@ -0,0 +1,168 @@
+"""
+Latency, throughput and memory measurement shared by the benchmark scenarios.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import psutil
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    peak_rss_mb: Optional[float] = None
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    def format(self) -> str:
+        rss = f"{self.peak_rss_mb:.1f} MB" if self.peak_rss_mb is not None else "n/a"
+        return (
+            f"{self.name:<24} n={self.requests:<6} err={self.errors:<4} "
+            f"{self.throughput_rps:>8.1f} req/s  p50={self.p50_ms:>7.2f} ms  "
+            f"p99={self.p99_ms:>7.2f} ms  max={self.max_ms:>7.2f} ms  rss={rss}"
+        )
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RssSampler:
+    """Samples the peak RSS of a process tree in the background."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.1):
+        self._process = psutil.Process(pid) if pid else None
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.peak_bytes = 0
+
+    def _sample(self) -> None:
+        if self._process is None:
+            return
+        try:
+            processes = [self._process, *self._process.children(recursive=True)]
+            rss = sum(p.memory_info().rss for p in processes)
+        except psutil.Error:
+            return
+        self.peak_bytes = max(self.peak_bytes, rss)
+
+    async def _run(self) -> None:
+        while True:
+            self._sample()
+            await asyncio.sleep(self._interval)
+
+    async def __aenter__(self) -> "RssSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._sample()
+        if self._task:
+            self._task.cancel()
+
+    @property
+    def peak_mb(self) -> Optional[float]:
+        return self.peak_bytes / 2**20 if self._process else None
+
+
+async def run_load(
+    name: str,
+    call: Callable[[int], Awaitable[None]],
+    requests: int,
+    concurrency: int,
+    pid: Optional[int] = None,
+    warmup: int = 5,
+) -> ScenarioResult:
+    """Runs `call(i)` `requests` times with at most `concurrency` in flight."""
+    for i in range(warmup):
+        await call(-1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async with RssSampler(pid) as rss:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        errors=errors,
+        duration_s=duration,
+        throughput_rps=len(latencies) / duration if duration else 0.0,
+        p50_ms=statistics.median(latencies) if latencies else 0.0,
+        p90_ms=percentile(latencies, 90),
+        p99_ms=percentile(latencies, 99),
+        max_ms=max(latencies, default=0.0),
+        peak_rss_mb=rss.peak_mb,
+    )
+
+
+def write_results(path: Path, results: List[ScenarioResult]) -> None:
+    path.write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+
+def compare_with_baseline(
+    results: List[ScenarioResult], baseline_path: Path, tolerance: float
+) -> List[str]:
+    """
+    Returns regressions against a previous `--output` file: p99 or RSS higher,
+    or throughput lower, by more than `tolerance` (a fraction).
+    """
+    baseline = {r["name"]: r for r in json.loads(baseline_path.read_text())}
+    regressions = []
+
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        if result.p99_ms > previous["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p99 {result.p99_ms:.2f} ms > {previous['p99_ms']:.2f} ms"
+            )
+        if result.throughput_rps < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {result.throughput_rps:.1f} < "
+                f"{previous['throughput_rps']:.1f} req/s"
+            )
+        if (
+            result.peak_rss_mb is not None
+            and previous.get("peak_rss_mb") is not None
+            and result.peak_rss_mb > previous["peak_rss_mb"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{result.name}: RSS {result.peak_rss_mb:.1f} MB > "
+                f"{previous['peak_rss_mb']:.1f} MB"
+            )
+
+    return regressions
@@ -0,0 +1,15 @@
+from typing import Annotated, Optional
+
+from fastapi import Header, HTTPException
+
+from core.admin_auth import admin_enabled, is_admin_authorized
+
+
+async def require_admin(
+    authorization: Annotated[Optional[str], Header()] = None,
+) -> None:
+    # Hide the endpoints entirely unless an admin token is configured
+    if not admin_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_authorized(authorization):
+        raise HTTPException(status_code=401, detail="Admin token required")
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from api.dependencies import require_admin
+from config.settings_config import get_settings
+from core.profiling import ProfilerBusy, memory_snapshots, sampling_profiler
+
+logger = logging.getLogger(__name__)
+
+
+router = APIRouter(prefix="/debug", dependencies=[Depends(require_admin)])
+
+
+@router.post("/profile")
+async def cpu_profile(
+    seconds: Annotated[float, Query(gt=0)] = 10,
+    interval_ms: Annotated[float, Query(ge=1, le=1000)] = 10,
+    format: Literal["collapsed", "pstats"] = "collapsed",
+) -> Response:
+    """
+    Samples every thread's stack for `seconds` and returns collapsed stacks
+    (flamegraph input) or a pstats file.
+    """
+    max_seconds = get_settings().profiling_max_duration_seconds
+    if seconds > max_seconds:
+        raise HTTPException(400, f"seconds must be at most {max_seconds}")
+
+    try:
+        profile = await asyncio.to_thread(
+            sampling_profiler.run, seconds, interval_ms / 1000
+        )
+    except ProfilerBusy as e:
+        raise HTTPException(409, str(e))
+
+    if format == "pstats":
+        return Response(
+            profile.pstats(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return PlainTextResponse(profile.collapsed())
+
+
+@router.get("/tracemalloc")
+async def tracemalloc_status() -> JSONResponse:
+    return JSONResponse(memory_snapshots.status())
+
+
+@router.post("/tracemalloc/start")
+async def tracemalloc_start(
+    frames: Annotated[int, Query(ge=1, le=100)] = 25,
+) -> JSONResponse:
+    return JSONResponse(memory_snapshots.start(frames))
+
+
+@router.post("/tracemalloc/stop")
+async def tracemalloc_stop() -> JSONResponse:
+    return JSONResponse(memory_snapshots.stop())
+
+
+@router.post("/tracemalloc/snapshot")
+async def tracemalloc_snapshot() -> JSONResponse:
+    try:
+        return JSONResponse(await asyncio.to_thread(memory_snapshots.take))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+@router.get("/tracemalloc/diff")
+async def tracemalloc_diff(
+    base: int,
+    target: Optional[int] = None,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+) -> JSONResponse:
+    """Compares snapshot `base` with `target`, or with a new snapshot."""
+    try:
+        return JSONResponse(
+            await asyncio.to_thread(
+                memory_snapshots.diff, base, target, key_type, limit
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
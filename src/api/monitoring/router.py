@@ -1,15 +1,16 @@
 import logging
-import os
 
-import psutil
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse, PlainTextResponse
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST
 
-from core.monitoring import cpu_usage, memory_usage
+from api.monitoring.profiling import router as profiling_router
+from core.monitoring import generate_metrics, update_process_metrics
+from core.shutdown import shutdown_coordinator
 
 logger = logging.getLogger(__name__)
 api_router = APIRouter()
+api_router.include_router(profiling_router)
 
 
 @api_router.get("/healthz")
@@ -31,6 +32,8 @@ async def readyz(request: Request) -> JSONResponse:
     try:
         if not getattr(request.app.state, "ready", False):
             return JSONResponse(status_code=503, content={"status": "unready"})
+        if shutdown_coordinator.draining:
+            return JSONResponse(status_code=503, content={"status": "draining"})
 
         return JSONResponse(status_code=200, content={"status": "ready"})
     except Exception as e:
@@ -45,10 +48,8 @@ async def metrics_endpoint() -> PlainTextResponse:
     Also updates CPU and memory usage just-in-time.
     """
     logger.debug("Metrics endpoint called")
-    process = psutil.Process(os.getpid())
-    memory_usage.set(process.memory_info().rss)
-    cpu_usage.set(process.cpu_percent(interval=0.1))
+    update_process_metrics(cpu_interval=0.1)
 
     return PlainTextResponse(
-        generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST}
+        generate_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST}
     )
@@ -1,14 +1,51 @@
 import logging
+from typing import Annotated, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
-from api.v1.schema.client import AddClientAuthsRequest, ClientRequest, ClientResponse
-from services.client_service import add_client_auths, create_client
+from api.dependencies import require_admin
+from api.v1.schema.client import (
+    AddClientAuthsRequest,
+    ClientAuthResponse,
+    ClientRequest,
+    ClientResponse,
+    ImportResponse,
+    Page,
+    UserTokenResponse,
+)
+from services.client_service import (
+    add_client_auths,
+    create_client,
+    import_client_auths,
+    import_clients,
+    list_client_auths,
+    list_clients,
+    list_user_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Bulk imports and listings expose every tenant's ids, which are all an MCP
+# tool needs to act on a mailbox
+ADMIN_ONLY = [Depends(require_admin)]
+
+# Request body of the bulk endpoints, for the OpenAPI schema
+NDJSON_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+    }
+}
+
+Limit = Annotated[int, Query(ge=1, le=1000, description="Page size")]
+After = Annotated[
+    Optional[UUID],
+    Query(description="`next_cursor` of the previous page; omit for the first page"),
+]
+
 
 @router.post(
     "/client", status_code=status.HTTP_201_CREATED, response_model=ClientResponse
@@ -20,3 +57,65 @@ async def create(payload: ClientRequest):
 @router.post("/client/auths", status_code=status.HTTP_201_CREATED)
 async def add_auths(payload: AddClientAuthsRequest):
     return await add_client_auths(payload)
+
+
+@router.post(
+    "/client/bulk",
+    response_model=ImportResponse,
+    dependencies=ADMIN_ONLY,
+    openapi_extra=NDJSON_BODY,
+)
+async def bulk_create(request: Request):
+    """
+    Creates clients from an NDJSON body, one `ClientImportRow` per line
+    (`{"name": ..., "auths": [...]}`). Rows are written in batches; failed
+    rows are reported by line number and do not stop the import.
+    """
+    return await import_clients(request.stream())
+
+
+@router.post(
+    "/client/auths/bulk",
+    response_model=ImportResponse,
+    dependencies=ADMIN_ONLY,
+    openapi_extra=NDJSON_BODY,
+)
+async def bulk_add_auths(request: Request):
+    """
+    Adds auths from an NDJSON body, one `ClientAuthImportRow` per line (an
+    auth plus its `client_id`). Failed rows are reported by line number.
+    """
+    return await import_client_auths(request.stream())
+
+
+@router.get("/client", response_model=Page[ClientResponse], dependencies=ADMIN_ONLY)
+async def list_(limit: Limit = 100, after: After = None):
+    return await list_clients(limit, str(after) if after else None)
+
+
+@router.get(
+    "/client/auths", response_model=Page[ClientAuthResponse], dependencies=ADMIN_ONLY
+)
+async def list_auths(
+    limit: Limit = 100,
+    after: After = None,
+    client_id: Annotated[Optional[UUID], Query()] = None,
+):
+    return await list_client_auths(
+        limit, str(after) if after else None, str(client_id) if client_id else None
+    )
+
+
+@router.get(
+    "/client/tokens", response_model=Page[UserTokenResponse], dependencies=ADMIN_ONLY
+)
+async def list_tokens(
+    limit: Limit = 100,
+    after: After = None,
+    client_auth_id: Annotated[Optional[UUID], Query()] = None,
+):
+    return await list_user_tokens(
+        limit,
+        str(after) if after else None,
+        str(client_auth_id) if client_auth_id else None,
+    )
@@ -1,10 +1,13 @@
-from typing import List
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
 from uuid import UUID
 
 from pydantic import AnyHttpUrl, BaseModel, Field
 
 from enums.auth_type import AuthType
 
+T = TypeVar("T")
+
 
 class ClientRequest(BaseModel):
     name: str = Field(..., min_length=1, description="Client name")
@@ -34,3 +37,55 @@ class AddClientAuthsRequest(BaseModel):
     auths: List[ClientAuthRequest] = Field(
         ..., min_length=1, description="Types - at least one required"
     )
+
+
+class ClientImportRow(ClientRequest):
+    """One NDJSON line of a bulk client import."""
+
+    auths: List[ClientAuthRequest] = Field(
+        default_factory=list, description="Auths to add to the new client"
+    )
+
+
+class ClientAuthImportRow(ClientAuthRequest):
+    """One NDJSON line of a bulk auth import."""
+
+    client_id: UUID = Field(..., description="Client ID")
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResponse(BaseModel):
+    received: int
+    created: int
+    failed: int
+    errors: List[ImportRowError]
+
+
+class ClientAuthResponse(BaseModel):
+    id: str
+    client_id: str
+    auth_type: AuthType
+    scopes: List[str]
+    google_client_id: str
+    redirect_uri: str
+    created_at: datetime
+
+
+class UserTokenResponse(BaseModel):
+    id: str
+    google_id: str
+    email_address: Optional[str] = None
+    client_auth_id: str
+    expiry: datetime
+    watch_expiration: Optional[datetime] = None
+    created_at: datetime
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass as `after` to fetch the next page; null on the last page
+    next_cursor: Optional[str] = None
@@ -1,14 +1,139 @@
+import atexit
+import copy
+import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import time
 from pathlib import Path
+from typing import List, Optional
 
 import yaml
 
 from config.settings_config import get_settings
 from core.utils import deep_merge
+from enums.log_queue_policy import LogQueuePolicy
 
+# Listeners started by the current logging configuration
+_listeners: List[logging.handlers.QueueListener] = []
 
-def setup_logging():
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never lets a slow downstream handler block the caller
+    for longer than the configured policy allows.
+
+    With the `drop` policy a full queue drops the record immediately; with the
+    `block` policy the caller waits up to `block_timeout` seconds before dropping.
+    Dropped records are counted on `dropped` and in the
+    `chat_api_log_records_dropped_total` metric.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        target_name: str,
+        policy: LogQueuePolicy = LogQueuePolicy.DROP,
+        block_timeout: float = 0.1,
+    ):
+        super().__init__(log_queue)
+        self.target_name = target_name
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so only merge msg/args (args may be mutated
+        # after the call returns) and keep exc_info for the target formatter.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == LogQueuePolicy.BLOCK:
+                self.queue.put(record, block=True, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            # Imported lazily: logging is configured before the metrics exist
+            from core.monitoring import log_records_dropped
+
+            log_records_dropped.labels(handler=self.target_name).inc()
+
+
+def _install_queue_handlers(queue_config: dict) -> None:
+    """
+    Moves every configured handler behind a bounded queue drained by a
+    background `QueueListener` thread.
+
+    Each distinct handler gets its own queue and listener; loggers keep their
+    original handler assignments, pointing at the queue handler instead.
+    """
+    maxsize = int(queue_config.get("maxsize", 10000))
+    policy = LogQueuePolicy(queue_config.get("policy", LogQueuePolicy.DROP.value))
+    block_timeout = float(queue_config.get("block_timeout", 0.1))
+
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+
+    queue_handlers: dict[logging.Handler, BoundedQueueHandler] = {}
+    for logger in loggers:
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                continue
+
+            queue_handler = queue_handlers.get(handler)
+            if queue_handler is None:
+                queue_handler = BoundedQueueHandler(
+                    queue.Queue(maxsize=maxsize),
+                    target_name=handler.get_name() or type(handler).__name__,
+                    policy=policy,
+                    block_timeout=block_timeout,
+                )
+                listener = logging.handlers.QueueListener(
+                    queue_handler.queue, handler, respect_handler_level=True
+                )
+                listener.start()
+                _listeners.append(listener)
+                queue_handlers[handler] = queue_handler
+
+            logger.removeHandler(handler)
+            logger.addHandler(queue_handler)
+
+
+def flush_logging(timeout: float = 1.0) -> None:
+    """
+    Waits (up to `timeout` seconds) for the queue listeners to write out every
+    queued record, then flushes all handlers. Logging keeps working afterwards.
+    """
+    deadline = time.monotonic() + timeout
+    for listener in _listeners:
+        while not listener.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for handler in listener.handlers:
+            handler.flush()
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the queue listeners, flushing every record still queued.
+
+    Safe to call more than once; registered with `atexit` by `setup_logging`.
+    """
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def setup_logging(stream: Optional[str] = None):
     """
     Sets up logging configuration for the application.
 
@@ -16,6 +141,14 @@ def setup_logging():
     override exists, merges it with the base configuration. Ensures that any directories
     for file handlers exist before applying the logging configuration.
 
+    When the merged configuration enables the top-level `queue` section, handlers are
+    moved behind bounded queues drained by background threads so that formatting and
+    I/O never run on the event loop thread.
+
+    Args:
+        stream: Optional stream (e.g. "ext://sys.stderr") replacing the stream of every
+            stream handler; used when stdout carries a protocol (MCP stdio transport).
+
     Raises:
         FileNotFoundError: If the base logging configuration file does not exist.
         yaml.YAMLError: If there is an error parsing the YAML files.
@@ -37,9 +170,27 @@ def setup_logging():
     if Path(env_config_path).exists():
         with open(env_config_path, "r") as f:
             override_config = yaml.safe_load(f)
-        config = deep_merge(base_config, override_config)
+        config = deep_merge(base_config, override_config or {})
     else:
         config = base_config
 
+    # Redirect stream handlers if requested
+    if stream:
+        for handler_config in config.get("handlers", {}).values():
+            if "stream" in handler_config:
+                handler_config["stream"] = stream
+
+    # Queue settings are not part of the dictConfig schema
+    queue_config: Optional[dict] = config.pop("queue", None)
+
+    # Stop listeners of a previous configuration before replacing handlers
+    shutdown_logging()
+
     # Apply the logging configuration
     logging.config.dictConfig(config)
+
+    if queue_config and queue_config.get("enabled", False):
+        _install_queue_handlers(queue_config)
+
+
+atexit.register(shutdown_logging)
@@ -1,10 +1,13 @@
 import logging
 from functools import lru_cache
-from typing import Annotated, List
+from pathlib import Path
+from typing import Annotated, Dict, List, Optional
 
 from pydantic import AnyHttpUrl, BeforeValidator, Field, ValidationError, computed_field
 from pydantic_settings import BaseSettings
 
+from enums.cache_backend import CacheBackendType
+from enums.mcp_notify_level import McpNotifyLevel
 from enums.mcp_transport import McpTransport
 
 logger = logging.getLogger(__name__)
@@ -18,16 +21,172 @@ class Settings(BaseSettings):
     project_version: Annotated[str, BeforeValidator(str.strip), Field(min_length=1)]
     backend_cors_origins: List[AnyHttpUrl]
     allowed_hosts: List[AnyHttpUrl]
+    api_host: Annotated[str, BeforeValidator(str.strip), Field(min_length=1)] = (
+        "0.0.0.0"
+    )
+    api_port: Annotated[int, Field(ge=0)] = 8002
+
+    # workers
+    workers: Annotated[int, Field(ge=1)] = 1
+    prometheus_multiproc_dir: Optional[str] = None
+    leader_lock_dir: Optional[str] = None
+    oauth_flow_ttl_seconds: Annotated[int, Field(ge=1)] = 3600
+    oauth_flow_gc_interval_seconds: Annotated[float, Field(gt=0)] = 300
 
     # mcp
     mcp_host: Annotated[str, BeforeValidator(str.strip), Field(min_length=1)]
     mcp_port: Annotated[int, Field(ge=0)]
     mcp_transport: McpTransport
+    mcp_notify_level: McpNotifyLevel = McpNotifyLevel.INFO
+    mcp_notify_client_levels: Dict[str, McpNotifyLevel] = {}
+    mcp_notify_flush_interval: Annotated[float, Field(ge=0)] = 0.5
+    mcp_notify_progress_interval: Annotated[float, Field(ge=0)] = 0.25
+    # streamable-http without server-side sessions, so any replica can serve any
+    # request (no sticky load balancing); resource subscriptions are disabled
+    mcp_stateless_http: bool = False
+    # Answer with a single JSON body instead of an SSE stream
+    mcp_json_response: bool = False
+    # Request header identifying the caller for per-client admission limits in
+    # stateless mode (requests without it only count against the global limit)
+    mcp_client_id_header: str = "X-Client-Id"
+
+    # admission control
+    api_max_concurrency: Annotated[int, Field(ge=1)] = 256
+    api_client_max_concurrency: Annotated[int, Field(ge=1)] = 64
+    api_max_queue: Annotated[int, Field(ge=0)] = 512
+    api_queue_timeout_seconds: Annotated[float, Field(gt=0)] = 5
+    mcp_max_concurrency: Annotated[int, Field(ge=1)] = 64
+    mcp_client_max_concurrency: Annotated[int, Field(ge=1)] = 16
+    mcp_max_queue: Annotated[int, Field(ge=0)] = 256
+    mcp_queue_timeout_seconds: Annotated[float, Field(gt=0)] = 10
+
+    # graceful shutdown: drain deadline after SIGTERM (keep below the
+    # orchestrator's grace period)
+    shutdown_timeout_seconds: Annotated[int, Field(ge=1)] = 25
+
+    # adaptive upstream concurrency (per upstream and ClientAuth)
+    upstream_initial_limit: Annotated[int, Field(ge=1)] = 10
+    upstream_min_limit: Annotated[int, Field(ge=1)] = 1
+    upstream_max_limit: Annotated[int, Field(ge=1)] = 100
+    upstream_latency_tolerance: Annotated[float, Field(gt=1)] = 2.0
+    upstream_backoff_ratio: Annotated[float, Field(gt=0, lt=1)] = 0.7
+    upstream_baseline_window_seconds: Annotated[float, Field(gt=0)] = 60
+    # Limiters of tenants without calls for this long are dropped
+    upstream_limiter_idle_seconds: Annotated[float, Field(gt=0)] = 600
+
+    # circuit breakers (per upstream endpoint)
+    circuit_failure_threshold: Annotated[int, Field(ge=1)] = 5
+    circuit_recovery_timeout_seconds: Annotated[float, Field(gt=0)] = 30
+    circuit_half_open_max_calls: Annotated[int, Field(ge=1)] = 1
+
+    # idempotency keys
+    idempotency_ttl_seconds: Annotated[int, Field(ge=1)] = 86400
+    idempotency_l1_max_entries: Annotated[int, Field(ge=1)] = 10000
+    # How long a duplicate waits for another replica's in-flight attempt
+    idempotency_pending_timeout_seconds: Annotated[float, Field(gt=0)] = 60
+    # Lifetime of an unfinished claim; must exceed the slowest operation
+    idempotency_pending_lease_seconds: Annotated[int, Field(ge=1)] = 120
+
+    # profiling endpoints (disabled unless an admin token is set)
+    admin_token: Optional[str] = None
+    profiling_max_duration_seconds: Annotated[float, Field(gt=0)] = 60
+    tracemalloc_max_seconds: Annotated[float, Field(gt=0)] = 600
+    tracemalloc_max_snapshots: Annotated[int, Field(ge=2)] = 4
+
+    # admin bulk imports (NDJSON)
+    # Rows written per transaction
+    admin_import_batch_size: Annotated[int, Field(ge=1, le=10000)] = 500
+    admin_import_max_line_bytes: Annotated[int, Field(ge=1024)] = 65536
+
+    # write-behind buffer (token refreshes, send audit records)
+    write_behind_flush_interval_seconds: Annotated[float, Field(gt=0)] = 1.0
+    # Pending writes that trigger a flush before the interval is up
+    write_behind_flush_threshold: Annotated[int, Field(ge=1)] = 500
+    # Writes kept while the database is unavailable; the oldest are dropped
+    write_behind_max_pending: Annotated[int, Field(ge=1)] = 10000
+
+    # cache; the shared (redis or postgres) tier holds credentials unencrypted
+    cache_backend: CacheBackendType = CacheBackendType.LOCAL
+    cache_redis_url: Optional[str] = None
+    cache_l1_ttl_seconds: Annotated[float, Field(gt=0)] = 30
+    cache_l1_max_entries: Annotated[int, Field(ge=1)] = 10000
+    cache_l2_ttl_seconds: Annotated[int, Field(ge=1)] = 3600
+    cache_poll_interval_seconds: Annotated[float, Field(gt=0)] = 2
 
     # google
     google_redirect_uri: AnyHttpUrl
     google_auth_uri: AnyHttpUrl
     google_token_uri: AnyHttpUrl
+    # Root URL override for all Google API clients (e.g. local fakes)
+    google_api_endpoint: Optional[AnyHttpUrl] = None
+    # ID-token signing keys (JWK set), verified locally in the OAuth callback
+    google_certs_uri: AnyHttpUrl = AnyHttpUrl(
+        "https://www.googleapis.com/oauth2/v3/certs"
+    )
+    google_certs_refresh_seconds: Annotated[float, Field(gt=0)] = 3600
+    google_id_token_issuers: List[str] = [
+        "accounts.google.com",
+        "https://accounts.google.com",
+    ]
+    google_id_token_clock_skew_seconds: Annotated[int, Field(ge=0)] = 10
+
+    # gmail push notifications (users.watch + Pub/Sub push)
+    # Pub/Sub topic Gmail publishes to: projects/<project>/topics/<topic>
+    gmail_watch_topic: Optional[str] = None
+    gmail_watch_label_ids: List[str] = ["INBOX"]
+    gmail_watch_renew_before_seconds: Annotated[int, Field(ge=60)] = 86400
+    gmail_watch_renew_interval_seconds: Annotated[float, Field(gt=0)] = 3600
+    # Shared secret expected as `?token=` on the push endpoint. The endpoint
+    # rejects every push unless this or `gmail_push_audience` is set
+    gmail_push_token: Optional[str] = None
+    # Audience of the Pub/Sub OIDC token (push subscription auth), if enabled
+    gmail_push_audience: Optional[str] = None
+    gmail_push_dedupe_ttl_seconds: Annotated[float, Field(gt=0)] = 600
+    gmail_changes_buffer_size: Annotated[int, Field(ge=1)] = 500
+    # Lifetime of the changes buffer in the shared cache backend, if any
+    gmail_changes_ttl_seconds: Annotated[int, Field(ge=1)] = 86400
+
+    # gmail sends
+    # Recipients (to + cc + bcc) per message; larger sends are split into
+    # several messages, the extra ones BCC-only
+    gmail_max_recipients_per_message: Annotated[int, Field(ge=1)] = 100
+    # Messages of one split send in flight at once
+    gmail_fanout_concurrency: Annotated[int, Field(ge=1)] = 4
+
+    # gmail message reads
+    gmail_read_max_messages: Annotated[int, Field(ge=1)] = 100
+    # Messages fetched in parallel per read
+    gmail_read_concurrency: Annotated[int, Field(ge=1)] = 8
+    # Byte budget of the message content cache (memory and disk together)
+    gmail_content_cache_max_bytes: Annotated[int, Field(ge=0)] = 256 * 1024 * 1024
+    # Larger entries spill to disk and are read back memory-mapped
+    gmail_content_cache_inline_max_bytes: Annotated[int, Field(ge=0)] = 64 * 1024
+    # Parent of the per-process spill directory; the system temp dir if unset
+    gmail_content_cache_dir: Optional[Path] = None
+
+    # gmail mail merge
+    gmail_merge_max_recipients: Annotated[int, Field(ge=1)] = 1000
+    # Sends in flight per merge; the upstream limiter still caps the total
+    gmail_merge_concurrency: Annotated[int, Field(ge=1)] = 8
+
+    # google drive transfers
+    # Local directory Drive uploads are read from and downloads written to;
+    # the Drive tools are disabled until it is set
+    drive_transfer_dir: Optional[Path] = None
+    # Bytes per upload request / ranged download request (Drive requires
+    # multiples of 256 KiB for resumable upload chunks)
+    drive_chunk_size_bytes: Annotated[int, Field(ge=262144, multiple_of=262144)] = (
+        8 * 1024 * 1024
+    )
+    # Ranged requests in flight per download; memory is bounded by
+    # prefetch × chunk size
+    drive_download_prefetch: Annotated[int, Field(ge=1)] = 4
+
+    # calendar free/busy
+    calendar_freebusy_max_calendars: Annotated[int, Field(ge=1)] = 200
+    # Busy intervals per (user, calendar, window) are reused for this long
+    calendar_freebusy_cache_ttl_seconds: Annotated[float, Field(gt=0)] = 60
+    calendar_freebusy_cache_max_entries: Annotated[int, Field(ge=1)] = 10000
 
     class ConfigDict:
         env_file = ".env"
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+from core.monitoring import (
+    upstream_concurrency_limit,
+    upstream_limit_decreases_counter,
+    upstream_limiters_gauge,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often `AdaptiveLimiterGroup` evicts idle limiters and reports its metrics
+_SWEEP_INTERVAL_SECONDS = 15.0
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one upstream and tenant.
+
+    The limit grows by about one per round trip while latency stays within
+    `latency_tolerance` times the baseline (the minimum round trip seen over the
+    last one to two `baseline_window`s), and is multiplied by `backoff_ratio` when
+    latency rises above that or the upstream throttles or times out. Decreases are
+    spaced at least one baseline round trip apart, so a burst of slow responses
+    from one congestion event cuts the limit only once.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        key: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float,
+        backoff_ratio: float,
+        baseline_window: float,
+        is_overload: Callable[[BaseException], bool],
+    ):
+        self.upstream = upstream
+        self.key = key
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.baseline_window = baseline_window
+        self._is_overload = is_overload
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        # Windowed minimum round trip: previous and current window
+        self._previous_min: Optional[float] = None
+        self._window_min: Optional[float] = None
+        self._window_start = time.monotonic()
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+        self.last_used = time.monotonic()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _set_limit(self, value: float) -> None:
+        previous = self.limit
+        self._limit = min(max(value, self.min_limit), self.max_limit)
+        if self.limit != previous:
+            logger.debug(
+                f"Upstream limit {self.upstream}/{self.key}: {previous} -> {self.limit}",
+                extra={"upstream": self.upstream, "key": self.key, "limit": self.limit},
+            )
+
+    @property
+    def baseline(self) -> Optional[float]:
+        mins = [m for m in (self._previous_min, self._window_min) if m is not None]
+        return min(mins) if mins else None
+
+    def _record_rtt(self, rtt: float) -> None:
+        now = time.monotonic()
+        if now - self._window_start >= self.baseline_window:
+            self._previous_min, self._window_min = self._window_min, None
+            self._window_start = now
+        if self._window_min is None or rtt < self._window_min:
+            self._window_min = rtt
+
+    def _on_success(self, rtt: float, in_flight: int) -> None:
+        self._record_rtt(rtt)
+        if rtt > (self.baseline or rtt) * self.latency_tolerance:
+            self._decrease()
+            return
+
+        # Only grow when the current limit is actually being used
+        if in_flight * 2 >= self.limit:
+            self._set_limit(self._limit + 1 / self._limit)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self.baseline or 0.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._set_limit(self._limit * self.backoff_ratio)
+        if self.limit < previous:
+            upstream_limit_decreases_counter.labels(upstream=self.upstream).inc()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Waits for a slot under the current limit and samples the call."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            in_flight = self._in_flight
+
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if self._is_overload(e):
+                self._decrease()
+            raise
+        else:
+            self._on_success(time.monotonic() - start, in_flight)
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+
+class AdaptiveLimiterGroup:
+    """
+    Lazily created `AdaptiveLimiter`s, one per (upstream, key). Limiters
+    unused for `idle_timeout` seconds are evicted, so memory follows the
+    active tenants rather than all of them; a returning tenant starts again
+    from the initial limit. Metrics are per upstream, never per key.
+    """
+
+    def __init__(
+        self, factory: Callable[[str, str], AdaptiveLimiter], idle_timeout: float
+    ):
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self._limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+        self._last_sweep = time.monotonic()
+        self._reported: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._limiters)
+
+    def get(self, upstream: str, key: str) -> AdaptiveLimiter:
+        now = time.monotonic()
+        if now - self._last_sweep >= _SWEEP_INTERVAL_SECONDS:
+            self.sweep(now)
+
+        limiter = self._limiters.get((upstream, key))
+        if limiter is None:
+            limiter = self._limiters[(upstream, key)] = self._factory(upstream, key)
+        limiter.last_used = now
+        return limiter
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """Evicts idle limiters and reports per-upstream metrics."""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        lowest: Dict[str, int] = {}
+        counts: Dict[str, int] = {}
+        for group_key, limiter in list(self._limiters.items()):
+            if limiter.in_flight == 0 and now - limiter.last_used > self.idle_timeout:
+                del self._limiters[group_key]
+                continue
+            upstream = limiter.upstream
+            lowest[upstream] = min(lowest.get(upstream, limiter.limit), limiter.limit)
+            counts[upstream] = counts.get(upstream, 0) + 1
+
+        # Upstreams whose last limiter was evicted report zero limiters
+        for upstream in self._reported - counts.keys():
+            upstream_limiters_gauge.labels(upstream=upstream).set(0)
+            upstream_concurrency_limit.remove(upstream)
+        for upstream, count in counts.items():
+            upstream_limiters_gauge.labels(upstream=upstream).set(count)
+            upstream_concurrency_limit.labels(upstream=upstream).set(lowest[upstream])
+        self._reported = set(counts)
@@ -0,0 +1,19 @@
+import secrets
+from typing import Optional
+
+from config.settings_config import get_settings
+
+
+def admin_enabled() -> bool:
+    return bool(get_settings().admin_token)
+
+
+def is_admin_authorized(authorization: Optional[str]) -> bool:
+    """Checks an `Authorization: Bearer <admin_token>` header value."""
+    admin_token = get_settings().admin_token
+    if not admin_token or not authorization:
+        return False
+    scheme, _, token = authorization.partition(" ")
+    return scheme.lower() == "bearer" and secrets.compare_digest(
+        token.strip(), admin_token
+    )
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from core.monitoring import (
+    admission_in_flight,
+    admission_queue_depth,
+    admission_rejections_counter,
+    admission_wait_histogram,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call is not admitted; the caller may retry after `retry_after`."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Admission rejected ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class _ClientSlot:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class AdmissionController:
+    """
+    Bounds concurrent executions globally and per client.
+
+    Calls over the limit wait in a bounded queue for at most `queue_timeout` seconds;
+    when the queue is full or the wait times out the call is rejected immediately
+    with `AdmissionRejected`, instead of piling up in memory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        client_max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.client_max_concurrency = client_max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._clients: Dict[str, _ClientSlot] = {}
+        self._waiting = 0
+        self._in_flight = 0
+        # Moving average of how long admitted calls hold their slot
+        self._avg_hold = 0.0
+        self._closed = False
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        """Rejects new calls (reason `draining`); admitted and queued calls finish."""
+        self._closed = True
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Waits until no call is running or queued; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._in_flight or self._waiting:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a queued call would be admitted."""
+        backlog = (self._waiting + 1) / self.max_concurrency
+        return max(1.0, min(self._avg_hold * backlog, self.queue_timeout * 2))
+
+    def _reject(
+        self, reason: str, retry_after: Optional[float] = None
+    ) -> AdmissionRejected:
+        admission_rejections_counter.labels(controller=self.name, reason=reason).inc()
+        logger.warning(
+            f"Admission rejected for {self.name}: {reason}",
+            extra={
+                "controller": self.name,
+                "reason": reason,
+                "waiting": self._waiting,
+                "in_flight": self._in_flight,
+            },
+        )
+        return AdmissionRejected(
+            reason, self.retry_after() if retry_after is None else retry_after
+        )
+
+    async def _acquire(self, semaphore: asyncio.Semaphore, deadline: float) -> None:
+        if not semaphore.locked():
+            await semaphore.acquire()
+            return
+        if self._waiting >= self.max_queue:
+            raise self._reject("queue_full")
+
+        self._waiting += 1
+        admission_queue_depth.labels(controller=self.name).inc()
+        try:
+            await asyncio.wait_for(
+                semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            raise self._reject("timeout") from None
+        finally:
+            self._waiting -= 1
+            admission_queue_depth.labels(controller=self.name).dec()
+
+    def _client_slot(self, client_key: str) -> _ClientSlot:
+        slot = self._clients.get(client_key)
+        if slot is None:
+            slot = self._clients[client_key] = _ClientSlot(self.client_max_concurrency)
+        slot.users += 1
+        return slot
+
+    def _release_client_slot(self, client_key: str, slot: _ClientSlot) -> None:
+        slot.users -= 1
+        if slot.users == 0:
+            self._clients.pop(client_key, None)
+
+    @asynccontextmanager
+    async def admit(self, client_key: Optional[str] = None) -> AsyncIterator[None]:
+        """Holds a global (and per-client, when `client_key` is set) slot."""
+        if self._closed:
+            # Shutting down: the caller should retry on another replica now
+            raise self._reject("draining", retry_after=0)
+
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        slot = self._client_slot(client_key) if client_key else None
+
+        try:
+            # Per-client first, so one busy client queues behind itself and does
+            # not hold global slots while waiting
+            if slot is not None:
+                await self._acquire(slot.semaphore, deadline)
+            try:
+                await self._acquire(self._semaphore, deadline)
+            except BaseException:
+                if slot is not None:
+                    slot.semaphore.release()
+                raise
+        except BaseException:
+            if slot is not None:
+                self._release_client_slot(client_key, slot)  # type: ignore[arg-type]
+            raise
+
+        admitted = time.monotonic()
+        admission_wait_histogram.labels(controller=self.name).observe(admitted - start)
+        self._in_flight += 1
+        admission_in_flight.labels(controller=self.name).inc()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - admitted
+            self._avg_hold = (
+                held if not self._avg_hold else 0.9 * self._avg_hold + 0.1 * held
+            )
+            self._in_flight -= 1
+            admission_in_flight.labels(controller=self.name).dec()
+            self._semaphore.release()
+            if slot is not None:
+                slot.semaphore.release()
+                self._release_client_slot(client_key, slot)  # type: ignore[arg-type]
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from core.leader import LeaderLock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    func: Callable[[], Awaitable[None]]
+    interval: float
+    leader_only: bool = False
+
+
+class BackgroundTasks:
+    """
+    Periodic background jobs owned by a server lifespan.
+
+    Jobs marked `leader_only` run in exactly one worker process per host (see
+    `LeaderLock`); the others run in every worker, e.g. per-process metric
+    samplers and cache refreshers.
+    """
+
+    def __init__(self, name: str):
+        self._leader = LeaderLock(name)
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Jobs currently inside `func()`
+        self._running: Set[str] = set()
+        self._stopping = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader.is_leader
+
+    def add_periodic(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        interval: float,
+        leader_only: bool = False,
+    ) -> None:
+        if name in self._jobs:
+            raise ValueError(f"Background job '{name}' already registered")
+        self._jobs[name] = PeriodicJob(name, func, interval, leader_only)
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            if job.name not in self._tasks:
+                self._tasks[job.name] = asyncio.create_task(
+                    self._run(job), name=f"background:{job.name}"
+                )
+        logger.info(f"Started background jobs: {', '.join(self._tasks) or 'none'}")
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops every job. Idle jobs stop at once; a job that is running gets
+        up to `timeout` seconds to finish before it is cancelled.
+        """
+        self._stopping = True
+        tasks = dict(self._tasks)
+        self._tasks.clear()
+
+        busy = [task for name, task in tasks.items() if name in self._running]
+        for name, task in tasks.items():
+            if name not in self._running:
+                task.cancel()
+        if busy:
+            _, pending = await asyncio.wait(busy, timeout=timeout)
+            for task in pending:
+                logger.warning(f"Cancelling background job {task.get_name()}")
+                task.cancel()
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=1)
+
+        self._leader.release()
+        logger.info("Stopped background jobs")
+
+    async def _run(self, job: PeriodicJob) -> None:
+        while not self._stopping:
+            await asyncio.sleep(job.interval)
+
+            if job.leader_only and not self._leader.try_acquire():
+                continue
+
+            self._running.add(job.name)
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Background job '{job.name}' failed: {type(e).__name__}: {e}",
+                    extra={"job": job.name},
+                )
+            finally:
+                self._running.discard(job.name)
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Shared (L2) cache tier used by every replica.
+
+    Writes and deletes must notify the other replicas, which receive the
+    affected keys through `listen()` and drop them from their L1 tier.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def listen(self, on_invalidate: Callable[[str], None]) -> None:
+        """
+        Calls `on_invalidate(key)` for keys changed by other replicas.
+
+        Runs until cancelled and must survive transient backend errors.
+        """
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+import orjson
+
+from core.cache.local import MISSING
+from core.monitoring import (
+    cache_requests_counter,
+    content_cache_bytes_gauge,
+    content_cache_evictions_counter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Blob:
+    size: int
+    # Inline blobs keep their bytes; spilled blobs live in `path`
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+    refs: int = 0
+
+    @property
+    def tier(self) -> str:
+        return "memory" if self.path is None else "disk"
+
+
+def _read_mapped(path: Path) -> Any:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Decoded straight from the mapped pages, without a heap copy
+            view = memoryview(mapped)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    partial = path.with_suffix(".part")
+    with open(partial, "wb") as f:
+        f.write(data)
+    os.replace(partial, path)
+
+
+class ContentCache:
+    """
+    Byte-budgeted LRU cache for immutable JSON content (e.g. Gmail messages),
+    without expiry: entries leave on eviction or explicit `delete`.
+
+    Values are stored encoded and content-addressed: keys point at the SHA-256
+    of the encoding, so identical content is stored once. Blobs up to
+    `inline_max_bytes` stay in memory; larger ones spill to files under
+    `directory` (default: the system temp directory) and are read back through
+    `mmap`. Least recently used keys are evicted while the stored bytes of
+    both tiers exceed `max_bytes`.
+
+    Not thread-safe; meant to be used from the event loop thread only (file
+    I/O runs in worker threads).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        inline_max_bytes: int,
+        directory: Optional[Path] = None,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.inline_max_bytes = inline_max_bytes
+        self._directory = directory
+        self._spill_dir: Optional[Path] = None
+        self._keys: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._blobs: Dict[str, _Blob] = {}
+        self._bytes = {"memory": 0, "disk": 0}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes["memory"] + self._bytes["disk"]
+
+    async def get(self, key: Hashable) -> Any:
+        """Returns the cached value, or `MISSING` if absent."""
+        digest = self._keys.get(key)
+        blob = self._blobs.get(digest) if digest is not None else None
+        if blob is None:
+            cache_requests_counter.labels(cache=self.name, result="miss").inc()
+            return MISSING
+
+        self._keys.move_to_end(key)
+        if blob.data is not None:
+            value = orjson.loads(blob.data)
+        else:
+            try:
+                value = await asyncio.to_thread(_read_mapped, blob.path)
+            except (FileNotFoundError, ValueError):
+                # Evicted while reading, or a damaged file
+                self.delete(key)
+                cache_requests_counter.labels(cache=self.name, result="miss").inc()
+                return MISSING
+        cache_requests_counter.labels(cache=self.name, result=f"{blob.tier}_hit").inc()
+        return value
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        data = orjson.dumps(value)
+        if len(data) > self.max_bytes:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+
+        if digest not in self._blobs:
+            blob = _Blob(size=len(data))
+            if len(data) <= self.inline_max_bytes:
+                blob.data = data
+            else:
+                path = self._spill_path(digest)
+                try:
+                    await asyncio.to_thread(_write_file, path, data)
+                except OSError as e:
+                    # A full or unwritable disk only costs the cache entry
+                    logger.warning(f"Content cache '{self.name}' spill failed: {e}")
+                    return
+                blob.path = path
+            # Another task may have stored the same content meanwhile
+            if digest not in self._blobs:
+                self._blobs[digest] = blob
+                self._bytes[blob.tier] += blob.size
+
+        if self._keys.get(key) != digest:
+            self.delete(key)
+            self._blobs[digest].refs += 1
+        self._keys[key] = digest
+        self._keys.move_to_end(key)
+
+        while self.size_bytes > self.max_bytes and self._keys:
+            _, evicted = self._keys.popitem(last=False)
+            tier = self._release(evicted)
+            if tier:
+                content_cache_evictions_counter.labels(cache=self.name, tier=tier).inc()
+        self._report()
+
+    def delete(self, key: Hashable) -> None:
+        digest = self._keys.pop(key, None)
+        if digest is not None:
+            self._release(digest)
+            self._report()
+
+    def close(self) -> None:
+        """Drops all entries and removes the spill directory."""
+        self._keys.clear()
+        self._blobs.clear()
+        self._bytes = {"memory": 0, "disk": 0}
+        self._report()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _release(self, digest: str) -> Optional[str]:
+        """Drops one reference; returns the tier of a freed blob, if freed."""
+        blob = self._blobs.get(digest)
+        if blob is None:
+            return None
+        blob.refs -= 1
+        if blob.refs > 0:
+            return None
+        del self._blobs[digest]
+        self._bytes[blob.tier] -= blob.size
+        if blob.path is not None:
+            try:
+                # Readers holding a mapping keep the pages until they unmap
+                os.unlink(blob.path)
+            except FileNotFoundError:
+                pass
+        return blob.tier
+
+    def _spill_path(self, digest: str) -> Path:
+        if self._spill_dir is None:
+            if self._directory is not None:
+                self._directory.mkdir(parents=True, exist_ok=True)
+            # Private per process, so replicas can share `directory`
+            self._spill_dir = Path(
+                tempfile.mkdtemp(prefix=f"{self.name}-", dir=self._directory)
+            )
+            logger.info(f"Content cache '{self.name}' spills to {self._spill_dir}")
+        return self._spill_dir / digest
+
+    def _report(self) -> None:
+        for tier, size in self._bytes.items():
+            content_cache_bytes_gauge.labels(cache=self.name, tier=tier).set(size)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from prisma.errors import RawQueryError
+
+from core.cache.base import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Also declared as the `CacheEntry` model in prisma/schema.prisma, so that
+# `prisma db push` keeps the table; the sequence is not in the schema.
+# UNLOGGED: cache rows skip the WAL; they are lost on a crash, which is fine
+_CREATE_TABLE = """
+CREATE UNLOGGED TABLE IF NOT EXISTS cache_entry (
+    key        text PRIMARY KEY,
+    value      text,
+    origin     text NOT NULL,
+    version    bigint NOT NULL,
+    expires_at timestamptz NOT NULL
+)
+"""
+# A table created by `prisma db push` is logged (a no-op if already unlogged)
+_SET_UNLOGGED = "ALTER TABLE cache_entry SET UNLOGGED"
+_CREATE_SEQUENCE = "CREATE SEQUENCE IF NOT EXISTS cache_entry_version_seq"
+_CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS cache_entry_version_idx ON cache_entry (version)"
+)
+
+# Postgres undefined_table, also raised for a missing sequence
+_UNDEFINED_TABLE = "42P01"
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    L2 tier in an UNLOGGED Postgres table.
+
+    Every write stamps the row with a new version from a sequence; deletes
+    leave a tombstone (NULL value) that outlives a few poll intervals. Replicas
+    poll for versions newer than the last one seen and drop those keys from
+    their L1 tier.
+
+    The table and sequence are created on first use, and again if they were
+    dropped. Values are stored as is: cached credentials (access and refresh
+    tokens, Google client secrets) are as readable here as in their own tables.
+    """
+
+    def __init__(self, prefix: str, poll_interval: float):
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+        self.origin = uuid.uuid4().hex
+        self._ready = False
+        # Bumped whenever the table is re-created; versions may start over
+        self._generation = 0
+
+    async def _get_db(self):
+        # Imported lazily: the generated client is heavy (see google_mcp.lazy)
+        from db.prisma.utils import get_db
+
+        db = await get_db()
+        if not self._ready:
+            await db.execute_raw(_CREATE_TABLE)
+            await db.execute_raw(_SET_UNLOGGED)
+            await db.execute_raw(_CREATE_SEQUENCE)
+            await db.execute_raw(_CREATE_INDEX)
+            self._ready = True
+        return db
+
+    async def _run(self, statement: Callable[[Any], Awaitable[T]]) -> T:
+        """Runs `statement(db)`, re-creating a dropped table once."""
+        db = await self._get_db()
+        try:
+            return await statement(db)
+        except RawQueryError as e:
+            if (e.meta or {}).get("code") != _UNDEFINED_TABLE:
+                raise
+            logger.warning(f"Cache table missing, re-creating it: {e}")
+            self._ready = False
+            self._generation += 1
+            return await statement(await self._get_db())
+
+    async def get(self, key: str) -> Optional[str]:
+        rows = await self._run(
+            lambda db: db.query_raw(
+                "SELECT value FROM cache_entry WHERE key = $1 AND expires_at > now()",
+                self.prefix + key,
+            )
+        )
+        return rows[0]["value"] if rows else None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._write(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._write(key, None, int(self.poll_interval * 10) + 1)
+
+    async def _write(self, key: str, value: Optional[str], ttl: int) -> None:
+        await self._run(
+            lambda db: db.execute_raw(
+                """
+                INSERT INTO cache_entry (key, value, origin, version, expires_at)
+                VALUES ($1, $2, $3, nextval('cache_entry_version_seq'),
+                        now() + make_interval(secs => $4))
+                ON CONFLICT (key) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    origin = EXCLUDED.origin,
+                    version = EXCLUDED.version,
+                    expires_at = EXCLUDED.expires_at
+                """,
+                self.prefix + key,
+                value,
+                self.origin,
+                ttl,
+            )
+        )
+
+    async def listen(self, on_invalidate: Callable[[str], None]) -> None:
+        last_version: Optional[int] = None
+        generation = self._generation
+        while True:
+            try:
+                if generation != self._generation:
+                    # Re-created by this replica. Others that missed the drop
+                    # see no invalidations until the new versions pass their
+                    # last one; their L1 entries expire meanwhile.
+                    last_version, generation = None, self._generation
+                if last_version is None:
+                    rows = await self._run(
+                        lambda db: db.query_raw(
+                            "SELECT COALESCE(MAX(version), 0) AS version"
+                            " FROM cache_entry"
+                        )
+                    )
+                    last_version = int(rows[0]["version"])
+                else:
+                    rows = await self._run(
+                        lambda db: db.query_raw(
+                            """
+                            SELECT key, origin, version FROM cache_entry
+                            WHERE version > $1 ORDER BY version
+                            """,
+                            last_version,
+                        )
+                    )
+                    for row in rows:
+                        last_version = int(row["version"])
+                        if row["origin"] != self.origin and row["key"].startswith(
+                            self.prefix
+                        ):
+                            on_invalidate(row["key"][len(self.prefix) :])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation poll failed: {type(e).__name__}: {e}"
+                )
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def purge_expired(self) -> int:
+        """Deletes expired rows and tombstones; run as a leader-only job."""
+        return await self._run(
+            lambda db: db.execute_raw(
+                "DELETE FROM cache_entry WHERE expires_at < now()"
+            )
+        )
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import uuid
+from typing import Callable, Optional
+
+from core.cache.base import CacheBackend
+from core.cache.resp import RespConnection
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    L2 tier on a Redis-compatible server.
+
+    Every write publishes `<origin>|<key>` on a pub/sub channel; replicas drop
+    the key from their L1 tier unless they are the origin of the write.
+    """
+
+    def __init__(self, url: str, prefix: str, channel: Optional[str] = None):
+        self.url = url
+        self.prefix = prefix
+        self.channel = channel or f"{prefix}invalidate"
+        self.origin = uuid.uuid4().hex
+        self._conn = RespConnection(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._conn.execute("GET", self.prefix + key)
+        return value.decode("utf-8") if isinstance(value, bytes) else None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._conn.execute("SET", self.prefix + key, value, "EX", ttl)
+        await self._conn.execute("PUBLISH", self.channel, f"{self.origin}|{key}")
+
+    async def delete(self, key: str) -> None:
+        await self._conn.execute("DEL", self.prefix + key)
+        await self._conn.execute("PUBLISH", self.channel, f"{self.origin}|{key}")
+
+    async def listen(self, on_invalidate: Callable[[str], None]) -> None:
+        backoff = 0.5
+        while True:
+            subscriber = RespConnection(self.url)
+            try:
+                await subscriber.connect()
+                await subscriber.send("SUBSCRIBE", self.channel)
+                backoff = 0.5
+
+                while True:
+                    message = await subscriber.read()
+                    if not isinstance(message, list) or message[0] != b"message":
+                        continue
+
+                    origin, _, key = message[2].decode("utf-8").partition("|")
+                    if origin != self.origin:
+                        on_invalidate(key)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation subscription failed: {type(e).__name__}: {e}"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                await subscriber.close()
+
+    async def close(self) -> None:
+        await self._conn.close()
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, List, Optional, Union
+from urllib.parse import urlparse
+
+RespValue = Union[None, int, bytes, str, List[Any]]
+
+
+class RespError(Exception):
+    """Error reply returned by a Redis-compatible server."""
+
+
+class RespConnection:
+    """
+    Minimal client for the Redis serialization protocol (RESP2).
+
+    Supports exactly what the cache needs (commands, replies and pub/sub
+    messages), so any Redis-compatible server or local stand-in can back it.
+    Commands on one connection are serialized with a lock.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "tcp"):
+            raise ValueError(f"Unsupported cache URL scheme '{parsed.scheme}'")
+
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        if self.password:
+            await self._command("AUTH", self.password)
+        if self.db:
+            await self._command("SELECT", self.db)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._reader = self._writer = None
+
+    async def execute(self, *args: Any) -> RespValue:
+        """Sends one command and returns its reply, reconnecting if needed."""
+        async with self._lock:
+            if not self.is_connected:
+                await self.connect()
+            try:
+                return await self._command(*args)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                await self.close()
+                raise
+
+    async def send(self, *args: Any) -> None:
+        """Sends a command without waiting for a reply (pub/sub mode)."""
+        assert self._writer is not None
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+
+    async def read(self) -> RespValue:
+        assert self._reader is not None
+        return await self._read_reply()
+
+    async def _command(self, *args: Any) -> RespValue:
+        await self.send(*args)
+        return await asyncio.wait_for(self._read_reply(), self.timeout)
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> RespValue:
+        assert self._reader is not None
+        line = await self._reader.readuntil(b"\r\n")
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RespError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+
+        raise RespError(f"Unexpected reply type: {line!r}")
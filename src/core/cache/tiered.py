@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from config.settings_config import get_settings
+from core.cache.base import CacheBackend
+from core.cache.local import MISSING, LocalCache
+from core.monitoring import cache_invalidations_counter, cache_requests_counter
+from enums.cache_backend import CacheBackendType
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Caches by namespace, used to route invalidations from other replicas
+_caches: Dict[str, "TieredCache"] = {}
+_listener: Optional[asyncio.Task] = None
+
+
+@lru_cache()
+def get_cache_backend() -> Optional[CacheBackend]:
+    """
+    Returns the shared (L2) backend configured by `cache_backend`, or None
+    when only the in-process tier is used.
+    """
+    settings = get_settings()
+    prefix = f"{settings.project_name}:"
+
+    match CacheBackendType(settings.cache_backend):
+        case CacheBackendType.REDIS:
+            from core.cache.redis_backend import RedisCacheBackend
+
+            if not settings.cache_redis_url:
+                raise RuntimeError("CACHE_REDIS_URL is required for the redis backend")
+            return RedisCacheBackend(settings.cache_redis_url, prefix=prefix)
+
+        case CacheBackendType.POSTGRES:
+            from core.cache.postgres_backend import PostgresCacheBackend
+
+            return PostgresCacheBackend(
+                prefix=prefix, poll_interval=settings.cache_poll_interval_seconds
+            )
+
+        case _:
+            return None
+
+
+class TieredCache(Generic[M]):
+    """
+    Two-tier read-through cache for pydantic models.
+
+    L1 is a short-TTL in-process LRU; L2 is the shared backend, so a replica
+    that misses locally still reuses what another replica already loaded or
+    refreshed. Concurrent misses for the same key share a single load, and
+    L2 errors degrade to loading from the source instead of failing.
+    """
+
+    def __init__(self, namespace: str, model: Type[M]):
+        if namespace in _caches:
+            raise ValueError(f"Cache namespace '{namespace}' already registered")
+
+        settings = get_settings()
+        self.namespace = namespace
+        self.model = model
+        self.l2_ttl = settings.cache_l2_ttl_seconds
+        self._l1: LocalCache[M] = LocalCache(
+            settings.cache_l1_max_entries, settings.cache_l1_ttl_seconds
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        _caches[namespace] = self
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(
+        self, key: str, loader: Callable[[], Awaitable[Optional[M]]]
+    ) -> Optional[M]:
+        """
+        Returns the cached value for `key`, calling `loader` on a miss.
+        `None` results are not cached.
+        """
+        value = self._l1.get(key)
+        if value is not MISSING:
+            cache_requests_counter.labels(cache=self.namespace, result="l1_hit").inc()
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._load(key, loader)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so that unawaited failures are not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(
+        self, key: str, loader: Callable[[], Awaitable[Optional[M]]]
+    ) -> Optional[M]:
+        backend = get_cache_backend()
+
+        if backend is not None:
+            try:
+                raw = await backend.get(self._key(key))
+            except Exception as e:
+                logger.warning(f"L2 cache read failed: {type(e).__name__}: {e}")
+                raw = None
+
+            if raw is not None:
+                cache_requests_counter.labels(
+                    cache=self.namespace, result="l2_hit"
+                ).inc()
+                value = self.model.model_validate_json(raw)
+                self._l1.set(key, value)
+                return value
+
+        cache_requests_counter.labels(cache=self.namespace, result="miss").inc()
+        value = await loader()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def set(self, key: str, value: M) -> None:
+        """Stores `value` in both tiers and invalidates other replicas' L1."""
+        self._l1.set(key, value)
+
+        backend = get_cache_backend()
+        if backend is None:
+            return
+        try:
+            await backend.set(self._key(key), value.model_dump_json(), self.l2_ttl)
+        except Exception as e:
+            logger.warning(f"L2 cache write failed: {type(e).__name__}: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        self._l1.delete(key)
+
+        backend = get_cache_backend()
+        if backend is None:
+            return
+        try:
+            await backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"L2 cache delete failed: {type(e).__name__}: {e}")
+
+    def drop_local(self, key: str) -> None:
+        """Drops `key` from this replica's L1 tier only."""
+        self._l1.delete(key)
+        cache_invalidations_counter.labels(cache=self.namespace).inc()
+
+
+def _on_invalidate(full_key: str) -> None:
+    namespace, _, key = full_key.partition(":")
+    cache = _caches.get(namespace)
+    if cache is not None:
+        cache.drop_local(key)
+
+
+def start_cache_invalidation() -> None:
+    """Starts listening for invalidations from other replicas (lifespan startup)."""
+    global _listener
+
+    backend = get_cache_backend()
+    if backend is None or _listener is not None:
+        return
+
+    _listener = asyncio.create_task(
+        backend.listen(_on_invalidate), name="cache-invalidation"
+    )
+    logger.info(f"Started cache invalidation listener: {type(backend).__name__}")
+
+
+async def stop_cache_invalidation() -> None:
+    global _listener
+
+    if _listener is not None:
+        _listener.cancel()
+        await asyncio.gather(_listener, return_exceptions=True)
+        _listener = None
+
+    backend = get_cache_backend()
+    if backend is not None:
+        await backend.close()
+
+
+async def purge_expired_cache_entries() -> None:
+    """Removes expired L2 rows where the backend needs it (leader-only job)."""
+    backend = get_cache_backend()
+    purge = getattr(backend, "purge_expired", None)
+    if purge is not None:
+        await purge()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict
+
+from core.monitoring import (
+    circuit_rejections_counter,
+    circuit_state_gauge,
+    circuit_transitions_counter,
+)
+from enums.circuit_state import CircuitState
+
+logger = logging.getLogger(__name__)
+
+_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the upstream while its circuit is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(
+            f"Upstream {upstream} is unavailable (circuit open), "
+            f"retry after {max(1, math.ceil(retry_after))}s"
+        )
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail
+    immediately with `CircuitOpenError`. Once `recovery_timeout` has passed it
+    turns half-open and lets up to `half_open_max_calls` probes through: a
+    successful probe closes the circuit, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int,
+        is_failure: Callable[[BaseException], bool],
+    ):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._is_failure = is_failure
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        circuit_state_gauge.labels(upstream=upstream).set(0)
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def _transition(self, state: CircuitState, reason: str = "") -> None:
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        self._probes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+
+        circuit_state_gauge.labels(upstream=self.upstream).set(_STATE_VALUES[state])
+        circuit_transitions_counter.labels(
+            upstream=self.upstream, state=state.value
+        ).inc()
+        log = logger.warning if state == CircuitState.OPEN else logger.info
+        log(
+            f"Circuit {self.upstream}: {previous.value} -> {state.value}"
+            + (f" ({reason})" if reason else ""),
+            extra={"upstream": self.upstream, "circuit_state": state.value},
+        )
+
+    def _before_call(self) -> None:
+        if self._state == CircuitState.OPEN:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                circuit_rejections_counter.labels(upstream=self.upstream).inc()
+                raise CircuitOpenError(self.upstream, remaining)
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self._state == CircuitState.HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                circuit_rejections_counter.labels(upstream=self.upstream).inc()
+                raise CircuitOpenError(self.upstream, self.recovery_timeout)
+            self._probes += 1
+
+    def _on_success(self) -> None:
+        self._failures = 0
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED, "probe succeeded")
+
+    def _on_failure(self, error: BaseException) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN, f"probe failed: {error!r}")
+        elif self._failures >= self.failure_threshold:
+            self._transition(
+                CircuitState.OPEN, f"{self._failures} consecutive failures: {error!r}"
+            )
+
+    @asynccontextmanager
+    async def call(self) -> AsyncIterator[None]:
+        """Guards one upstream call; raises `CircuitOpenError` while open."""
+        self._before_call()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Says nothing about the upstream; free the probe slot
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+            raise
+        except BaseException as e:
+            if self._is_failure(e):
+                self._on_failure(e)
+            elif self._state == CircuitState.HALF_OPEN:
+                # The upstream answered, just not successfully for this request
+                self._on_success()
+            raise
+        else:
+            self._on_success()
+
+
+class CircuitBreakerGroup:
+    """Lazily created `CircuitBreaker`s, one per upstream."""
+
+    def __init__(self, factory: Callable[[str], CircuitBreaker]):
+        self._factory = factory
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, upstream: str) -> CircuitBreaker:
+        breaker = self._breakers.get(upstream)
+        if breaker is None:
+            breaker = self._breakers[upstream] = self._factory(upstream)
+        return breaker
@@ -1,13 +1,15 @@
 import base64
 import logging
+import math
 import time
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from config.settings_config import get_settings
+from core.circuit_breaker import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +26,7 @@ def sanitize(obj):
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle standard HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": "HTTP_ERROR",
@@ -40,7 +42,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     raw_details = exc.errors()
     safe_details = sanitize(raw_details)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "VALIDATION_ERROR",
@@ -52,6 +54,20 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+async def circuit_open_exception_handler(request: Request, exc: CircuitOpenError):
+    """Handle calls failed fast by an open upstream circuit"""
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "error": "UPSTREAM_UNAVAILABLE",
+            "message": str(exc),
+            "timestamp": time.time(),
+            "path": request.url.path,
+        },
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
@@ -62,7 +78,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     else:
         message = str(exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "INTERNAL_ERROR",
@@ -77,4 +93,5 @@ def setup_exception_handlers(app: FastAPI):
     """Setup all exception handlers for the FastAPI app"""
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)  # type: ignore
     app.add_exception_handler(RequestValidationError, validation_exception_handler)  # type: ignore
+    app.add_exception_handler(CircuitOpenError, circuit_open_exception_handler)  # type: ignore
     app.add_exception_handler(Exception, general_exception_handler)
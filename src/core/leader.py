@@ -0,0 +1,61 @@
+import fcntl
+import logging
+import os
+import tempfile
+from typing import IO, Optional
+
+from config.settings_config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    Elects a single leader among the worker processes of one host.
+
+    The leader holds an exclusive `flock` on a file shared by all workers; the
+    kernel releases it when the leader exits, so another worker takes over on
+    its next `try_acquire()`. Jobs that must run exactly once (refreshers,
+    garbage collection) check `try_acquire()` before every run.
+    """
+
+    def __init__(self, name: str):
+        settings = get_settings()
+        lock_dir = (
+            settings.leader_lock_dir
+            or settings.prometheus_multiproc_dir
+            or tempfile.gettempdir()
+        )
+        os.makedirs(lock_dir, exist_ok=True)
+
+        self.path = os.path.join(lock_dir, f"{name}.leader.lock")
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Returns True if this process is (or just became) the leader."""
+        if self._file is not None:
+            return True
+
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._file = lock_file
+        logger.info(f"Acquired leadership: {self.path}", extra={"pid": os.getpid()})
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+        logger.info(f"Released leadership: {self.path}", extra={"pid": os.getpid()})
@@ -4,17 +4,36 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
+from config.logging_config import flush_logging
 from config.settings_config import get_settings
+from core.background import BackgroundTasks
+from core.cache.tiered import (
+    purge_expired_cache_entries,
+    start_cache_invalidation,
+    stop_cache_invalidation,
+)
+from core.monitoring import is_multiprocess, mark_process_dead, update_process_metrics
+from core.shutdown import shutdown_coordinator
 from db.prisma.utils import get_db
+from services.auth_service import purge_expired_oauth_flows
+from services.google_id_token import refresh_google_key_set
+from services.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
 
+async def _sample_process_metrics() -> None:
+    update_process_metrics()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     Lifespan context manager for FastAPI app.
     Handles startup and shutdown events.
+
+    Runs once per worker process: caches (settings, db client) are per process,
+    and jobs that must run once per host are registered as `leader_only`.
     """
     # Startup
     logger.info(f"Starting up {get_settings().project_info}...")
@@ -22,7 +41,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # load db
     db = await get_db()
 
+    # shared cache
+    start_cache_invalidation()
+
+    # background jobs
+    background = BackgroundTasks("google-service-api")
+    background.add_periodic(
+        "oauth_flow_gc",
+        purge_expired_oauth_flows,
+        interval=get_settings().oauth_flow_gc_interval_seconds,
+        leader_only=True,
+    )
+    background.add_periodic(
+        "cache_gc", purge_expired_cache_entries, interval=60, leader_only=True
+    )
+    background.add_periodic(
+        "google_certs_refresh",
+        refresh_google_key_set,
+        interval=get_settings().google_certs_refresh_seconds,
+    )
+    background.add_periodic(
+        "write_behind_flush",
+        write_behind.flush,
+        interval=get_settings().write_behind_flush_interval_seconds,
+    )
+    if is_multiprocess():
+        # `/metrics` only samples the worker answering the scrape
+        background.add_periodic("process_metrics", _sample_process_metrics, interval=15)
+    background.start()
+
+    # drain on SIGTERM/SIGINT (uvicorn has installed its handlers by now)
+    shutdown_coordinator.install_signal_hook()
+
     # set data
+    app.state.background = background
     app.state.ready = True
 
     # log
@@ -33,7 +85,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info(f"Shutting down {get_settings().project_info}...")
 
-    # Add cleanup tasks
+    # Uvicorn has waited for open requests; drain what is left, then clean up
+    app.state.ready = False
+    await shutdown_coordinator.drain("api", background)
+    await stop_cache_invalidation()
     await db.disconnect()
+    mark_process_dead()
 
     logger.info(f"{get_settings().project_info} completely shutdown")
+    flush_logging()
@@ -1,8 +1,32 @@
 # Application metrics
-from prometheus_client import Counter, Gauge, Histogram, Info
+import glob
+import os
+
+import psutil
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    Info,
+    generate_latest,
+    multiprocess,
+    values,
+)
 
 from config.settings_config import get_settings
 
+# Multi-process mode: every worker writes its samples to mmap files in a shared
+# directory and `/metrics` aggregates them. The value class must be switched
+# before any metric below is created.
+if get_settings().prometheus_multiproc_dir:
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", str(get_settings().prometheus_multiproc_dir)
+    )
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    values.ValueClass = values.get_value_class()
+
 api_calls_counter = Counter(
     "chat_api_calls_total", "Total Chat API calls", ["endpoint", "method", "status"]
 )
@@ -10,13 +34,164 @@ api_duration_histogram = Histogram(
     "chat_api_duration_seconds", "Chat API execution time", ["endpoint", "method"]
 )
 active_connections = Gauge(
-    "chat_api_active_connections", "Number of active connections"
+    "chat_api_active_connections",
+    "Number of active connections",
+    multiprocess_mode="livesum",
 )
 server_info = Info("chat_api_server_info", "Server info")
 
 # System metrics
-memory_usage = Gauge("chat_api_memory_usage_bytes", "Memory usage in bytes")
-cpu_usage = Gauge("chat_api_cpu_usage_percent", "CPU usage percent")
+memory_usage = Gauge(
+    "chat_api_memory_usage_bytes", "Memory usage in bytes", multiprocess_mode="livesum"
+)
+cpu_usage = Gauge(
+    "chat_api_cpu_usage_percent", "CPU usage percent", multiprocess_mode="livesum"
+)
+
+# Logging metrics
+log_records_dropped = Counter(
+    "chat_api_log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+    ["handler"],
+)
+
+# Cache metrics
+cache_requests_counter = Counter(
+    "chat_api_cache_requests_total",
+    "Cache lookups by result (l1_hit, l2_hit, memory_hit, disk_hit, miss)",
+    ["cache", "result"],
+)
+cache_invalidations_counter = Counter(
+    "chat_api_cache_invalidations_total",
+    "L1 cache entries dropped on invalidation from another replica",
+    ["cache"],
+)
+
+# Admission control metrics
+admission_in_flight = Gauge(
+    "chat_api_admission_in_flight",
+    "Admitted calls currently executing",
+    ["controller"],
+    multiprocess_mode="livesum",
+)
+admission_queue_depth = Gauge(
+    "chat_api_admission_queue_depth",
+    "Calls waiting for admission",
+    ["controller"],
+    multiprocess_mode="livesum",
+)
+admission_wait_histogram = Histogram(
+    "chat_api_admission_wait_seconds",
+    "Time spent waiting for admission",
+    ["controller"],
+)
+admission_rejections_counter = Counter(
+    "chat_api_admission_rejections_total",
+    "Calls rejected by admission control",
+    ["controller", "reason"],
+)
+
+# Upstream (Google API) metrics
+upstream_concurrency_limit = Gauge(
+    "chat_api_upstream_concurrency_limit",
+    "Lowest adaptive concurrency limit among tenants of a Google upstream",
+    ["upstream"],
+    multiprocess_mode="livemin",
+)
+upstream_limiters_gauge = Gauge(
+    "chat_api_upstream_limiters",
+    "Adaptive concurrency limiters (tenants) kept per Google upstream",
+    ["upstream"],
+    multiprocess_mode="livesum",
+)
+upstream_limit_decreases_counter = Counter(
+    "chat_api_upstream_limit_decreases_total",
+    "Adaptive concurrency limit decreases per Google upstream",
+    ["upstream"],
+)
+circuit_state_gauge = Gauge(
+    "chat_api_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)",
+    ["upstream"],
+    multiprocess_mode="livemax",
+)
+circuit_transitions_counter = Counter(
+    "chat_api_circuit_transitions_total",
+    "Circuit breaker state transitions",
+    ["upstream", "state"],
+)
+circuit_rejections_counter = Counter(
+    "chat_api_circuit_rejections_total",
+    "Calls failed fast by an open circuit",
+    ["upstream"],
+)
+
+# Gmail push notification metrics
+gmail_push_counter = Counter(
+    "chat_api_gmail_push_total",
+    "Gmail Pub/Sub push messages received",
+    ["result"],
+)
+
+# Idempotency metrics
+idempotency_requests_counter = Counter(
+    "chat_api_idempotency_requests_total",
+    "Idempotent operations by outcome",
+    ["scope", "result"],
+)
+
+# Shutdown metrics
+shutdown_drain_histogram = Histogram(
+    "chat_api_shutdown_drain_seconds",
+    "Time from the shutdown signal until in-flight work was drained",
+    ["server", "outcome"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+
+# Google Drive transfer metrics
+drive_transfer_bytes_counter = Counter(
+    "chat_api_drive_transfer_bytes_total",
+    "Bytes moved by Drive uploads and downloads",
+    ["direction"],
+)
+
+# Content cache metrics (immutable Gmail message content)
+content_cache_bytes_gauge = Gauge(
+    "chat_api_content_cache_bytes",
+    "Bytes held by a content cache, in memory or spilled to disk",
+    ["cache", "tier"],
+    multiprocess_mode="livesum",
+)
+content_cache_evictions_counter = Counter(
+    "chat_api_content_cache_evictions_total",
+    "Content cache entries evicted to stay within the byte budget",
+    ["cache", "tier"],
+)
+
+# Write-behind metrics (buffered token updates and send audit records)
+write_behind_pending_gauge = Gauge(
+    "chat_api_write_behind_pending",
+    "Buffered writes waiting for the next flush",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+write_behind_flush_histogram = Histogram(
+    "chat_api_write_behind_flush_seconds",
+    "Time to write one flush of buffered writes to the database",
+    ["kind", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+write_behind_age_histogram = Histogram(
+    "chat_api_write_behind_age_seconds",
+    "Time from buffering a write until it reached the database",
+    ["kind"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+write_behind_dropped_counter = Counter(
+    "chat_api_write_behind_dropped_total",
+    "Buffered writes dropped because the buffer was full",
+    ["kind"],
+)
 
 # Set static metadata for server
 server_info.info(
@@ -26,3 +201,56 @@ server_info.info(
         "framework": "FastAPI",
     }
 )
+
+
+def is_multiprocess() -> bool:
+    return bool(get_settings().prometheus_multiproc_dir)
+
+
+def update_process_metrics(cpu_interval: float | None = None) -> None:
+    """
+    Samples memory and CPU usage of the current process into the system gauges.
+    """
+    process = psutil.Process(os.getpid())
+    memory_usage.set(process.memory_info().rss)
+    cpu_usage.set(process.cpu_percent(interval=cpu_interval))
+
+
+def generate_metrics() -> bytes:
+    """
+    Renders all metrics in Prometheus text format.
+
+    In multi-process mode the samples of every worker are aggregated from the
+    shared directory; `server_info` is identical in every worker and is rendered
+    from the current process.
+    """
+    if not is_multiprocess():
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(server_info)
+    return generate_latest(registry)
+
+
+def clear_multiprocess_dir() -> None:
+    """
+    Removes samples left over by previous runs.
+
+    Must be called once by the parent process before any worker starts.
+    """
+    if not is_multiprocess():
+        return
+
+    for path in glob.glob(
+        os.path.join(str(get_settings().prometheus_multiproc_dir), "*.db")
+    ):
+        os.remove(path)
+
+
+def mark_process_dead() -> None:
+    """
+    Drops the live gauge samples of the current worker on shutdown.
+    """
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,248 @@
+import logging
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings_config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# (filename, first line, function name): the key pstats uses for a function
+FuncKey = Tuple[str, int, str]
+
+MAX_STACK_DEPTH = 128
+
+
+class ProfilerBusy(RuntimeError):
+    """Another profile or snapshot operation is already running."""
+
+
+class CpuProfile:
+    """Aggregated stack samples of every thread, taken at a fixed interval."""
+
+    def __init__(self, interval: float, duration: float):
+        self.interval = interval
+        self.duration = duration
+        self.sample_count = 0
+        # (thread name, root-to-leaf stack) -> number of samples
+        self.stacks: Counter[Tuple[str, Tuple[FuncKey, ...]]] = Counter()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks (`frame;frame;frame count`), as read by flamegraph.pl."""
+        lines = []
+        for (thread_name, stack), count in self.stacks.most_common():
+            frames = [thread_name.replace(";", ":")]
+            frames.extend(
+                f"{name} ({os.path.basename(filename)}:{line})"
+                for filename, line, name in stack
+            )
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def pstats(self) -> bytes:
+        """
+        The samples as a marshalled `pstats` table (`pstats.Stats(path)`,
+        snakeviz, ...). Call counts are sample counts and times are estimated
+        as samples × interval.
+        """
+        stats: Dict[FuncKey, list] = {}
+        for (_, stack), count in self.stacks.items():
+            elapsed = count * self.interval
+            seen = set()
+            for depth, func in enumerate(stack):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                is_leaf = depth == len(stack) - 1
+                # Count recursive frames once towards the cumulative time
+                if func not in seen:
+                    seen.add(func)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += elapsed
+                if is_leaf:
+                    entry[2] += elapsed
+                if depth:
+                    caller = stack[depth - 1]
+                    nc, cc, tt, ct = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                    entry[4][caller] = (
+                        nc + count,
+                        cc + count,
+                        tt + (elapsed if is_leaf else 0.0),
+                        ct + elapsed,
+                    )
+        return marshal.dumps({func: tuple(entry) for func, entry in stats.items()})
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for the whole process.
+
+    A sampler thread reads `sys._current_frames()` every `interval` seconds,
+    so the profiled code runs unmodified; the overhead is one stack walk per
+    thread per sample. Only one profile runs at a time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def run(self, duration: float, interval: float) -> CpuProfile:
+        """Samples for `duration` seconds; blocks, so call it off the event loop."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A CPU profile is already running")
+
+        try:
+            profile = CpuProfile(interval=interval, duration=duration)
+            own_thread = threading.get_ident()
+            deadline = time.monotonic() + duration
+            logger.info(f"CPU profile started for {duration}s every {interval}s")
+
+            while time.monotonic() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    stack: List[FuncKey] = []
+                    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                        code = frame.f_code
+                        stack.append(
+                            (code.co_filename, code.co_firstlineno, code.co_name)
+                        )
+                        frame = frame.f_back
+                    stack.reverse()
+                    profile.stacks[
+                        (names.get(thread_id, str(thread_id)), tuple(stack))
+                    ] += 1
+                profile.sample_count += 1
+                time.sleep(interval)
+
+            logger.info(f"CPU profile finished with {profile.sample_count} samples")
+            return profile
+        finally:
+            self._lock.release()
+
+
+class MemorySnapshots:
+    """
+    On-demand `tracemalloc` tracing with a bounded set of named snapshots.
+
+    Tracing slows allocations down noticeably, so it only runs between
+    `start()` and `stop()`, and stops on its own after
+    `tracemalloc_max_seconds`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self._next_id = 1
+        self._auto_stop: Optional[threading.Timer] = None
+
+    def status(self) -> dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traceback_limit": tracemalloc.get_traceback_limit(),
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "snapshots": list(self._snapshots),
+        }
+
+    def start(self, frames: int) -> dict[str, Any]:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                logger.info(f"tracemalloc started with {frames} frames")
+
+            max_seconds = get_settings().tracemalloc_max_seconds
+            if self._auto_stop is not None:
+                self._auto_stop.cancel()
+            self._auto_stop = threading.Timer(max_seconds, self.stop)
+            self._auto_stop.daemon = True
+            self._auto_stop.start()
+        return self.status()
+
+    def stop(self) -> dict[str, Any]:
+        with self._lock:
+            if self._auto_stop is not None:
+                self._auto_stop.cancel()
+                self._auto_stop = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                logger.info("tracemalloc stopped")
+            self._snapshots.clear()
+        return self.status()
+
+    def take(self) -> dict[str, Any]:
+        """Takes a snapshot; blocks while it copies the traces."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise ValueError("tracemalloc is not running; start it first")
+
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                    tracemalloc.Filter(False, "<unknown>"),
+                )
+            )
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > get_settings().tracemalloc_max_snapshots:
+                self._snapshots.popitem(last=False)
+
+        return {
+            "snapshot_id": snapshot_id,
+            "total_bytes": sum(stat.size for stat in snapshot.statistics("filename")),
+            **self.status(),
+        }
+
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        try:
+            return self._snapshots[snapshot_id]
+        except KeyError:
+            raise ValueError(f"Unknown snapshot: {snapshot_id}") from None
+
+    def diff(
+        self,
+        base_id: int,
+        target_id: Optional[int] = None,
+        key_type: str = "lineno",
+        limit: int = 20,
+    ) -> dict[str, Any]:
+        """
+        Top allocation differences between two snapshots; without `target_id`
+        the base is compared against a new snapshot.
+        """
+        if target_id is None:
+            target_id = self.take()["snapshot_id"]
+
+        with self._lock:
+            base, target = self._get(base_id), self._get(target_id)
+            differences = target.compare_to(base, key_type)
+
+        return {
+            "base_id": base_id,
+            "target_id": target_id,
+            "key_type": key_type,
+            "size_diff_bytes": sum(stat.size_diff for stat in differences),
+            "top": [
+                {
+                    "traceback": [
+                        f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                    ],
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in differences[:limit]
+            ],
+        }
+
+
+sampling_profiler = SamplingProfiler()
+memory_snapshots = MemorySnapshots()
@@ -0,0 +1,143 @@
+import asyncio
+import inspect
+import logging
+import signal
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple, Union
+
+from config.settings_config import get_settings
+from core.admission import AdmissionController
+from core.background import BackgroundTasks
+from core.monitoring import shutdown_drain_histogram
+
+logger = logging.getLogger(__name__)
+
+FlushHook = Callable[[], Union[None, Awaitable[None]]]
+
+
+class ShutdownCoordinator:
+    """
+    Drains a server process within `shutdown_timeout_seconds` of the shutdown
+    signal.
+
+    `begin()` (called from the signal, or from the lifespan if no signal was
+    seen) stops admission: readiness turns unhealthy and new requests and
+    tool calls are rejected as retryable, so they go to other replicas.
+    While uvicorn waits for open connections, admitted work keeps running;
+    `drain()` then waits for what is left (admitted calls, tracked tasks,
+    background jobs) until the deadline, cancels the rest and runs the flush
+    hooks for buffered writes.
+    """
+
+    def __init__(self) -> None:
+        self._admission: List[AdmissionController] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._flush_hooks: List[Tuple[str, FlushHook]] = []
+        self._started_at: Optional[float] = None
+
+    @property
+    def draining(self) -> bool:
+        return self._started_at is not None
+
+    def add_admission(self, controller: AdmissionController) -> None:
+        self._admission.append(controller)
+
+    def add_flush_hook(self, name: str, hook: FlushHook) -> None:
+        """Registers a (sync or async) callable run after the drain."""
+        self._flush_hooks.append((name, hook))
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Keeps a reference to a fire-and-forget task and drains it on shutdown."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def begin(self) -> None:
+        if self._started_at is not None:
+            return
+        self._started_at = time.monotonic()
+        for controller in self._admission:
+            controller.close()
+        logger.info(
+            "Shutdown started: draining in-flight work",
+            extra={
+                "in_flight": sum(c.in_flight for c in self._admission),
+                "tasks": len(self._tasks),
+            },
+        )
+
+    def install_signal_hook(self) -> None:
+        """
+        Chains `begin()` in front of the current SIGTERM/SIGINT handlers.
+
+        Call it once uvicorn has installed its own handlers (e.g. from the
+        lifespan startup); uvicorn's handler still runs and starts its own
+        graceful shutdown.
+        """
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                continue
+
+            def handler(signum: int, frame: Any, previous=previous) -> None:
+                self.begin()
+                previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+    def remaining(self) -> float:
+        timeout = get_settings().shutdown_timeout_seconds
+        if self._started_at is None:
+            return float(timeout)
+        return max(0.0, self._started_at + timeout - time.monotonic())
+
+    async def drain(
+        self, server: str, background: Optional[BackgroundTasks] = None
+    ) -> float:
+        """Drains and flushes; returns the seconds since `begin()`."""
+        self.begin()
+
+        idle = all(
+            await asyncio.gather(
+                *(c.wait_idle(self.remaining()) for c in self._admission)
+            )
+        )
+
+        tasks = list(self._tasks)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.remaining())
+            for task in pending:
+                task.cancel()
+            if pending:
+                idle = False
+                await asyncio.wait(pending, timeout=1)
+
+        if background is not None:
+            await background.stop(timeout=max(1.0, self.remaining()))
+
+        for name, hook in self._flush_hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await asyncio.wait_for(result, timeout=max(1.0, self.remaining()))
+            except Exception as e:
+                logger.error(f"Shutdown flush '{name}' failed: {type(e).__name__}: {e}")
+
+        duration = time.monotonic() - (self._started_at or time.monotonic())
+        outcome = "drained" if idle else "deadline_exceeded"
+        shutdown_drain_histogram.labels(server=server, outcome=outcome).observe(
+            duration
+        )
+        logger.info(
+            f"Shutdown drain {outcome} in {duration:.2f}s",
+            extra={
+                "server": server,
+                "outcome": outcome,
+                "drain_seconds": round(duration, 3),
+                "in_flight_left": sum(c.in_flight for c in self._admission),
+            },
+        )
+        return duration
+
+
+shutdown_coordinator = ShutdownCoordinator()
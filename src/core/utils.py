@@ -1,7 +1,9 @@
-from typing import List, Union
+from typing import TYPE_CHECKING, List, Union
 
 from config.settings_config import get_settings
-from db.prisma.generated.models import ClientAuth
+
+if TYPE_CHECKING:
+    from db.prisma.generated.models import ClientAuth
 
 
 def deep_merge(base: dict, override: dict) -> dict:
@@ -48,7 +50,7 @@ def to_string(x: InputType) -> str:
         raise TypeError(f"Unexpected type: {type(x)}")
 
 
-def get_google_client_config(client_auth: ClientAuth):
+def get_google_client_config(client_auth: "ClientAuth"):
     return {
         "web": {
             "client_id": client_auth.googleClientId,
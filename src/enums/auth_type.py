@@ -3,3 +3,5 @@ from enum import Enum
 
 class AuthType(str, Enum):
     GMAIL = "gmail"
+    DRIVE = "drive"
+    CALENDAR = "calendar"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class CacheBackendType(str, Enum):
+    LOCAL = "local"
+    POSTGRES = "postgres"
+    REDIS = "redis"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class LogQueuePolicy(str, Enum):
+    DROP = "drop"
+    BLOCK = "block"
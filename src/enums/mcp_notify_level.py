@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class McpNotifyLevel(str, Enum):
+    DEBUG = "debug"
+    INFO = "info"
+    WARNING = "warning"
+    ERROR = "error"
+    OFF = "off"
@@ -0,0 +1,295 @@
+"""
+In-process client for agents running in the same process as the MCP server.
+
+Calls go straight to the tools registered on `google_mcp.server.mcp`: the
+arguments are validated by each tool's argument model and errors are raised
+as `ToolError`, exactly as for MCP calls, and calls go through the same tool
+admission, but there is no JSON-RPC encoding, transport or session. Results
+are the tools' own dicts rather than their JSON text.
+
+The host process owns the service's lifecycle and should run its agents
+inside `google_mcp.lifespan.mcp_lifespan()` (background jobs and shutdown
+flushes), as `google_mcp.main` does for the server.
+"""
+
+import itertools
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Union
+
+from mcp.server.fastmcp.exceptions import ToolError
+
+import google_mcp.tools  # noqa: F401  (registers the tools)
+from google_mcp.server import admit_tool_call, mcp
+from google_mcp.tools.gmail import get_recent_changes
+
+logger = logging.getLogger(__name__)
+
+LogCallback = Callable[[str, str], Awaitable[None]]
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+_request_ids = itertools.count(1)
+
+
+class InProcessContext:
+    """
+    Stand-in for FastMCP's `Context` in in-process calls, with the members the
+    tools use (see `google_mcp.notifier.ToolNotifier`). Log and progress
+    notifications go to the optional callbacks instead of a session.
+    """
+
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        on_log: Optional[LogCallback] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.client_id = client_id
+        self.request_id = f"inprocess-{next(_request_ids)}"
+        self._on_log = on_log
+        self._on_progress = on_progress
+
+    async def log(
+        self, level: str, message: str, *, logger_name: Optional[str] = None
+    ) -> None:
+        if self._on_log is not None:
+            await self._on_log(level, message)
+
+    async def report_progress(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        if self._on_progress is not None:
+            await self._on_progress(progress, total, message)
+
+
+class GoogleServiceClient:
+    """
+    Typed async client for the service's tools. `client_id` identifies the
+    caller for notification levels and per-client admission limits, like the
+    MCP client id does.
+    """
+
+    def __init__(
+        self,
+        client_id: Optional[str] = None,
+        on_log: Optional[LogCallback] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.client_id = client_id
+        self._on_log = on_log
+        self._on_progress = on_progress
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Calls a registered tool by name with MCP-style arguments."""
+        tool = mcp._tool_manager.get_tool(name)
+        if tool is None:
+            raise ToolError(f"Unknown tool: {name}")
+
+        ctx = InProcessContext(self.client_id, self._on_log, self._on_progress)
+        client_key = f"inprocess:{self.client_id}" if self.client_id else None
+        async with admit_tool_call(client_key):
+            return await tool.run(arguments, context=ctx)
+
+    async def _call(self, name: str, **arguments: Any) -> Dict[str, Any]:
+        # Omitted arguments fall back to the tool's defaults
+        return await self.call_tool(
+            name, {k: v for k, v in arguments.items() if v is not None}
+        )
+
+    async def send_gmail(
+        self,
+        gmail_user_id: str,
+        to: Union[str, List[str]],
+        subject: str,
+        body: str,
+        cc: Union[str, List[str], None] = None,
+        bcc: Union[str, List[str], None] = None,
+        idempotency_key: Optional[str] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "send_gmail",
+            gmail_user_id=gmail_user_id,
+            to=to,
+            subject=subject,
+            body=body,
+            cc=cc,
+            bcc=bcc,
+            idempotency_key=idempotency_key,
+            verbose=verbose,
+        )
+
+    async def send_gmail_merge(
+        self,
+        gmail_user_id: str,
+        subject_template: str,
+        body_template: str,
+        recipients: List[Dict[str, Any]],
+        idempotency_key: Optional[str] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "send_gmail_merge",
+            gmail_user_id=gmail_user_id,
+            subject_template=subject_template,
+            body_template=body_template,
+            recipients=recipients,
+            idempotency_key=idempotency_key,
+            verbose=verbose,
+        )
+
+    async def read_gmail_messages(
+        self,
+        gmail_user_id: str,
+        message_ids: List[str],
+        format: Literal["full", "metadata", "raw"] = "full",
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "read_gmail_messages",
+            gmail_user_id=gmail_user_id,
+            message_ids=message_ids,
+            format=format,
+            verbose=verbose,
+        )
+
+    async def modify_gmail_labels(
+        self,
+        gmail_user_id: str,
+        add_labels: Optional[List[str]] = None,
+        remove_labels: Optional[List[str]] = None,
+        message_ids: Optional[List[str]] = None,
+        query: Optional[str] = None,
+        max_messages: int = 10000,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "modify_gmail_labels",
+            gmail_user_id=gmail_user_id,
+            add_labels=add_labels,
+            remove_labels=remove_labels,
+            message_ids=message_ids,
+            query=query,
+            max_messages=max_messages,
+            verbose=verbose,
+        )
+
+    async def archive_gmail_messages(
+        self,
+        gmail_user_id: str,
+        message_ids: Optional[List[str]] = None,
+        query: Optional[str] = None,
+        max_messages: int = 10000,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "archive_gmail_messages",
+            gmail_user_id=gmail_user_id,
+            message_ids=message_ids,
+            query=query,
+            max_messages=max_messages,
+            verbose=verbose,
+        )
+
+    async def mark_gmail_messages_read(
+        self,
+        gmail_user_id: str,
+        message_ids: Optional[List[str]] = None,
+        query: Optional[str] = None,
+        max_messages: int = 10000,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "mark_gmail_messages_read",
+            gmail_user_id=gmail_user_id,
+            message_ids=message_ids,
+            query=query,
+            max_messages=max_messages,
+            verbose=verbose,
+        )
+
+    async def trash_gmail_messages(
+        self,
+        gmail_user_id: str,
+        message_ids: Optional[List[str]] = None,
+        query: Optional[str] = None,
+        max_messages: int = 10000,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "trash_gmail_messages",
+            gmail_user_id=gmail_user_id,
+            message_ids=message_ids,
+            query=query,
+            max_messages=max_messages,
+            verbose=verbose,
+        )
+
+    async def watch_gmail_mailbox(
+        self, gmail_user_id: str, enabled: bool = True
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "watch_gmail_mailbox", gmail_user_id=gmail_user_id, enabled=enabled
+        )
+
+    async def get_gmail_changes(self, gmail_user_id: str) -> List[dict]:
+        """Recent changes of a watched mailbox (the `gmail_changes` resource)."""
+        return await get_recent_changes(gmail_user_id)
+
+    async def upload_drive_file(
+        self,
+        drive_user_id: str,
+        path: str,
+        name: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "upload_drive_file",
+            drive_user_id=drive_user_id,
+            path=path,
+            name=name,
+            folder_id=folder_id,
+            mime_type=mime_type,
+            verbose=verbose,
+        )
+
+    async def download_drive_file(
+        self,
+        drive_user_id: str,
+        file_id: str,
+        path: Optional[str] = None,
+        overwrite: bool = False,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "download_drive_file",
+            drive_user_id=drive_user_id,
+            file_id=file_id,
+            path=path,
+            overwrite=overwrite,
+            verbose=verbose,
+        )
+
+    async def find_calendar_free_busy(
+        self,
+        calendar_user_id: str,
+        calendars: List[str],
+        time_min: Union[datetime, str],
+        time_max: Union[datetime, str],
+        min_free_minutes: int = 30,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "find_calendar_free_busy",
+            calendar_user_id=calendar_user_id,
+            calendars=calendars,
+            time_min=time_min,
+            time_max=time_max,
+            min_free_minutes=min_free_minutes,
+            verbose=verbose,
+        )
@@ -1,35 +1,29 @@
 import importlib
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
-# Get the absolute path to this directory
-custom_routes_dir = os.path.dirname(__file__)
+# Custom route modules registered on the MCP server, in registration order.
+CUSTOM_ROUTE_MODULES = [
+    "monitoring",
+    "gmail_push",
+    "profiling",
+]
 
 # Track successfully registered modules
 registered_modules = []
 
-# Loop through all Python files in this directory
-for filename in os.listdir(custom_routes_dir):
-    # Only consider .py files excluding __init__.py and hidden files
-    if (
-        filename.endswith(".py")
-        and not filename.startswith("_")
-        and filename != "__init__.py"
-    ):
-        module_name = filename[:-3]  # remove ".py"
+for module_name in CUSTOM_ROUTE_MODULES:
+    try:
+        # Perform a relative import using importlib
+        importlib.import_module(f".{module_name}", package=__name__)
+        logger.info(f"Registered custom routes module: {module_name}")
+        registered_modules.append(module_name)
 
-        try:
-            # Perform a relative import using importlib
-            importlib.import_module(f".{module_name}", package=__name__)
-            logger.info(f"Registered custom routes module: {module_name}")
-            registered_modules.append(module_name)
-
-        except Exception as e:
-            logger.error(
-                f"Failed to import custom routes module '{module_name}': {type(e).__name__}: {e}"
-            )
+    except Exception as e:
+        logger.error(
+            f"Failed to import custom routes module '{module_name}': {type(e).__name__}: {e}"
+        )
 
 # Summary log after all modules are processed
 if registered_modules:
@@ -0,0 +1,104 @@
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import secrets
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from config.settings_config import get_settings
+from core.cache.local import MISSING, LocalCache
+from core.monitoring import gmail_push_counter
+from core.shutdown import shutdown_coordinator
+from google_mcp.lazy import LazyHandler
+from google_mcp.server import mcp
+
+logger = logging.getLogger(__name__)
+
+handle_gmail_push = LazyHandler("services.gmail_watch_service:handle_gmail_push")
+verify_google_id_token = LazyHandler("services.google_id_token:verify_google_id_token")
+
+# Pub/Sub delivers at least once; remember recent message ids
+_seen_messages: LocalCache[bool] = LocalCache(
+    max_entries=100_000, ttl=get_settings().gmail_push_dedupe_ttl_seconds
+)
+
+
+async def _is_authorized(request: Request) -> bool:
+    settings = get_settings()
+
+    # An unconfigured endpoint would let anyone trigger mailbox syncs
+    if not settings.gmail_push_token and not settings.gmail_push_audience:
+        logger.warning(
+            "Rejected Gmail push: set GMAIL_PUSH_TOKEN or GMAIL_PUSH_AUDIENCE"
+        )
+        return False
+
+    if settings.gmail_push_token and not secrets.compare_digest(
+        request.query_params.get("token", ""), settings.gmail_push_token
+    ):
+        return False
+
+    if settings.gmail_push_audience:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            await verify_google_id_token(token, settings.gmail_push_audience)
+        except ValueError as e:
+            logger.warning(f"Rejected Gmail push token: {e}")
+            return False
+
+    return True
+
+
+async def _sync(email_address: str, history_id: str) -> None:
+    try:
+        synced = await handle_gmail_push(email_address, history_id)
+        logger.debug(f"Gmail push for historyId {history_id} synced {synced} tokens")
+    except Exception as e:
+        logger.error(f"Gmail push handling failed: {type(e).__name__}: {e}")
+
+
+@mcp.custom_route("/webhooks/gmail", methods=["POST"])
+async def gmail_push(request: Request) -> Response:
+    """
+    Pub/Sub push endpoint for Gmail `users.watch` notifications.
+
+    Acknowledges immediately and syncs the mailbox in the background; a lost
+    sync is caught up by the next notification, since syncs always start from
+    the stored history position.
+    """
+    if shutdown_coordinator.draining:
+        # Pub/Sub redelivers the message, to a replica that is not stopping
+        gmail_push_counter.labels(result="draining").inc()
+        return JSONResponse(status_code=503, content={"error": "draining"})
+
+    if not await _is_authorized(request):
+        gmail_push_counter.labels(result="unauthorized").inc()
+        return JSONResponse(status_code=403, content={"error": "forbidden"})
+
+    try:
+        envelope = await request.json()
+        message = envelope["message"]
+        message_id = message.get("messageId") or message["message_id"]
+        notification = json.loads(base64.b64decode(message["data"]))
+        email_address = notification["emailAddress"]
+        history_id = str(notification["historyId"])
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        gmail_push_counter.labels(result="invalid").inc()
+        logger.warning(f"Invalid Gmail push message: {type(e).__name__}: {e}")
+        return JSONResponse(status_code=400, content={"error": "invalid message"})
+
+    if _seen_messages.get(message_id) is not MISSING:
+        gmail_push_counter.labels(result="duplicate").inc()
+        return Response(status_code=204)
+    _seen_messages.set(message_id, True)
+
+    # Tracked so that shutdown waits for the sync (and keeps a reference)
+    shutdown_coordinator.track(asyncio.create_task(_sync(email_address, history_id)))
+
+    gmail_push_counter.labels(result="accepted").inc()
+    return Response(status_code=204)
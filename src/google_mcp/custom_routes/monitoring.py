@@ -1,12 +1,11 @@
 import logging
-import os
 
-import psutil
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST
 from starlette.requests import Request
 from starlette.responses import JSONResponse, PlainTextResponse
 
-from core.monitoring import cpu_usage, memory_usage
+from core.monitoring import generate_metrics, update_process_metrics
+from core.shutdown import shutdown_coordinator
 from google_mcp.server import mcp
 
 logger = logging.getLogger(__name__)
@@ -31,6 +30,8 @@ async def readyz(request: Request) -> JSONResponse:
     If the API is not reachable, it returns a 503 Service Unavailable response.
     """
     logger.debug("Readiness check endpoint called")
+    if shutdown_coordinator.draining:
+        return JSONResponse(status_code=503, content={"status": "draining"})
     return JSONResponse(status_code=200, content={"status": "ready"})
 
 
@@ -42,10 +43,8 @@ async def metrics_endpoint(request: Request) -> PlainTextResponse:
     memory usage, and CPU usage.
     """
     logger.debug("Metrics endpoint called")
-    process = psutil.Process(os.getpid())
-    memory_usage.set(process.memory_info().rss)
-    cpu_usage.set(process.cpu_percent())
+    update_process_metrics()
 
     return PlainTextResponse(
-        generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST}
+        generate_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST}
     )
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from config.settings_config import get_settings
+from core.admin_auth import admin_enabled, is_admin_authorized
+from core.profiling import ProfilerBusy, memory_snapshots, sampling_profiler
+from google_mcp.server import mcp
+
+logger = logging.getLogger(__name__)
+
+
+def _denied(request: Request) -> Optional[JSONResponse]:
+    # Hide the endpoints entirely unless an admin token is configured
+    if not admin_enabled():
+        return JSONResponse(status_code=404, content={"error": "not found"})
+    if not is_admin_authorized(request.headers.get("authorization")):
+        return JSONResponse(status_code=401, content={"error": "unauthorized"})
+    return None
+
+
+def _param(request: Request, name: str, cast: Callable[[str], Any], default: Any):
+    value = request.query_params.get(name)
+    return default if value is None else cast(value)
+
+
+async def _json_call(func: Callable[..., dict], *args: Any) -> JSONResponse:
+    try:
+        return JSONResponse(await asyncio.to_thread(func, *args))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@mcp.custom_route("/debug/profile", methods=["POST"])
+async def cpu_profile(request: Request) -> Response:
+    """
+    Samples every thread's stack for `seconds` (every `interval_ms`) and
+    returns collapsed stacks (`format=collapsed`) or a pstats file.
+    """
+    if denied := _denied(request):
+        return denied
+
+    try:
+        seconds = _param(request, "seconds", float, 10.0)
+        interval_ms = _param(request, "interval_ms", float, 10.0)
+        fmt = request.query_params.get("format", "collapsed")
+        max_seconds = get_settings().profiling_max_duration_seconds
+        if not 0 < seconds <= max_seconds:
+            raise ValueError(f"seconds must be in (0, {max_seconds}]")
+        if not 1 <= interval_ms <= 1000:
+            raise ValueError("interval_ms must be in [1, 1000]")
+        if fmt not in ("collapsed", "pstats"):
+            raise ValueError("format must be 'collapsed' or 'pstats'")
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    try:
+        profile = await asyncio.to_thread(
+            sampling_profiler.run, seconds, interval_ms / 1000
+        )
+    except ProfilerBusy as e:
+        return JSONResponse(status_code=409, content={"error": str(e)})
+
+    if fmt == "pstats":
+        return Response(
+            profile.pstats(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return PlainTextResponse(profile.collapsed())
+
+
+@mcp.custom_route("/debug/tracemalloc", methods=["GET"])
+async def tracemalloc_status(request: Request) -> JSONResponse:
+    if denied := _denied(request):
+        return denied
+    return JSONResponse(memory_snapshots.status())
+
+
+@mcp.custom_route("/debug/tracemalloc/start", methods=["POST"])
+async def tracemalloc_start(request: Request) -> JSONResponse:
+    if denied := _denied(request):
+        return denied
+    try:
+        frames = _param(request, "frames", int, 25)
+        if not 1 <= frames <= 100:
+            raise ValueError("frames must be in [1, 100]")
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return JSONResponse(memory_snapshots.start(frames))
+
+
+@mcp.custom_route("/debug/tracemalloc/stop", methods=["POST"])
+async def tracemalloc_stop(request: Request) -> JSONResponse:
+    if denied := _denied(request):
+        return denied
+    return JSONResponse(memory_snapshots.stop())
+
+
+@mcp.custom_route("/debug/tracemalloc/snapshot", methods=["POST"])
+async def tracemalloc_snapshot(request: Request) -> JSONResponse:
+    if denied := _denied(request):
+        return denied
+    return await _json_call(memory_snapshots.take)
+
+
+@mcp.custom_route("/debug/tracemalloc/diff", methods=["GET"])
+async def tracemalloc_diff(request: Request) -> JSONResponse:
+    """Compares snapshot `base` with `target`, or with a new snapshot."""
+    if denied := _denied(request):
+        return denied
+    try:
+        base = int(request.query_params["base"])
+        target = _param(request, "target", int, None)
+        key_type = request.query_params.get("key_type", "lineno")
+        limit = _param(request, "limit", int, 20)
+        if key_type not in ("lineno", "filename", "traceback"):
+            raise ValueError("key_type must be 'lineno', 'filename' or 'traceback'")
+    except (KeyError, ValueError) as e:
+        return JSONResponse(status_code=400, content={"error": f"Bad query: {e}"})
+    return await _json_call(
+        memory_snapshots.diff, base, target, key_type, max(1, min(limit, 500))
+    )
@@ -0,0 +1,37 @@
+import importlib
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyHandler:
+    """
+    Callable proxy for a `"module:attribute"` target that is imported on first use.
+
+    Tool modules are imported at server startup to register their schemas, but the
+    service modules behind them pull in heavy dependencies (googleapiclient, the
+    generated Prisma client, ...). Referencing handlers through a `LazyHandler`
+    defers those imports until the first tool call.
+    """
+
+    def __init__(self, target: str):
+        module_name, _, attribute = target.partition(":")
+        if not module_name or not attribute:
+            raise ValueError(f"Invalid handler target '{target}'")
+
+        self.target = target
+        self._module_name = module_name
+        self._attribute = attribute
+        self._handler: Optional[Callable[..., Any]] = None
+
+    def resolve(self) -> Callable[..., Any]:
+        """Imports the target module (once) and returns the handler."""
+        if self._handler is None:
+            module = importlib.import_module(self._module_name)
+            self._handler = getattr(module, self._attribute)
+            logger.debug(f"Resolved lazy handler: {self.target}")
+        return self._handler
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
@@ -0,0 +1,97 @@
+import logging
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from config.logging_config import flush_logging
+from config.settings_config import get_settings
+from core.background import BackgroundTasks
+from core.cache.tiered import (
+    get_cache_backend,
+    purge_expired_cache_entries,
+    start_cache_invalidation,
+    stop_cache_invalidation,
+)
+from core.monitoring import mark_process_dead
+from core.shutdown import shutdown_coordinator
+from google_mcp.lazy import LazyHandler
+
+logger = logging.getLogger(__name__)
+
+renew_gmail_watches = LazyHandler("services.gmail_watch_service:renew_gmail_watches")
+purge_expired_idempotency_records = LazyHandler(
+    "services.idempotency:purge_expired_idempotency_records"
+)
+
+
+async def _flush_write_behind() -> None:
+    # Nothing is buffered until a tool call has imported the buffer
+    module = sys.modules.get("services.write_behind")
+    if module is not None:
+        await module.write_behind.flush()
+
+
+@asynccontextmanager
+async def mcp_lifespan() -> AsyncGenerator[BackgroundTasks, None]:
+    """
+    Process-wide lifespan of the MCP server.
+
+    FastMCP's own `lifespan` runs once per client session, so process-level
+    startup and shutdown (shared cache, background jobs, db) live here and wrap
+    the transport in `google_mcp.main`.
+    """
+    # Startup
+    logger.info(f"Starting up {get_settings().project_info} MCP...")
+
+    # shared cache
+    start_cache_invalidation()
+    if get_settings().mcp_stateless_http and get_cache_backend() is None:
+        logger.warning(
+            "Stateless MCP without a shared cache backend: "
+            "Gmail changes are only visible on the replica that synced them"
+        )
+
+    # background jobs
+    background = BackgroundTasks("google-service-mcp")
+    background.add_periodic(
+        "cache_gc", purge_expired_cache_entries, interval=60, leader_only=True
+    )
+    background.add_periodic(
+        "idempotency_gc",
+        purge_expired_idempotency_records,
+        interval=600,
+        leader_only=True,
+    )
+    background.add_periodic(
+        "write_behind_flush",
+        _flush_write_behind,
+        interval=get_settings().write_behind_flush_interval_seconds,
+    )
+    if get_settings().gmail_watch_topic:
+        background.add_periodic(
+            "gmail_watch_renewal",
+            renew_gmail_watches,
+            interval=get_settings().gmail_watch_renew_interval_seconds,
+            leader_only=True,
+        )
+    background.start()
+
+    try:
+        yield background
+    finally:
+        # Shutdown
+        logger.info(f"Shutting down {get_settings().project_info} MCP...")
+
+        await shutdown_coordinator.drain("mcp", background)
+        await stop_cache_invalidation()
+
+        # The db client is only imported once a tool call needed it
+        if "db.prisma.utils" in sys.modules:
+            prisma = sys.modules["db.prisma.utils"].prisma
+            if prisma.is_connected():
+                await prisma.disconnect()
+
+        mark_process_dead()
+
+        logger.info(f"{get_settings().project_info} MCP completely shutdown")
+        flush_logging()
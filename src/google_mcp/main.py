@@ -1,16 +1,72 @@
 import logging
+import signal
+
+import anyio
+import uvicorn
 
 from config.logging_config import setup_logging
 from config.settings_config import get_settings
+from core.shutdown import shutdown_coordinator
+from enums.mcp_transport import McpTransport
+from google_mcp.lifespan import mcp_lifespan
 from google_mcp.server import mcp
 
-setup_logging()
+# stdout carries the JSON-RPC stream in stdio mode
+setup_logging(
+    stream=(
+        "ext://sys.stderr"
+        if get_settings().mcp_transport == McpTransport.STDIO
+        else None
+    )
+)
 
 logger = logging.getLogger(__name__)
 
+
+class DrainingServer(uvicorn.Server):
+    """Uvicorn server that starts the shutdown drain when a signal arrives."""
+
+    def handle_exit(self, sig, frame) -> None:
+        shutdown_coordinator.begin()
+        # Unlike uvicorn's own handler, do not record the signal: uvicorn would
+        # re-raise it once serving stops, killing the process before
+        # `mcp_lifespan` has drained and flushed
+        if self.should_exit and sig == signal.SIGINT:
+            self.force_exit = True
+        else:
+            self.should_exit = True
+
+
+async def serve_streamable_http() -> None:
+    """
+    Same as `mcp.run_streamable_http_async()`, but bounds uvicorn's wait for
+    open connections by the shutdown deadline and drains from the signal on.
+    """
+    config = uvicorn.Config(
+        mcp.streamable_http_app(),
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+        timeout_graceful_shutdown=get_settings().shutdown_timeout_seconds,
+    )
+    await DrainingServer(config).serve()
+
+
+async def serve() -> None:
+    """
+    Runs the configured MCP transport inside the process-wide lifespan.
+    """
+    async with mcp_lifespan():
+        logger.info(f"Started {get_settings().project_info}")
+
+        if get_settings().mcp_transport == McpTransport.STDIO:
+            await mcp.run_stdio_async()
+        else:
+            await serve_streamable_http()
+
+
 if __name__ == "__main__":
     import google_mcp.custom_routes  # noqa: F401
     import google_mcp.tools  # noqa: F401
 
-    mcp.run(transport=get_settings().mcp_transport.value)
-    logger.info(f"Started {get_settings().project_info}")
+    anyio.run(serve)
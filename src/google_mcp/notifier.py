@@ -0,0 +1,182 @@
+import logging
+import time
+from typing import Any, Optional
+
+from mcp.server.fastmcp import Context
+
+from config.settings_config import get_settings
+from enums.mcp_notify_level import McpNotifyLevel
+
+logger = logging.getLogger(__name__)
+
+# Python logging levels for each MCP notification level
+_NOTIFY_LEVELS = {
+    McpNotifyLevel.DEBUG: logging.DEBUG,
+    McpNotifyLevel.INFO: logging.INFO,
+    McpNotifyLevel.WARNING: logging.WARNING,
+    McpNotifyLevel.ERROR: logging.ERROR,
+    McpNotifyLevel.OFF: logging.CRITICAL + 1,
+}
+
+# MCP log level names for each Python logging level
+_MCP_LEVEL_NAMES = {
+    logging.DEBUG: "debug",
+    logging.INFO: "info",
+    logging.WARNING: "warning",
+    logging.ERROR: "error",
+}
+
+
+def get_client_notify_level(client_id: Optional[str]) -> int:
+    """
+    Resolve the notification threshold for an MCP client.
+
+    Per-client overrides from `mcp_notify_client_levels` take precedence
+    over the global `mcp_notify_level`.
+    """
+    settings = get_settings()
+    level = settings.mcp_notify_level
+    if client_id:
+        level = settings.mcp_notify_client_levels.get(client_id, level)
+    return _NOTIFY_LEVELS[McpNotifyLevel(level)]
+
+
+class ToolNotifier:
+    """
+    Log and progress notifications for a single tool call.
+
+    Messages are written to the server log and, when the client's level allows it,
+    buffered and sent to the client as one coalesced log notification per flush
+    interval. Progress updates are coalesced so that only the latest value is sent
+    per progress interval; the final update (progress == total) is always sent.
+    Message formatting is deferred (`msg % args`) and skipped entirely when neither
+    the server logger nor the client would receive the message.
+
+    Use as an async context manager so pending notifications are flushed on exit:
+
+        async with ToolNotifier(ctx, logger) as notifier:
+            await notifier.info("Email sent, messageId=%s", message_id)
+    """
+
+    def __init__(self, ctx: Context, tool_logger: logging.Logger):
+        settings = get_settings()
+
+        self._ctx = ctx
+        self._logger = tool_logger
+        self._threshold = get_client_notify_level(ctx.client_id)
+        self._flush_interval = settings.mcp_notify_flush_interval
+        self._progress_interval = settings.mcp_notify_progress_interval
+        self._extra = {"request_id": ctx.request_id, "client_id": ctx.client_id}
+
+        self._buffer: list[str] = []
+        self._buffer_level = logging.NOTSET
+        self._last_flush = time.monotonic()
+
+        self._pending_progress: Optional[
+            tuple[float, Optional[float], Optional[str]]
+        ] = None
+        self._last_progress = 0.0
+
+    @property
+    def extra(self) -> dict[str, Any]:
+        """Structured logging fields shared by every message of this tool call."""
+        return self._extra
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Whether a message at `level` reaches the server log or the client."""
+        return level >= self._threshold or self._logger.isEnabledFor(level)
+
+    async def log(self, level: int, msg: str, *args: Any, **extra: Any) -> None:
+        to_client = level >= self._threshold
+        to_log = self._logger.isEnabledFor(level)
+        if not (to_client or to_log):
+            return
+
+        message = msg % args if args else msg
+
+        if to_log:
+            self._logger.log(level, message, extra={**self._extra, **extra})
+
+        if to_client:
+            # Errors are never delayed and never merged into lower-level batches
+            is_error = level >= logging.ERROR
+            if is_error:
+                await self._flush_logs()
+
+            self._buffer.append(message)
+            self._buffer_level = max(self._buffer_level, level)
+
+            if is_error or time.monotonic() - self._last_flush >= self._flush_interval:
+                await self._flush_logs()
+
+    async def debug(self, msg: str, *args: Any, **extra: Any) -> None:
+        await self.log(logging.DEBUG, msg, *args, **extra)
+
+    async def info(self, msg: str, *args: Any, **extra: Any) -> None:
+        await self.log(logging.INFO, msg, *args, **extra)
+
+    async def warning(self, msg: str, *args: Any, **extra: Any) -> None:
+        await self.log(logging.WARNING, msg, *args, **extra)
+
+    async def error(self, msg: str, *args: Any, **extra: Any) -> None:
+        await self.log(logging.ERROR, msg, *args, **extra)
+
+    async def progress(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Record progress; sent at most once per progress interval."""
+        self._pending_progress = (progress, total, message)
+
+        is_final = total is not None and progress >= total
+        if (
+            is_final
+            or time.monotonic() - self._last_progress >= self._progress_interval
+        ):
+            await self._flush_progress()
+
+    async def flush(self) -> None:
+        """Send all buffered log and progress notifications."""
+        await self._flush_logs()
+        await self._flush_progress()
+
+    async def _flush_logs(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        message = "\n".join(self._buffer)
+        level = _MCP_LEVEL_NAMES.get(self._buffer_level, "error")
+        self._buffer.clear()
+        self._buffer_level = logging.NOTSET
+
+        try:
+            await self._ctx.log(level, message)  # type: ignore[arg-type]
+        except Exception as e:
+            # A broken notification channel must never fail the tool call
+            logger.warning(f"Failed to send log notification: {e}", extra=self._extra)
+
+    async def _flush_progress(self) -> None:
+        self._last_progress = time.monotonic()
+        if self._pending_progress is None:
+            return
+
+        progress, total, message = self._pending_progress
+        self._pending_progress = None
+
+        try:
+            await self._ctx.report_progress(
+                progress=progress, total=total, message=message
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to send progress notification: {e}", extra=self._extra
+            )
+
+    async def __aenter__(self) -> "ToolNotifier":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
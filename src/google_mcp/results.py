@@ -0,0 +1,21 @@
+from typing import Annotated, Any, Iterable
+
+from pydantic import Field
+
+# Tool parameter opting into the full result; results are compact by default
+Verbose = Annotated[
+    bool,
+    Field(
+        default=False,
+        description="Return the full result (echoed inputs, per-item details, timestamps) instead of only ids and counts.",
+    ),
+]
+
+
+def compact_result(result: dict[str, Any], fields: Iterable[str]) -> dict[str, Any]:
+    """
+    The subset of a tool result an agent needs to act on: ids, counts and
+    errors. Inputs the agent sent (recipients, subjects, ...) are not echoed
+    back, which keeps large fan-outs from costing tokens per item.
+    """
+    return {name: result[name] for name in fields if name in result}
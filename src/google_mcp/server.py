@@ -1,9 +1,75 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Sequence
+
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import EmbeddedResource, ImageContent, TextContent
 
 from config.settings_config import get_settings
+from core.admission import AdmissionController, AdmissionRejected
+from core.shutdown import shutdown_coordinator
+from google_mcp.subscriptions import resource_subscriptions
+
+tool_admission = AdmissionController(
+    "mcp_tools",
+    max_concurrency=get_settings().mcp_max_concurrency,
+    client_max_concurrency=get_settings().mcp_client_max_concurrency,
+    max_queue=get_settings().mcp_max_queue,
+    queue_timeout=get_settings().mcp_queue_timeout_seconds,
+)
+shutdown_coordinator.add_admission(tool_admission)
+
+
+@asynccontextmanager
+async def admit_tool_call(client_key: Optional[str]) -> AsyncIterator[None]:
+    """Admits a tool call through `tool_admission`; rejections become `ToolError`s."""
+    try:
+        async with tool_admission.admit(client_key):
+            yield
+    except AdmissionRejected as e:
+        raise ToolError(
+            f"Server busy ({e.reason}), retryable: retry after {e.retry_after_header}s"
+        ) from e
+
 
-mcp = FastMCP(
+class AdmissionFastMCP(FastMCP):
+    """FastMCP server whose tool calls go through `tool_admission`."""
+
+    def _client_key(self) -> Optional[str]:
+        ctx = self.get_context()
+        try:
+            if ctx.client_id:
+                return ctx.client_id
+            request = ctx.request_context.request
+        except ValueError:
+            # No request context (e.g. called in-process)
+            return None
+
+        # Stateless mode creates a session per request, and behind a load
+        # balancer every peer address is the balancer's: only a client id
+        # header identifies the caller, otherwise there is no per-client limit
+        if self.settings.stateless_http:
+            if request is None:
+                return None
+            client_id = request.headers.get(get_settings().mcp_client_id_header)
+            return f"header:{client_id}" if client_id else None
+        return f"session:{id(ctx.session)}"
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        async with admit_tool_call(self._client_key()):
+            return await super().call_tool(name, arguments)
+
+
+mcp = AdmissionFastMCP(
     get_settings().project_name,
     host=get_settings().mcp_host,
     port=get_settings().mcp_port,
+    stateless_http=get_settings().mcp_stateless_http,
+    json_response=get_settings().mcp_json_response,
 )
+
+# Subscriptions live on a session, which stateless requests do not keep
+if not get_settings().mcp_stateless_http:
+    resource_subscriptions.install(mcp._mcp_server)
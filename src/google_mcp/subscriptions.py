@@ -0,0 +1,72 @@
+import logging
+import weakref
+from typing import Dict
+
+from mcp.server.lowlevel import Server
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceSubscriptions:
+    """
+    Tracks `resources/subscribe` requests per URI and sends
+    `notifications/resources/updated` to the subscribed sessions.
+
+    Sessions are held weakly, so a disconnected client drops out on its own.
+    Subscriptions are per process: a notification reaches the sessions
+    connected to the process that observed the change.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, "weakref.WeakSet[ServerSession]"] = {}
+
+    def install(self, server: Server) -> None:
+        """Registers the subscribe/unsubscribe handlers and advertises them."""
+
+        @server.subscribe_resource()
+        async def subscribe(uri: AnyUrl) -> None:
+            session = server.request_context.session
+            self._sessions.setdefault(str(uri), weakref.WeakSet()).add(session)
+            logger.debug(f"Resource subscribed: {uri}")
+
+        @server.unsubscribe_resource()
+        async def unsubscribe(uri: AnyUrl) -> None:
+            session = server.request_context.session
+            sessions = self._sessions.get(str(uri))
+            if sessions is not None:
+                sessions.discard(session)
+                if not sessions:
+                    del self._sessions[str(uri)]
+            logger.debug(f"Resource unsubscribed: {uri}")
+
+        # The low-level server always advertises `subscribe=False`
+        get_capabilities = server.get_capabilities
+
+        def get_subscribable_capabilities(*args, **kwargs):
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        server.get_capabilities = get_subscribable_capabilities  # type: ignore[method-assign]
+
+    def has_subscribers(self, uri: str) -> bool:
+        return bool(self._sessions.get(uri))
+
+    async def notify_updated(self, uri: str) -> int:
+        """Notifies every subscriber of `uri`; returns how many were reached."""
+        notified = 0
+        for session in list(self._sessions.get(uri, ())):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+                notified += 1
+            except Exception as e:
+                # Closed streams are expected when clients go away
+                logger.debug(f"Dropping subscriber of {uri}: {e}")
+                self._sessions[uri].discard(session)
+        return notified
+
+
+resource_subscriptions = ResourceSubscriptions()
@@ -0,0 +1,103 @@
+import logging
+from datetime import datetime
+from typing import Annotated, Any, List
+
+from mcp.server.fastmcp import Context
+from pydantic import BeforeValidator, Field
+
+from google_mcp.lazy import LazyHandler
+from google_mcp.results import Verbose
+from google_mcp.server import mcp
+
+logger = logging.getLogger(__name__)
+
+# Service handlers, imported on first tool call
+find_free_busy_mcp = LazyHandler("services.calendar_service:find_free_busy_mcp")
+
+
+@mcp.tool()
+async def find_calendar_free_busy(
+    ctx: Context,
+    calendar_user_id: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(
+            min_length=1,
+            description="Unique identifier for the user whose Google Calendar access is used.",
+        ),
+    ],
+    calendars: Annotated[
+        List[str],
+        Field(
+            min_length=1,
+            description="Calendar ids to check; for people, their email addresses (e.g. ['ann@example.com', 'bob@example.com']). Use 'primary' for the user's own calendar.",
+        ),
+    ],
+    time_min: Annotated[
+        datetime,
+        Field(
+            description="Start of the time window, ISO 8601 with offset (e.g. '2025-03-10T09:00:00+01:00'). Times without an offset are UTC."
+        ),
+    ],
+    time_max: Annotated[
+        datetime,
+        Field(description="End of the time window, ISO 8601 with offset."),
+    ],
+    min_free_minutes: Annotated[
+        int,
+        Field(
+            default=30,
+            ge=1,
+            le=1440,
+            description="Shortest free slot to report, in minutes.",
+        ),
+    ] = 30,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Find when a group of people (calendars) is busy and when all of them are
+    free within a time window.
+
+    Calendars are checked with batched free/busy queries, and results are
+    cached for a short time, so asking again about the same people and window
+    is answered without calling Google.
+
+    Args:
+        calendar_user_id (str): Unique identifier for the authenticated user.
+        calendars (List[str]): Calendar ids or email addresses.
+        time_min (datetime): Start of the window.
+        time_max (datetime): End of the window.
+        min_free_minutes (int): Shortest free slot to report.
+        verbose (bool): Also return each calendar's busy intervals.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether every calendar could be read
+            - busy (List[dict]): Merged intervals when anyone is busy
+            - free (List[dict]): Slots when everyone is free, with minutes
+            - errors (dict): Calendars that could not be read, with reasons
+              (e.g. 'notFound')
+            - cached_calendars (int): Calendars answered from the cache
+            Verbose results also contain:
+            - calendars (dict): Busy intervals per calendar
+            - time_min / time_max (str): The window, in UTC
+            - timestamp (str): ISO timestamp of the answer
+
+    Examples:
+        >>> result = await find_calendar_free_busy(
+        ...     calendar_user_id="user123",
+        ...     calendars=["ann@example.com", "bob@example.com"],
+        ...     time_min="2025-03-10T09:00:00Z",
+        ...     time_max="2025-03-10T17:00:00Z",
+        ...     min_free_minutes=45,
+        ... )
+    """
+    return await find_free_busy_mcp(
+        calendar_user_id,
+        calendars,
+        time_min,
+        time_max,
+        mcp_ctx=ctx,
+        min_free_minutes=min_free_minutes,
+        verbose=verbose,
+    )
@@ -0,0 +1,176 @@
+import logging
+from typing import Annotated, Any, Optional
+
+from mcp.server.fastmcp import Context
+from pydantic import BeforeValidator, Field
+
+from google_mcp.lazy import LazyHandler
+from google_mcp.results import Verbose
+from google_mcp.server import mcp
+
+logger = logging.getLogger(__name__)
+
+# Service handlers, imported on first tool call
+upload_drive_file_mcp = LazyHandler("services.drive_service:upload_drive_file_mcp")
+download_drive_file_mcp = LazyHandler("services.drive_service:download_drive_file_mcp")
+
+DriveUserId = Annotated[
+    str,
+    BeforeValidator(str.strip),
+    Field(
+        min_length=1,
+        description="Unique identifier for the user whose Google Drive is used.",
+    ),
+]
+
+
+@mcp.tool()
+async def upload_drive_file(
+    ctx: Context,
+    drive_user_id: DriveUserId,
+    path: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(
+            min_length=1,
+            description="Path of the local file to upload, relative to the server's Drive transfer directory (e.g. 'reports/q3.pdf').",
+        ),
+    ],
+    name: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            min_length=1,
+            description="Name of the file in Drive. Optional; defaults to the local file name.",
+        ),
+    ] = None,
+    folder_id: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            min_length=1,
+            description="Id of the Drive folder to upload into. Optional; defaults to My Drive.",
+        ),
+    ] = None,
+    mime_type: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            description="Content type of the file (e.g. 'application/pdf'). Optional; guessed from the file name.",
+        ),
+    ] = None,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Upload a local file to Google Drive.
+
+    The file is sent in a resumable upload session, chunk by chunk, so files of
+    any size are uploaded with constant memory. Progress is reported after
+    every chunk.
+
+    Args:
+        drive_user_id (str): Unique identifier for the authenticated user.
+        path (str): File path relative to the Drive transfer directory.
+        name (Optional[str]): Drive file name.
+        folder_id (Optional[str]): Parent folder id.
+        mime_type (Optional[str]): Content type of the file.
+        verbose (bool): Also return the Drive file and transfer statistics.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether the file was uploaded
+            - file_id (str): Id of the new Drive file
+            - path (str): Local path that was uploaded
+            - size_bytes (int): Bytes uploaded
+            Verbose results also contain:
+            - file (dict): Drive file (id, name, mimeType, size, md5Checksum)
+            - elapsed_seconds (float): Transfer time
+            - megabytes_per_second (float): Transfer throughput
+            - timestamp (str): ISO timestamp of completion
+
+    Examples:
+        >>> result = await upload_drive_file(
+        ...     drive_user_id="user123",
+        ...     path="exports/archive.zip",
+        ...     folder_id="1AbCdEf",
+        ... )
+    """
+    return await upload_drive_file_mcp(
+        drive_user_id,
+        path,
+        mcp_ctx=ctx,
+        name=name,
+        folder_id=folder_id,
+        mime_type=mime_type,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def download_drive_file(
+    ctx: Context,
+    drive_user_id: DriveUserId,
+    file_id: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(min_length=1, description="Id of the Drive file to download."),
+    ],
+    path: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            min_length=1,
+            description="Target path relative to the server's Drive transfer directory. Optional; defaults to the Drive file name.",
+        ),
+    ] = None,
+    overwrite: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Replace the local file if it already exists.",
+        ),
+    ] = False,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Download a binary Google Drive file to the server's transfer directory.
+
+    The file is fetched in byte ranges, several in parallel, and written in
+    order, so memory use stays constant for any file size. The MD5 checksum is
+    verified before the file is moved into place. Google Docs, Sheets and
+    Slides have no binary content and cannot be downloaded.
+
+    Args:
+        drive_user_id (str): Unique identifier for the authenticated user.
+        file_id (str): Drive file id.
+        path (Optional[str]): Target path relative to the transfer directory.
+        overwrite (bool): Replace an existing local file.
+        verbose (bool): Also return the Drive file and transfer statistics.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether the file was downloaded
+            - file_id (str): Drive file id
+            - path (str): Local path written
+            - size_bytes (int): Bytes downloaded
+            Verbose results also contain:
+            - file (dict): Drive file (id, name, mimeType, size, md5Checksum)
+            - elapsed_seconds (float): Transfer time
+            - megabytes_per_second (float): Transfer throughput
+            - timestamp (str): ISO timestamp of completion
+
+    Examples:
+        >>> result = await download_drive_file(
+        ...     drive_user_id="user123",
+        ...     file_id="1XyZ",
+        ...     path="downloads/video.mp4",
+        ... )
+    """
+    return await download_drive_file_mcp(
+        drive_user_id,
+        file_id,
+        mcp_ctx=ctx,
+        path=path,
+        overwrite=overwrite,
+        verbose=verbose,
+    )
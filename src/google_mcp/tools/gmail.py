@@ -1,14 +1,59 @@
+import json
 import logging
-from typing import Annotated, Any, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 from mcp.server.fastmcp import Context
-from pydantic import BeforeValidator, EmailStr, Field
+from pydantic import BeforeValidator, Field
 
+from google_mcp.lazy import LazyHandler
+from google_mcp.results import Verbose
 from google_mcp.server import mcp
-from services.gmail_service import send_gmail_mcp
 
 logger = logging.getLogger(__name__)
 
+# Service handlers, imported on first tool call
+send_gmail_mcp = LazyHandler("services.gmail_service:send_gmail_mcp")
+send_gmail_merge_mcp = LazyHandler("services.gmail_service:send_gmail_merge_mcp")
+read_gmail_messages_mcp = LazyHandler("services.gmail_service:read_gmail_messages_mcp")
+modify_gmail_messages_mcp = LazyHandler(
+    "services.gmail_service:modify_gmail_messages_mcp"
+)
+watch_gmail_mcp = LazyHandler("services.gmail_watch_service:watch_gmail_mcp")
+get_recent_changes = LazyHandler("services.gmail_watch_service:get_recent_changes")
+
+# Parameters shared by the bulk message tools
+GmailUserId = Annotated[
+    str,
+    BeforeValidator(str.strip),
+    Field(
+        min_length=1,
+        description="Unique identifier for the user whose mailbox is used.",
+    ),
+]
+MessageIds = Annotated[
+    Optional[List[str]],
+    Field(
+        default=None,
+        description="Gmail message ids to modify. Optional if 'query' is given.",
+    ),
+]
+SearchQuery = Annotated[
+    Optional[str],
+    Field(
+        default=None,
+        description="Gmail search query selecting messages to modify (same syntax as the Gmail search box, e.g. 'from:news@example.com older_than:30d'). Optional if 'message_ids' is given.",
+    ),
+]
+MaxMessages = Annotated[
+    int,
+    Field(
+        default=10000,
+        ge=1,
+        le=100000,
+        description="Maximum number of messages a 'query' may select.",
+    ),
+]
+
 
 @mcp.tool()
 async def send_gmail(
@@ -22,9 +67,9 @@ async def send_gmail(
         ),
     ],
     to: Annotated[
-        Union[EmailStr, List[EmailStr]],
+        Union[str, List[str]],
         Field(
-            description="Recipient email address(es). Can be a single email string or a list of email addresses. All must be valid email formats (e.g., 'user@example.com' or ['user1@example.com', 'user2@example.com'])."
+            description="Recipient email address(es). Can be a single email string or a list of email addresses. All must be valid email formats (e.g., 'user@example.com' or ['user1@example.com', 'user2@example.com']). Large recipient sets are split into several messages automatically."
         ),
     ],
     subject: Annotated[
@@ -45,19 +90,29 @@ async def send_gmail(
         ),
     ],
     cc: Annotated[
-        Optional[Union[EmailStr, List[EmailStr]]],
+        Optional[Union[str, List[str]]],
         Field(
             default=None,
             description="CC (Carbon Copy) email address(es). Optional. Can be a single email string or a list of email addresses. All must be valid email formats.",
         ),
     ] = None,
     bcc: Annotated[
-        Optional[Union[EmailStr, List[EmailStr]]],
+        Optional[Union[str, List[str]]],
         Field(
             default=None,
             description="BCC (Blind Carbon Copy) email address(es). Optional. Can be a single email string or a list of email addresses. All must be valid email formats.",
         ),
     ] = None,
+    idempotency_key: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            min_length=1,
+            max_length=255,
+            description="Optional client-chosen key. Retrying a send with the same key returns the first result instead of sending the email again.",
+        ),
+    ] = None,
+    verbose: Verbose = False,
 ) -> dict[str, Any]:
     """
     Send an email via Gmail API through Model Context Protocol.
@@ -71,7 +126,7 @@ async def send_gmail(
             - Sending gmail
             Must be a non-empty string after stripping whitespace.
 
-        to (Union[EmailStr, List[EmailStr]]): Primary recipient email address(es).
+        to (Union[str, List[str]]): Primary recipient email address(es).
             Can be:
             - Single email: "user@example.com"
             - Multiple emails: ["user1@example.com", "user2@example.com"]
@@ -87,22 +142,40 @@ async def send_gmail(
             - Can contain plain text or HTML
             - Supports Unicode characters
 
-        cc (Optional[Union[EmailStr, List[EmailStr]]]): CC recipients. Optional.
+        cc (Optional[Union[str, List[str]]]): CC recipients. Optional.
             Can be:
             - Single email: "cc@example.com"
             - Multiple emails: ["cc1@example.com", "cc2@example.com"]
             - None (default): No CC recipients
 
-        bcc (Optional[Union[EmailStr, List[EmailStr]]]): BCC recipients. Optional.
+        bcc (Optional[Union[str, List[str]]]): BCC recipients. Optional.
             Can be:
             - Single email: "bcc@example.com"
             - Multiple emails: ["bcc1@example.com", "bcc2@example.com"]
             - None (default): No BCC recipients
 
+        idempotency_key (Optional[str]): Key identifying this send. Optional.
+            Repeats with the same key (and the same arguments) within the
+            idempotency TTL return the stored result with
+            `idempotent_replay=True` instead of sending again.
+
+        verbose (bool): Return the full result. Optional, default False.
+
     Returns:
         Dict[str, Any]: Response dictionary containing:
             - success (bool): Whether the email was sent successfully
             - message_id (str): Gmail message ID if successful
+            - total_recipients (int): Number of TO, CC and BCC recipients
+            - duplicates_removed (int): Repeated addresses that were dropped
+            Sends split into several messages also contain:
+            - message_ids (List[str]): Gmail message IDs, first one first
+            - messages (int): Number of messages the send was split into
+            - moved_to_bcc (int): TO/CC recipients that did not fit in the
+              first message and were sent a BCC copy
+            - failed_recipients (int): Recipients of messages that failed
+            - errors (List[dict]): Failed messages with recipient counts
+            Verbose results also contain:
+            - subject (str): Subject that was sent
             - timestamp (str): ISO timestamp of when email was sent
             - recipients (dict): Summary of recipients:
                 - to (List[str]): List of primary recipients
@@ -163,10 +236,14 @@ async def send_gmail(
     Notes:
         - HTML content in body will be automatically detected and processed
         - All emails are sent from the authenticated user's Gmail account
-        - When using multiple recipients, each address is validated individually
+        - Addresses are de-duplicated case-insensitively across TO, CC and BCC
+          (an address keeps its most visible field) and validated together;
+          all invalid addresses are reported at once
         - CC recipients can see all other recipients (TO and CC)
         - BCC recipients are hidden from all other recipients
-        - Maximum recommended recipients per email: 100 (Gmail limit)
+        - Gmail accepts about 100 recipients per email. Larger sends are split:
+          the first message carries TO and CC (as many as fit), everyone else
+          receives BCC copies, and the messages are sent concurrently
     """
 
     # Normalize recipients to lists for consistent processing
@@ -175,10 +252,8 @@ async def send_gmail(
             return []
         elif isinstance(recipients, str):
             return [recipients]
-        elif isinstance(recipients, list):
-            return recipients
         else:
-            return [recipients]  # Handle EmailStr objects
+            return recipients
 
     to_list = normalize_recipients(to)
     cc_list = normalize_recipients(cc)
@@ -192,4 +267,378 @@ async def send_gmail(
         mcp_ctx=ctx,
         cc=cc_list if cc_list else None,
         bcc=bcc_list if bcc_list else None,
+        idempotency_key=idempotency_key,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def send_gmail_merge(
+    ctx: Context,
+    gmail_user_id: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(
+            min_length=1,
+            description="Unique identifier for the user sending the emails.",
+        ),
+    ],
+    subject_template: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(
+            min_length=1,
+            max_length=998,
+            description="Subject template. Use {{ variable }} placeholders, e.g. 'Your order {{ order_id }}'.",
+        ),
+    ],
+    body_template: Annotated[
+        str,
+        BeforeValidator(str.strip),
+        Field(
+            min_length=1,
+            description="Body template (plain text or HTML) with {{ variable }} placeholders, e.g. 'Hi {{ first_name }}, ...'. Values are HTML-escaped in HTML bodies.",
+        ),
+    ],
+    recipients: Annotated[
+        List[Dict[str, Any]],
+        Field(
+            min_length=1,
+            description="One record per email to send. Each record needs an 'email' key plus a value for every template variable, e.g. [{'email': 'ann@example.com', 'first_name': 'Ann'}].",
+        ),
+    ],
+    idempotency_key: Annotated[
+        Optional[str],
+        Field(
+            default=None,
+            min_length=1,
+            max_length=255,
+            description="Optional client-chosen key. Retrying the merge with the same key only sends the rows that were not sent before.",
+        ),
+    ] = None,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Send one personalized email per recipient from a subject/body template
+    (mail merge), in a single tool call.
+
+    The templates are compiled once and rendered per recipient record while
+    the emails are sent concurrently. A row that fails (missing variable,
+    Gmail error) does not stop the others.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        subject_template (str): Subject with {{ variable }} placeholders.
+        body_template (str): Body with {{ variable }} placeholders.
+        recipients (List[Dict[str, Any]]): Records with an 'email' key and the
+            template variables.
+        idempotency_key (Optional[str]): Key making retries of the merge safe.
+        verbose (bool): Return a result for every row, not only failed rows.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether every row was sent
+            - sent (int) / failed (int): Row counts
+            - elapsed_seconds (float): Time spent sending
+            - messages_per_second (float): Send throughput
+            - failures (List[dict]): Failed rows: index, email and error
+            Verbose results replace `failures` with:
+            - results (List[dict]): Per row: index, email, success and
+              message_id or error
+            - timestamp (str): ISO timestamp of completion
+
+    Examples:
+        >>> result = await send_gmail_merge(
+        ...     gmail_user_id="user123",
+        ...     subject_template="Welcome, {{ name }}",
+        ...     body_template="Hi {{ name }}, your code is {{ code }}.",
+        ...     recipients=[
+        ...         {"email": "ann@example.com", "name": "Ann", "code": "A1"},
+        ...         {"email": "bob@example.com", "name": "Bob", "code": "B2"},
+        ...     ],
+        ... )
+    """
+    return await send_gmail_merge_mcp(
+        gmail_user_id,
+        subject_template,
+        body_template,
+        recipients,
+        mcp_ctx=ctx,
+        idempotency_key=idempotency_key,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def read_gmail_messages(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    message_ids: Annotated[
+        List[str],
+        Field(min_length=1, description="Gmail message ids to read."),
+    ],
+    format: Annotated[
+        Literal["full", "metadata", "raw"],
+        Field(
+            default="full",
+            description="'full' for the parsed message with its body parts, 'metadata' for headers only, 'raw' for the base64url-encoded RFC 2822 message including attachments.",
+        ),
+    ] = "full",
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Read Gmail messages by id.
+
+    Message content never changes, so messages read before are answered from a
+    local cache without calling Gmail. Labels change and are therefore not
+    returned; use a search query to filter by label.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        message_ids (List[str]): Message ids to read.
+        format (str): 'full', 'metadata' or 'raw'.
+        verbose (bool): Also return the format and a timestamp.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether every message could be read
+            - messages (List[dict]): Gmail messages (id, threadId, snippet,
+              payload or raw, sizeEstimate, internalDate) in request order
+            - errors (dict): Ids that could not be read, with reasons
+              (e.g. 'notFound')
+            - cached (int): Messages answered from the cache
+
+    Examples:
+        >>> result = await read_gmail_messages(
+        ...     gmail_user_id="user123",
+        ...     message_ids=["18c2f0a9b7d4e123", "18c2f0a9b7d4e456"],
+        ...     format="metadata",
+        ... )
+    """
+    return await read_gmail_messages_mcp(
+        gmail_user_id,
+        message_ids,
+        mcp_ctx=ctx,
+        message_format=format,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def modify_gmail_labels(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    add_labels: Annotated[
+        Optional[List[str]],
+        Field(
+            default=None,
+            description="Labels to add, as label ids (e.g. 'STARRED', 'Label_12') or label names.",
+        ),
+    ] = None,
+    remove_labels: Annotated[
+        Optional[List[str]],
+        Field(
+            default=None,
+            description="Labels to remove, as label ids or label names.",
+        ),
+    ] = None,
+    message_ids: MessageIds = None,
+    query: SearchQuery = None,
+    max_messages: MaxMessages = 10000,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Add and/or remove labels on many Gmail messages at once.
+
+    Messages are selected by id and/or by a Gmail search query, and changed with
+    `users.messages.batchModify` in chunks of up to 1000 messages, with progress
+    reported as chunks complete.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        add_labels (Optional[List[str]]): Label ids or names to add.
+        remove_labels (Optional[List[str]]): Label ids or names to remove.
+        message_ids (Optional[List[str]]): Message ids to modify.
+        query (Optional[str]): Gmail search query selecting messages to modify.
+        max_messages (int): Maximum number of messages the query may select.
+        verbose (bool): Return the full result.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether all messages were modified
+            - modified (int): Number of messages modified
+            Verbose results also contain:
+            - action (str): Name of the operation
+            - added_label_ids (List[str]): Label ids added
+            - removed_label_ids (List[str]): Label ids removed
+            - timestamp (str): ISO timestamp of completion
+
+    Examples:
+        >>> result = await modify_gmail_labels(
+        ...     gmail_user_id="user123",
+        ...     query="from:billing@example.com",
+        ...     add_labels=["Receipts"],
+        ... )
+    """
+    return await modify_gmail_messages_mcp(
+        gmail_user_id,
+        mcp_ctx=ctx,
+        action="modify_labels",
+        message_ids=message_ids,
+        query=query,
+        add_labels=add_labels,
+        remove_labels=remove_labels,
+        max_messages=max_messages,
+        verbose=verbose,
     )
+
+
+@mcp.tool()
+async def archive_gmail_messages(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    message_ids: MessageIds = None,
+    query: SearchQuery = None,
+    max_messages: MaxMessages = 10000,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Archive many Gmail messages at once (removes them from the inbox).
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        message_ids (Optional[List[str]]): Message ids to archive.
+        query (Optional[str]): Gmail search query selecting messages to archive,
+            e.g. "in:inbox older_than:1y".
+        max_messages (int): Maximum number of messages the query may select.
+        verbose (bool): Return the full result.
+
+    Returns:
+        Dict[str, Any]: Same shape as `modify_gmail_labels`.
+    """
+    return await modify_gmail_messages_mcp(
+        gmail_user_id,
+        mcp_ctx=ctx,
+        action="archive",
+        message_ids=message_ids,
+        query=query,
+        remove_labels=["INBOX"],
+        max_messages=max_messages,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def mark_gmail_messages_read(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    message_ids: MessageIds = None,
+    query: SearchQuery = None,
+    max_messages: MaxMessages = 10000,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Mark many Gmail messages as read at once.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        message_ids (Optional[List[str]]): Message ids to mark as read.
+        query (Optional[str]): Gmail search query selecting messages to mark as
+            read, e.g. "is:unread label:newsletters".
+        max_messages (int): Maximum number of messages the query may select.
+        verbose (bool): Return the full result.
+
+    Returns:
+        Dict[str, Any]: Same shape as `modify_gmail_labels`.
+    """
+    return await modify_gmail_messages_mcp(
+        gmail_user_id,
+        mcp_ctx=ctx,
+        action="mark_read",
+        message_ids=message_ids,
+        query=query,
+        remove_labels=["UNREAD"],
+        max_messages=max_messages,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def trash_gmail_messages(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    message_ids: MessageIds = None,
+    query: SearchQuery = None,
+    max_messages: MaxMessages = 10000,
+    verbose: Verbose = False,
+) -> dict[str, Any]:
+    """
+    Move many Gmail messages to the trash at once.
+
+    Trashed messages are deleted by Gmail after 30 days.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        message_ids (Optional[List[str]]): Message ids to trash.
+        query (Optional[str]): Gmail search query selecting messages to trash,
+            e.g. "category:promotions older_than:6m".
+        max_messages (int): Maximum number of messages the query may select.
+        verbose (bool): Return the full result.
+
+    Returns:
+        Dict[str, Any]: Same shape as `modify_gmail_labels`.
+    """
+    return await modify_gmail_messages_mcp(
+        gmail_user_id,
+        mcp_ctx=ctx,
+        action="trash",
+        message_ids=message_ids,
+        query=query,
+        add_labels=["TRASH"],
+        max_messages=max_messages,
+        verbose=verbose,
+    )
+
+
+@mcp.tool()
+async def watch_gmail_mailbox(
+    ctx: Context,
+    gmail_user_id: GmailUserId,
+    enabled: Annotated[
+        bool,
+        Field(
+            default=True,
+            description="True to start (or renew) push notifications, False to stop them.",
+        ),
+    ] = True,
+) -> dict[str, Any]:
+    """
+    Start or stop push notifications for a Gmail mailbox.
+
+    While watching, new mail and label changes are synced as they happen and
+    published on the `gmail://{gmail_user_id}/changes` resource; subscribe to it
+    to receive `notifications/resources/updated` instead of polling. Watches are
+    renewed automatically before Gmail expires them.
+
+    Args:
+        gmail_user_id (str): Unique identifier for the authenticated user.
+        enabled (bool): Start (True, default) or stop (False) watching.
+
+    Returns:
+        Dict[str, Any]: Response dictionary containing:
+            - success (bool): Whether the operation succeeded
+            - watching (bool): Whether the mailbox is now watched
+            - resource_uri (str): URI of the changes resource
+            - expiration (str): ISO timestamp the watch expires (when enabled)
+    """
+    return await watch_gmail_mcp(gmail_user_id, enabled, mcp_ctx=ctx)
+
+
+@mcp.resource(
+    "gmail://{gmail_user_id}/changes",
+    name="gmail_changes",
+    description="Recent mailbox changes (Gmail history records) of a watched mailbox, oldest first.",
+    mime_type="application/json",
+)
+async def gmail_changes(gmail_user_id: str) -> str:
+    return json.dumps(await get_recent_changes(gmail_user_id))
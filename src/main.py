@@ -8,3 +8,27 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    from config.settings_config import get_settings
+    from core.monitoring import clear_multiprocess_dir
+
+    # Multiple workers need PROMETHEUS_MULTIPROC_DIR for aggregated /metrics
+    if get_settings().workers > 1 and not get_settings().prometheus_multiproc_dir:
+        logger.warning(
+            "Running multiple workers without PROMETHEUS_MULTIPROC_DIR: "
+            "/metrics will only report the worker answering the scrape"
+        )
+    clear_multiprocess_dir()
+
+    uvicorn.run(
+        "main:app",
+        host=get_settings().api_host,
+        port=get_settings().api_port,
+        workers=get_settings().workers,
+        log_config=None,
+        # Bounds the wait for open requests; the lifespan drains the rest
+        timeout_graceful_shutdown=get_settings().shutdown_timeout_seconds,
+    )
@@ -0,0 +1,50 @@
+import logging
+import time
+
+from fastapi import Request, status
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from config.settings_config import get_settings
+from core.admission import AdmissionController, AdmissionRejected
+from core.shutdown import shutdown_coordinator
+
+logger = logging.getLogger(__name__)
+
+# Health checks and metrics must stay reachable under load
+EXEMPT_PREFIXES = ("/api/monitoring",)
+
+api_admission = AdmissionController(
+    "api",
+    max_concurrency=get_settings().api_max_concurrency,
+    client_max_concurrency=get_settings().api_client_max_concurrency,
+    max_queue=get_settings().api_max_queue,
+    queue_timeout=get_settings().api_queue_timeout_seconds,
+)
+shutdown_coordinator.add_admission(api_admission)
+
+
+class AdmissionMiddleware(BaseHTTPMiddleware):
+    """Rejects requests with 503 and Retry-After once the server is saturated"""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path.startswith(EXEMPT_PREFIXES):
+            return await call_next(request)
+
+        client_key = request.query_params.get("client_id") or (
+            request.client.host if request.client else None
+        )
+        try:
+            async with api_admission.admit(client_key):
+                return await call_next(request)
+        except AdmissionRejected as e:
+            return ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": "SERVICE_UNAVAILABLE",
+                    "message": f"Server busy ({e.reason}), retry later",
+                    "timestamp": time.time(),
+                    "path": request.url.path,
+                },
+                headers={"Retry-After": e.retry_after_header},
+            )
@@ -1,7 +1,8 @@
 import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple
 from urllib.parse import quote_plus, urlencode
 
-import googleapiclient.discovery
 from fastapi import HTTPException, status
 from fastapi.responses import RedirectResponse
 from google.auth.transport.requests import Request as GRequest
@@ -11,28 +12,67 @@ from google_auth_oauthlib.flow import Flow
 from api.v1.schema.auth import AuthResponse
 from config.settings_config import get_settings
 from core.utils import get_google_client_config
-from db.prisma.generated.enums import AuthType as PrismaAuthTye
 from db.prisma.utils import get_db
 from enums.auth_type import AuthType
+from services.credential_cache import (
+    get_client_auth,
+    get_user_token,
+    store_user_token,
+    to_user_token_record,
+)
+from services.google_api import OAUTH2_TOKEN, OAUTH2_USERINFO, call_upstream, execute
+from services.google_client import build_google_service
+from services.google_id_token import verify_google_id_token
+from services.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
 
+# Makes the token exchange return an ID token carrying the Google user id
+OPENID_SCOPE = "openid"
+
+
+class UserCredentials(NamedTuple):
+    credentials: Credentials
+    client_auth_id: str
+
+
+def _flow_scopes(scopes: List[str]) -> List[str]:
+    return scopes if OPENID_SCOPE in scopes else [*scopes, OPENID_SCOPE]
+
+
+async def _get_google_id(
+    creds: Credentials, google_client_id: str, client_auth_id: str
+) -> str:
+    """
+    Returns the Google user id: the `sub` claim of the ID token from the token
+    exchange, verified locally, or from the userinfo endpoint when the response
+    carried no ID token.
+    """
+    if creds.id_token:
+        try:
+            claims = await verify_google_id_token(creds.id_token, google_client_id)
+        except ValueError as e:
+            logger.warning(f"ID token verification failed: {e}")
+            raise HTTPException(400, "Invalid ID token")
+        return claims["sub"]
+
+    oauth2 = build_google_service("oauth2", "v2", creds)
+    profile = await execute(oauth2.userinfo().get(), OAUTH2_USERINFO, client_auth_id)
+    return profile["id"]
+
+
 async def auth_client(
     client_id: str, auth_type: AuthType, current_uri: str
 ) -> AuthResponse:
-    db = await get_db()
-
-    client_auth = await db.clientauth.find_first(
-        where={"clientId": client_id, "authType": PrismaAuthTye(auth_type.value)}
-    )
+    client_auth = await get_client_auth(client_id, auth_type)
 
     if not client_auth:
         raise HTTPException(400, "Client not found")
 
     flow = Flow.from_client_config(
         get_google_client_config(client_auth),
-        scopes=client_auth.scopes,
+        scopes=_flow_scopes(client_auth.scopes),
         redirect_uri=str(get_settings().google_redirect_uri),
     )
     url, state = flow.authorization_url(access_type="offline", prompt="consent")
@@ -60,20 +100,21 @@ async def auth_client_callback(state: str | None, code: str | None) -> RedirectR
 
     flow = Flow.from_client_config(
         get_google_client_config(existing.clientAuth),
-        scopes=existing.clientAuth.scopes,
+        scopes=_flow_scopes(existing.clientAuth.scopes),
         redirect_uri=get_settings().google_redirect_uri,
         state=state,
     )
-    flow.fetch_token(code=code)
+    await call_upstream(
+        OAUTH2_TOKEN, existing.clientAuthId, lambda: flow.fetch_token(code=code)
+    )
     creds = flow.credentials
 
     if not creds.token or not creds.expiry:
         raise HTTPException(500, "Token missing")
 
-    # Get user info
-    oauth2 = googleapiclient.discovery.build("oauth2", "v2", credentials=creds)
-    profile = oauth2.userinfo().get().execute()
-    google_id = profile["id"]
+    google_id = await _get_google_id(
+        creds, existing.clientAuth.googleClientId, existing.clientAuthId
+    )
 
     user_token = await db.usertoken.upsert(
         where={
@@ -98,6 +139,9 @@ async def auth_client_callback(state: str | None, code: str | None) -> RedirectR
         },
     )
 
+    # Replace any cached copy of the previous token on every replica
+    await store_user_token(to_user_token_record(user_token, existing.clientAuth))
+
     # Ensure current_uri is a string, or empty if None
     current = existing.currentUri or ""
 
@@ -114,11 +158,16 @@ async def auth_client_callback(state: str | None, code: str | None) -> RedirectR
 
 
 async def get_creds(user_token_id: str) -> Credentials:
-    db = await get_db()
-    user_token = await db.usertoken.find_unique(
-        where={"id": user_token_id}, include={"clientAuth": True}
-    )
-    if not user_token or not user_token.clientAuth:
+    return (await get_user_credentials(user_token_id)).credentials
+
+
+async def get_user_credentials(user_token_id: str) -> UserCredentials:
+    """
+    Returns valid credentials for a user token, refreshing them if expired, with
+    the owning `ClientAuth` id (used to isolate upstream limits per tenant).
+    """
+    user_token = await get_user_token(user_token_id)
+    if not user_token:
         raise HTTPException(404, "User token not found")
 
     creds = Credentials(
@@ -128,19 +177,50 @@ async def get_creds(user_token_id: str) -> Credentials:
         client_id=user_token.clientAuth.googleClientId,
         client_secret=user_token.clientAuth.googleClientSecret,
         scopes=user_token.clientAuth.scopes,
+        # google-auth compares against naive UTC timestamps
+        expiry=user_token.expiry.astimezone(timezone.utc).replace(tzinfo=None),
     )
 
     if creds.expired and creds.refresh_token:
-        creds.refresh(GRequest())
+        await call_upstream(
+            OAUTH2_TOKEN, user_token.clientAuthId, creds.refresh, GRequest()
+        )
 
         if not creds.token or not creds.expiry:
             raise HTTPException(
                 status_code=500, detail="Credentials missing token or expiry"
             )
 
-        await db.usertoken.update(
-            where={"id": user_token.id},
-            data={"accessToken": creds.token, "expiry": creds.expiry},
+        # Written behind: the refreshed token is already shared through the
+        # cache below, and a lost write only costs another refresh
+        write_behind.update_token(
+            user_token.id, {"accessToken": creds.token, "expiry": creds.expiry}
+        )
+
+        # Share the refreshed token so other replicas do not refresh it again
+        await store_user_token(
+            user_token.model_copy(
+                update={
+                    "accessToken": creds.token,
+                    "expiry": creds.expiry.replace(tzinfo=timezone.utc),
+                }
+            )
         )
 
-    return creds
+    return UserCredentials(creds, user_token.clientAuthId)
+
+
+async def purge_expired_oauth_flows() -> int:
+    """
+    Deletes OAuth flows that were started but never completed within
+    `oauth_flow_ttl_seconds`.
+    """
+    db = await get_db()
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=get_settings().oauth_flow_ttl_seconds
+    )
+
+    deleted = await db.oauthflow.delete_many(where={"createdAt": {"lt": cutoff}})
+    if deleted:
+        logger.info(f"Purged {deleted} expired OAuth flows")
+    return deleted
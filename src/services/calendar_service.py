@@ -0,0 +1,293 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from google.oauth2.credentials import Credentials
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.exceptions import ToolError
+
+from config.settings_config import get_settings
+from core.cache.local import MISSING, LocalCache
+from core.monitoring import cache_requests_counter
+from google_mcp.notifier import ToolNotifier
+from google_mcp.results import compact_result
+from services.auth_service import get_user_credentials
+from services.google_api import CALENDAR_FREEBUSY, execute
+from services.google_client import build_google_service
+
+logger = logging.getLogger(__name__)
+
+# Calendar API limit on `items` per `freebusy.query`
+FREEBUSY_MAX_ITEMS = 50
+CACHE_NAME = "calendar_freebusy"
+# Fields of compact (non-verbose) tool results
+FREEBUSY_RESULT_FIELDS = ("success", "busy", "free", "errors", "cached_calendars")
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass(frozen=True)
+class CalendarBusy:
+    """Busy intervals of one calendar within a query window."""
+
+    busy: Tuple[Interval, ...] = ()
+    errors: Tuple[str, ...] = ()
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive datetimes are taken as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _format(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Union of intervals as a sorted list of disjoint intervals (O(n log n))."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(
+    busy: List[Interval], time_min: datetime, time_max: datetime, min_length: timedelta
+) -> List[Interval]:
+    """Gaps of at least `min_length` between merged `busy` intervals."""
+    free: List[Interval] = []
+    cursor = time_min
+    for start, end in busy:
+        if start - cursor >= min_length and start > cursor:
+            free.append((cursor, min(start, time_max)))
+        cursor = max(cursor, end)
+        if cursor >= time_max:
+            break
+    if time_max - cursor >= min_length and time_max > cursor:
+        free.append((cursor, time_max))
+    return free
+
+
+class FreeBusyCache:
+    """
+    Short-TTL cache of busy intervals per (user, calendar, window), so that
+    repeated questions about the same people and time range cost no API calls.
+    """
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._entries: LocalCache[CalendarBusy] = LocalCache(
+            settings.calendar_freebusy_cache_max_entries,
+            settings.calendar_freebusy_cache_ttl_seconds,
+        )
+
+    def get(self, key: Tuple[str, str, datetime, datetime]) -> Optional[CalendarBusy]:
+        value = self._entries.get(key)
+        result = "miss" if value is MISSING else "l1_hit"
+        cache_requests_counter.labels(cache=CACHE_NAME, result=result).inc()
+        return None if value is MISSING else value
+
+    def set(
+        self, key: Tuple[str, str, datetime, datetime], value: CalendarBusy
+    ) -> None:
+        self._entries.set(key, value)
+
+
+freebusy_cache = FreeBusyCache()
+
+
+async def query_freebusy(
+    creds: Credentials,
+    client_auth_id: str,
+    calendar_ids: List[str],
+    time_min: datetime,
+    time_max: datetime,
+) -> Dict[str, CalendarBusy]:
+    """
+    Busy intervals for each calendar, packing up to `FREEBUSY_MAX_ITEMS`
+    calendars into each `freebusy.query` call; the calls run concurrently.
+    """
+
+    async def query(chunk: List[str]) -> Dict[str, CalendarBusy]:
+        # One client per call: httplib2 connections are not thread-safe
+        service = build_google_service("calendar", "v3", creds)
+        response = await execute(
+            service.freebusy().query(
+                body={
+                    "timeMin": _format(time_min),
+                    "timeMax": _format(time_max),
+                    "items": [{"id": calendar_id} for calendar_id in chunk],
+                }
+            ),
+            CALENDAR_FREEBUSY,
+            client_auth_id,
+        )
+        calendars = response.get("calendars", {})
+        result = {}
+        for calendar_id in chunk:
+            entry = calendars.get(calendar_id, {})
+            result[calendar_id] = CalendarBusy(
+                busy=tuple(
+                    (
+                        _utc(datetime.fromisoformat(interval["start"])),
+                        _utc(datetime.fromisoformat(interval["end"])),
+                    )
+                    for interval in entry.get("busy", [])
+                ),
+                errors=tuple(
+                    error.get("reason", "unknown") for error in entry.get("errors", [])
+                ),
+            )
+        return result
+
+    results = await asyncio.gather(
+        *(
+            query(calendar_ids[start : start + FREEBUSY_MAX_ITEMS])
+            for start in range(0, len(calendar_ids), FREEBUSY_MAX_ITEMS)
+        )
+    )
+    return {
+        calendar_id: busy for chunk in results for calendar_id, busy in chunk.items()
+    }
+
+
+async def find_free_busy_mcp(
+    calendar_user_id: str,
+    calendar_ids: List[str],
+    time_min: datetime,
+    time_max: datetime,
+    mcp_ctx: Context,
+    min_free_minutes: int = 30,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Busy intervals per calendar plus the slots when all calendars are free.
+
+    Calendars cached for the same window are answered without API calls; the
+    rest are queried in batches of `FREEBUSY_MAX_ITEMS`.
+
+    Args:
+        calendar_user_id: User identifier for OAuth credentials
+        calendar_ids: Calendar ids or email addresses to check
+        time_min: Start of the window (naive values are UTC)
+        time_max: End of the window
+        mcp_ctx: MCP context for logging
+        min_free_minutes: Shortest free slot to report
+        verbose: Include each calendar's busy intervals, the window and a
+            timestamp
+
+    Returns:
+        Dict containing the merged busy intervals, the common free slots, the
+        calendars that could not be read and how many calendars were cached
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        # Ordered and de-duplicated
+        calendar_ids = list(dict.fromkeys(c.strip() for c in calendar_ids))
+        await notifier.info("Starting free/busy query", calendars=len(calendar_ids))
+
+        try:
+            time_min, time_max = _utc(time_min), _utc(time_max)
+            if time_max <= time_min:
+                raise ValueError("'time_max' must be after 'time_min'")
+            if not calendar_ids:
+                raise ValueError("At least one calendar is required")
+            max_calendars = get_settings().calendar_freebusy_max_calendars
+            if len(calendar_ids) > max_calendars:
+                raise ValueError(f"At most {max_calendars} calendars per query")
+
+            calendars: Dict[str, CalendarBusy] = {}
+            for calendar_id in calendar_ids:
+                cached = freebusy_cache.get(
+                    (calendar_user_id, calendar_id, time_min, time_max)
+                )
+                if cached is not None:
+                    calendars[calendar_id] = cached
+
+            missing = [c for c in calendar_ids if c not in calendars]
+            if missing:
+                creds, client_auth_id = await get_user_credentials(calendar_user_id)
+                fetched = await query_freebusy(
+                    creds, client_auth_id, missing, time_min, time_max
+                )
+                for calendar_id, busy in fetched.items():
+                    # Errors (e.g. notFound) may be transient; do not cache them
+                    if not busy.errors:
+                        freebusy_cache.set(
+                            (calendar_user_id, calendar_id, time_min, time_max), busy
+                        )
+                calendars.update(fetched)
+
+            busy = merge_intervals(
+                interval
+                for calendar in calendars.values()
+                for interval in calendar.busy
+            )
+            free = free_intervals(
+                busy, time_min, time_max, timedelta(minutes=min_free_minutes)
+            )
+            await notifier.info(
+                "Free/busy done: %d calendars (%d cached), %d free slots",
+                len(calendar_ids),
+                len(calendar_ids) - len(missing),
+                len(free),
+                cached=len(calendar_ids) - len(missing),
+                free_slots=len(free),
+            )
+
+            result = {
+                "success": all(not c.errors for c in calendars.values()),
+                "time_min": _format(time_min),
+                "time_max": _format(time_max),
+                "calendars": {
+                    calendar_id: {
+                        "busy": [
+                            {"start": _format(start), "end": _format(end)}
+                            for start, end in calendars[calendar_id].busy
+                        ],
+                        **(
+                            {"errors": list(calendars[calendar_id].errors)}
+                            if calendars[calendar_id].errors
+                            else {}
+                        ),
+                    }
+                    for calendar_id in calendar_ids
+                },
+                "busy": [
+                    {"start": _format(start), "end": _format(end)}
+                    for start, end in busy
+                ],
+                "free": [
+                    {
+                        "start": _format(start),
+                        "end": _format(end),
+                        "minutes": int((end - start).total_seconds() // 60),
+                    }
+                    for start, end in free
+                ],
+                "errors": {
+                    calendar_id: list(calendar.errors)
+                    for calendar_id, calendar in calendars.items()
+                    if calendar.errors
+                },
+                "cached_calendars": len(calendar_ids) - len(missing),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            return result if verbose else compact_result(result, FREEBUSY_RESULT_FIELDS)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Calendar free/busy failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
@@ -1,13 +1,43 @@
 import logging
+import uuid
+from typing import (
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
 
-from api.v1.schema.client import AddClientAuthsRequest, ClientRequest, ClientResponse
+from api.v1.schema.client import (
+    AddClientAuthsRequest,
+    ClientAuthImportRow,
+    ClientAuthRequest,
+    ClientAuthResponse,
+    ClientImportRow,
+    ClientRequest,
+    ClientResponse,
+    ImportResponse,
+    ImportRowError,
+    Page,
+    UserTokenResponse,
+)
+from config.settings_config import get_settings
 from db.prisma.generated.enums import AuthType as PrismaAuthType
 from db.prisma.utils import get_db
 
 logger = logging.getLogger(__name__)
 
+R = TypeVar("R", bound=BaseModel)
+# (line number, parsed row or validation error)
+ParsedRow = Tuple[int, Union[R, str]]
+
 
 async def create_client(payload: ClientRequest) -> ClientResponse:
     db = await get_db()
@@ -31,15 +61,316 @@ async def add_client_auths(
         raise HTTPException(400, "Client not found")
 
     await db.clientauth.create_many(
-        [
-            {
-                "authType": PrismaAuthType(auth.auth_type.value),
-                "googleClientId": auth.google_client_id,
-                "googleClientSecret": auth.google_client_secret,
-                "redirectUri": str(auth.redirect_uri),
-                "scopes": auth.scopes,
-                "clientId": str(client.id),
+        [_client_auth_data(auth, str(client.id)) for auth in payload.auths]
+    )
+
+
+def _client_auth_data(
+    auth: ClientAuthRequest, client_id: str, auth_id: Optional[str] = None
+) -> dict:
+    data = {
+        "authType": PrismaAuthType(auth.auth_type.value),
+        "googleClientId": auth.google_client_id,
+        "googleClientSecret": auth.google_client_secret,
+        "redirectUri": str(auth.redirect_uri),
+        "scopes": auth.scopes,
+        "clientId": client_id,
+    }
+    if auth_id is not None:
+        data["id"] = auth_id
+    return data
+
+
+async def _iter_ndjson(
+    chunks: AsyncIterator[bytes], model: Type[R]
+) -> AsyncIterator[List[ParsedRow]]:
+    """
+    Parses a streamed NDJSON body into batches of `admin_import_batch_size`
+    rows, so an import of any size is held in memory one batch at a time.
+    Blank lines are skipped; lines that fail validation carry the error.
+    """
+    settings = get_settings()
+    max_line = settings.admin_import_max_line_bytes
+    batch: List[ParsedRow] = []
+    line = 0
+
+    def parse(raw: Optional[bytes]) -> Union[R, str]:
+        if raw is None:
+            return f"Line exceeds {max_line} bytes"
+        try:
+            return model.model_validate_json(raw)
+        except ValidationError as e:
+            return "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            )
+
+    async def lines() -> AsyncIterator[Optional[bytes]]:
+        """Yields raw lines; `None` for a line over the size limit."""
+        buffer = b""
+        # Dropping the rest of an overlong line
+        skipping = False
+        async for chunk in chunks:
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for raw in complete:
+                yield None if skipping else raw
+                skipping = False
+            if len(buffer) > max_line:
+                buffer, skipping = b"", True
+        yield None if skipping else buffer
+
+    async for raw in lines():
+        line += 1
+        if raw is not None and not raw.strip():
+            continue
+        batch.append((line, parse(raw)))
+        if len(batch) >= settings.admin_import_batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _run_import(
+    chunks: AsyncIterator[bytes], model: Type[R], insert_batch
+) -> ImportResponse:
+    """
+    Feeds parsed batches to `insert_batch(rows, errors) -> created`; a batch
+    that fails as a whole reports the failure on each of its rows.
+    """
+    received = created = 0
+    errors: List[ImportRowError] = []
+    async for batch in _iter_ndjson(chunks, model):
+        received += len(batch)
+        rows = []
+        for line, row in batch:
+            if isinstance(row, str):
+                errors.append(ImportRowError(line=line, error=row))
+            else:
+                rows.append((line, row))
+        if not rows:
+            continue
+        # Row errors of a batch count only if the batch is written
+        batch_errors: List[ImportRowError] = []
+        try:
+            created += await insert_batch(rows, batch_errors)
+            errors.extend(batch_errors)
+        except Exception as e:
+            logger.error(f"Import batch failed: {type(e).__name__}: {e}")
+            errors.extend(
+                ImportRowError(line=line, error=f"Batch failed: {e}")
+                for line, _ in rows
+            )
+
+    logger.info(
+        f"Imported {created}/{received} {model.__name__} rows",
+        extra={
+            "received": received,
+            "created_count": created,
+            "failed": len(errors),
+        },
+    )
+    return ImportResponse(
+        received=received,
+        created=created,
+        failed=received - created,
+        errors=sorted(errors, key=lambda error: error.line),
+    )
+
+
+async def import_clients(chunks: AsyncIterator[bytes]) -> ImportResponse:
+    """
+    Creates clients (with their auths) from NDJSON rows. Each batch is one
+    transaction of two `create_many` calls; rows whose name is taken are
+    skipped and reported, the rest of the batch is created.
+    """
+    db = await get_db()
+
+    async def insert_batch(
+        rows: List[Tuple[int, ClientImportRow]], errors: List[ImportRowError]
+    ) -> int:
+        by_name: Dict[str, Tuple[int, ClientImportRow, str]] = {}
+        for line, row in rows:
+            auth_types = [auth.auth_type for auth in row.auths]
+            if row.name in by_name:
+                errors.append(ImportRowError(line=line, error="Duplicate name"))
+            elif len(set(auth_types)) < len(auth_types):
+                errors.append(ImportRowError(line=line, error="Duplicate auth type"))
+            else:
+                by_name[row.name] = (line, row, str(uuid.uuid4()))
+        if not by_name:
+            return 0
+
+        # Ids are generated here, since `create_many` returns only a count
+        async with db.tx() as tx:
+            await tx.client.create_many(
+                data=[
+                    {"id": client_id, "name": name}
+                    for name, (_, _, client_id) in by_name.items()
+                ],
+                skip_duplicates=True,
+            )
+            inserted: Set[str] = {
+                client.id
+                for client in await tx.client.find_many(
+                    where={"id": {"in": [c for _, _, c in by_name.values()]}}
+                )
             }
-            for auth in payload.auths
-        ]
+            auths = [
+                _client_auth_data(auth, client_id)
+                for _, row, client_id in by_name.values()
+                if client_id in inserted
+                for auth in row.auths
+            ]
+            if auths:
+                await tx.clientauth.create_many(data=auths)
+
+        errors.extend(
+            ImportRowError(line=line, error="Client name already exists")
+            for line, _, client_id in by_name.values()
+            if client_id not in inserted
+        )
+        return len(inserted)
+
+    return await _run_import(chunks, ClientImportRow, insert_batch)
+
+
+async def import_client_auths(chunks: AsyncIterator[bytes]) -> ImportResponse:
+    """
+    Adds auths to existing clients from NDJSON rows: one client lookup and one
+    `create_many` per batch instead of a lookup and an insert per client.
+    """
+    db = await get_db()
+
+    async def insert_batch(
+        rows: List[Tuple[int, ClientAuthImportRow]], errors: List[ImportRowError]
+    ) -> int:
+        client_ids = list({str(row.client_id) for _, row in rows})
+        existing = {
+            client.id
+            for client in await db.client.find_many(where={"id": {"in": client_ids}})
+        }
+
+        pending: Dict[Tuple[str, str], Tuple[int, ClientAuthImportRow, str]] = {}
+        for line, row in rows:
+            key = (str(row.client_id), row.auth_type.value)
+            if key[0] not in existing:
+                errors.append(ImportRowError(line=line, error="Client not found"))
+            elif key in pending:
+                errors.append(ImportRowError(line=line, error="Duplicate auth type"))
+            else:
+                pending[key] = (line, row, str(uuid.uuid4()))
+        if not pending:
+            return 0
+
+        await db.clientauth.create_many(
+            data=[
+                _client_auth_data(row, str(row.client_id), auth_id)
+                for _, row, auth_id in pending.values()
+            ],
+            skip_duplicates=True,
+        )
+        inserted = {
+            auth.id
+            for auth in await db.clientauth.find_many(
+                where={"id": {"in": [a for _, _, a in pending.values()]}}
+            )
+        }
+        errors.extend(
+            ImportRowError(line=line, error="Auth type already exists for client")
+            for line, _, auth_id in pending.values()
+            if auth_id not in inserted
+        )
+        return len(inserted)
+
+    return await _run_import(chunks, ClientAuthImportRow, insert_batch)
+
+
+def _keyset(where: dict, after: Optional[str]) -> dict:
+    # `id > after` on an indexed column: pages cost the same at any depth,
+    # unlike OFFSET, and stay stable while rows are inserted
+    return {**where, "id": {"gt": after}} if after else where
+
+
+def _page(items: list, limit: int) -> Tuple[list, Optional[str]]:
+    # One extra row is fetched to know whether another page follows
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].id
+    return items, None
+
+
+async def list_clients(limit: int, after: Optional[str] = None) -> Page[ClientResponse]:
+    db = await get_db()
+    clients, next_cursor = _page(
+        await db.client.find_many(
+            where=_keyset({}, after), order={"id": "asc"}, take=limit + 1
+        ),
+        limit,
+    )
+    return Page[ClientResponse](
+        items=[ClientResponse(id=client.id, name=client.name) for client in clients],
+        next_cursor=next_cursor,
+    )
+
+
+async def list_client_auths(
+    limit: int, after: Optional[str] = None, client_id: Optional[str] = None
+) -> Page[ClientAuthResponse]:
+    db = await get_db()
+    auths, next_cursor = _page(
+        await db.clientauth.find_many(
+            where=_keyset({"clientId": client_id} if client_id else {}, after),
+            order={"id": "asc"},
+            take=limit + 1,
+        ),
+        limit,
+    )
+    # Secrets are never listed
+    return Page[ClientAuthResponse](
+        items=[
+            ClientAuthResponse(
+                id=auth.id,
+                client_id=auth.clientId,
+                auth_type=getattr(auth.authType, "value", auth.authType),
+                scopes=auth.scopes,
+                google_client_id=auth.googleClientId,
+                redirect_uri=auth.redirectUri,
+                created_at=auth.createdAt,
+            )
+            for auth in auths
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+async def list_user_tokens(
+    limit: int, after: Optional[str] = None, client_auth_id: Optional[str] = None
+) -> Page[UserTokenResponse]:
+    db = await get_db()
+    tokens, next_cursor = _page(
+        await db.usertoken.find_many(
+            where=_keyset(
+                {"clientAuthId": client_auth_id} if client_auth_id else {}, after
+            ),
+            order={"id": "asc"},
+            take=limit + 1,
+        ),
+        limit,
+    )
+    # Access and refresh tokens are never listed
+    return Page[UserTokenResponse](
+        items=[
+            UserTokenResponse(
+                id=token.id,
+                google_id=token.googleId,
+                email_address=token.emailAddress,
+                client_auth_id=token.clientAuthId,
+                expiry=token.expiry,
+                watch_expiration=token.watchExpiration,
+                created_at=token.createdAt,
+            )
+            for token in tokens
+        ],
+        next_cursor=next_cursor,
     )
@@ -0,0 +1,105 @@
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel, field_validator
+
+from core.cache.tiered import TieredCache
+from db.prisma.generated.enums import AuthType as PrismaAuthType
+from db.prisma.utils import get_db
+from enums.auth_type import AuthType
+
+logger = logging.getLogger(__name__)
+
+
+class ClientAuthRecord(BaseModel):
+    """Cached `ClientAuth` fields; attribute names match the Prisma model."""
+
+    id: str
+    clientId: str
+    authType: str
+    scopes: List[str]
+    googleClientId: str
+    googleClientSecret: str
+    redirectUri: str
+
+
+class UserTokenRecord(BaseModel):
+    """Cached `UserToken` with its `ClientAuth`; names match the Prisma model."""
+
+    id: str
+    googleId: str
+    accessToken: str
+    refreshToken: Optional[str] = None
+    expiry: datetime
+    clientAuthId: str
+    clientAuth: ClientAuthRecord
+
+    @field_validator("expiry")
+    @classmethod
+    def ensure_utc(cls, value: datetime) -> datetime:
+        # Naive timestamps from the database are UTC
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+client_auth_cache: TieredCache[ClientAuthRecord] = TieredCache(
+    "client_auth", ClientAuthRecord
+)
+user_token_cache: TieredCache[UserTokenRecord] = TieredCache(
+    "user_token", UserTokenRecord
+)
+
+
+def to_client_auth_record(client_auth) -> ClientAuthRecord:
+    return ClientAuthRecord(
+        id=client_auth.id,
+        clientId=client_auth.clientId,
+        authType=getattr(client_auth.authType, "value", client_auth.authType),
+        scopes=client_auth.scopes,
+        googleClientId=client_auth.googleClientId,
+        googleClientSecret=client_auth.googleClientSecret,
+        redirectUri=client_auth.redirectUri,
+    )
+
+
+def to_user_token_record(user_token, client_auth) -> UserTokenRecord:
+    return UserTokenRecord(
+        id=user_token.id,
+        googleId=user_token.googleId,
+        accessToken=user_token.accessToken,
+        refreshToken=user_token.refreshToken,
+        expiry=user_token.expiry,
+        clientAuthId=user_token.clientAuthId,
+        clientAuth=to_client_auth_record(client_auth),
+    )
+
+
+async def get_client_auth(
+    client_id: str, auth_type: AuthType
+) -> Optional[ClientAuthRecord]:
+    async def load() -> Optional[ClientAuthRecord]:
+        db = await get_db()
+        client_auth = await db.clientauth.find_first(
+            where={"clientId": client_id, "authType": PrismaAuthType(auth_type.value)}
+        )
+        return to_client_auth_record(client_auth) if client_auth else None
+
+    return await client_auth_cache.get(f"{client_id}:{auth_type.value}", load)
+
+
+async def get_user_token(user_token_id: str) -> Optional[UserTokenRecord]:
+    async def load() -> Optional[UserTokenRecord]:
+        db = await get_db()
+        user_token = await db.usertoken.find_unique(
+            where={"id": user_token_id}, include={"clientAuth": True}
+        )
+        if not user_token or not user_token.clientAuth:
+            return None
+        return to_user_token_record(user_token, user_token.clientAuth)
+
+    return await user_token_cache.get(user_token_id, load)
+
+
+async def store_user_token(record: UserTokenRecord) -> None:
+    """Publishes a new or refreshed token to every replica."""
+    await user_token_cache.set(record.id, record)
@@ -0,0 +1,407 @@
+import asyncio
+import collections
+import hashlib
+import logging
+import mimetypes
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Iterator, Optional
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.http import MediaIoBaseUpload
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.exceptions import ToolError
+
+from config.settings_config import get_settings
+from core.monitoring import drive_transfer_bytes_counter
+from google_mcp.notifier import ToolNotifier
+from google_mcp.results import compact_result
+from services.auth_service import get_user_credentials
+from services.google_api import (
+    DRIVE_DOWNLOAD,
+    DRIVE_FILES,
+    DRIVE_UPLOAD,
+    call_upstream,
+    execute,
+    is_upstream_failure,
+)
+from services.google_client import build_google_service, match_endpoint_scheme
+
+logger = logging.getLogger(__name__)
+
+FILE_FIELDS = "id,name,mimeType,size,md5Checksum"
+# Fields of compact (non-verbose) tool results
+TRANSFER_RESULT_FIELDS = ("success", "file_id", "path", "size_bytes")
+# Attempts per chunk after a retryable upstream failure
+CHUNK_RETRIES = 3
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+def resolve_transfer_path(path: str) -> Path:
+    """Resolves `path` inside `drive_transfer_dir`, rejecting escapes."""
+    root = get_settings().drive_transfer_dir
+    if root is None:
+        raise ValueError("Drive transfers are disabled: DRIVE_TRANSFER_DIR is not set")
+
+    root = root.resolve()
+    target = (root / path).resolve()
+    if not target.is_relative_to(root) or target == root:
+        raise ValueError(f"Path must name a file inside the transfer directory: {path}")
+    return target
+
+
+async def upload_file(
+    creds: Credentials,
+    client_auth_id: str,
+    source: Path,
+    name: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    mime_type: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> dict[str, Any]:
+    """
+    Uploads a local file with a resumable upload session, one
+    `drive_chunk_size_bytes` request at a time.
+
+    Only the chunk in flight is held in memory, whatever the file size.
+
+    Returns:
+        The created Drive file resource (`FILE_FIELDS`)
+    """
+    chunk_size = get_settings().drive_chunk_size_bytes
+    total = source.stat().st_size
+    mime_type = (
+        mime_type or mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+    )
+    metadata: dict[str, Any] = {"name": name or source.name}
+    if folder_id:
+        metadata["parents"] = [folder_id]
+
+    service = build_google_service("drive", "v3", creds)
+    with source.open("rb") as stream:
+        media = MediaIoBaseUpload(
+            stream, mimetype=mime_type, chunksize=chunk_size, resumable=True
+        )
+        request = service.files().create(
+            body=metadata,
+            media_body=media,
+            fields=FILE_FIELDS,
+            supportsAllDrives=True,
+        )
+        request.uri = match_endpoint_scheme(request.uri)
+
+        response = None
+        uploaded = 0
+        failures = 0
+        while response is None:
+            # googleapiclient's own chunk retries resend an exhausted stream
+            # slice, so retry here: after a failure `next_chunk` asks the
+            # session for the acknowledged offset and resumes from there
+            try:
+                status, response = await call_upstream(
+                    DRIVE_UPLOAD, client_auth_id, request.next_chunk
+                )
+            except Exception as e:
+                failures += 1
+                if failures > CHUNK_RETRIES or not is_upstream_failure(e):
+                    raise
+                logger.warning(
+                    f"Drive upload chunk failed, resuming: {type(e).__name__}: {e}",
+                    extra={"uploaded": uploaded, "attempt": failures},
+                )
+                await asyncio.sleep(min(2**failures, 30))
+                continue
+            failures = 0
+
+            progress = status.resumable_progress if status else total
+            drive_transfer_bytes_counter.labels(direction="upload").inc(
+                progress - uploaded
+            )
+            uploaded = progress
+            if on_progress:
+                await on_progress(uploaded, total)
+
+    return response
+
+
+def _write_chunk(out: Any, digest: Any, data: bytes) -> None:
+    out.write(data)
+    digest.update(data)
+
+
+async def get_file_metadata(
+    creds: Credentials, client_auth_id: str, file_id: str
+) -> dict[str, Any]:
+    service = build_google_service("drive", "v3", creds)
+    return await execute(
+        service.files().get(fileId=file_id, fields=FILE_FIELDS, supportsAllDrives=True),
+        DRIVE_FILES,
+        client_auth_id,
+    )
+
+
+async def download_file(
+    creds: Credentials,
+    client_auth_id: str,
+    metadata: dict[str, Any],
+    target: Path,
+    on_progress: Optional[ProgressCallback] = None,
+) -> dict[str, Any]:
+    """
+    Downloads a binary file with ranged `alt=media` requests of
+    `drive_chunk_size_bytes`.
+
+    Up to `drive_download_prefetch` ranges are fetched in parallel (each
+    fetcher owns a client, as httplib2 connections are not thread-safe) while
+    completed ranges are written in order, so memory stays bounded by
+    prefetch × chunk size. The file is written next to `target` and moved into
+    place once complete and its MD5 checksum matches.
+
+    Returns:
+        `metadata` with the verified `md5Checksum`
+    """
+    settings = get_settings()
+    file_id = metadata["id"]
+    if "size" not in metadata:
+        raise ValueError(
+            f"File {file_id} ({metadata.get('mimeType')}) has no binary content; "
+            "Google Workspace documents must be exported"
+        )
+    total = int(metadata["size"])
+    chunk_size = settings.drive_chunk_size_bytes
+
+    # Idle clients, one per fetch that may be in flight
+    prefetch = max(1, min(settings.drive_download_prefetch, -(-total // chunk_size)))
+    clients: asyncio.Queue = asyncio.Queue()
+    for _ in range(prefetch):
+        clients.put_nowait(build_google_service("drive", "v3", creds))
+
+    async def fetch(start: int) -> bytes:
+        end = min(start + chunk_size, total) - 1
+        service = await clients.get()
+        try:
+            request = service.files().get_media(fileId=file_id, supportsAllDrives=True)
+            request.headers["Range"] = f"bytes={start}-{end}"
+            # Ranged GETs can use googleapiclient's retries with backoff
+            data = await call_upstream(
+                DRIVE_DOWNLOAD, client_auth_id, request.execute, None, CHUNK_RETRIES
+            )
+        finally:
+            clients.put_nowait(service)
+        if len(data) != end - start + 1:
+            raise IOError(
+                f"Range {start}-{end} of {file_id} returned {len(data)} bytes"
+            )
+        return data
+
+    offsets: Iterator[int] = iter(range(0, total, chunk_size))
+    window: Deque[asyncio.Task] = collections.deque()
+
+    def schedule() -> None:
+        for start in offsets:
+            window.append(asyncio.create_task(fetch(start)))
+            return
+
+    partial = target.with_name(f".{target.name}.part")
+    digest = hashlib.md5()
+    written = 0
+    try:
+        with partial.open("wb") as out:
+            for _ in range(prefetch):
+                schedule()
+            while window:
+                data = await window.popleft()
+                # Keep the window full while this chunk is written
+                schedule()
+                await asyncio.to_thread(_write_chunk, out, digest, data)
+                written += len(data)
+                drive_transfer_bytes_counter.labels(direction="download").inc(len(data))
+                if on_progress:
+                    await on_progress(written, total)
+
+        expected = metadata.get("md5Checksum")
+        if expected and digest.hexdigest() != expected:
+            raise IOError(f"Checksum mismatch for {file_id}")
+        os.replace(partial, target)
+    except BaseException:
+        for task in window:
+            task.cancel()
+        await asyncio.gather(*window, return_exceptions=True)
+        partial.unlink(missing_ok=True)
+        raise
+
+    return {**metadata, "md5Checksum": digest.hexdigest()}
+
+
+def _transfer_stats(size: int, elapsed: float) -> dict[str, Any]:
+    return {
+        "size_bytes": size,
+        "elapsed_seconds": round(elapsed, 3),
+        "megabytes_per_second": (
+            round(size / elapsed / 1024 / 1024, 2) if elapsed > 0 else 0.0
+        ),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def upload_drive_file_mcp(
+    drive_user_id: str,
+    path: str,
+    mcp_ctx: Context,
+    name: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    mime_type: Optional[str] = None,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Uploads a file from the transfer directory to Google Drive.
+
+    Args:
+        drive_user_id: User identifier for OAuth credentials
+        path: File path relative to `drive_transfer_dir`
+        mcp_ctx: MCP context for logging and progress reporting
+        name: Drive file name; defaults to the local file name
+        folder_id: Optional parent folder id
+        mime_type: Content type; guessed from the file name if omitted
+        verbose: Include the Drive file resource and transfer statistics
+
+    Returns:
+        Dict containing success status, the file id, path and size, plus the
+        Drive file and transfer statistics when verbose
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        await notifier.info("Starting Drive upload", path=path)
+
+        try:
+            source = resolve_transfer_path(path)
+            if not source.is_file():
+                raise ValueError(f"File not found: {path}")
+
+            creds, client_auth_id = await get_user_credentials(drive_user_id)
+
+            async def on_progress(uploaded: int, total: int) -> None:
+                await notifier.progress(
+                    progress=uploaded,
+                    total=total,
+                    message=f"Uploaded {uploaded}/{total} bytes",
+                )
+
+            started = time.perf_counter()
+            file = await upload_file(
+                creds,
+                client_auth_id,
+                source,
+                name=name,
+                folder_id=folder_id,
+                mime_type=mime_type,
+                on_progress=on_progress,
+            )
+            stats = _transfer_stats(
+                source.stat().st_size, time.perf_counter() - started
+            )
+            await notifier.info(
+                "Drive upload done: file_id=%s, %.2f MB/s",
+                file.get("id"),
+                stats["megabytes_per_second"],
+                file_id=file.get("id"),
+                **stats,
+            )
+
+            result = {
+                "success": True,
+                "file_id": file.get("id"),
+                "path": path,
+                "file": file,
+                **stats,
+            }
+            return result if verbose else compact_result(result, TRANSFER_RESULT_FIELDS)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Drive upload failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
+
+
+async def download_drive_file_mcp(
+    drive_user_id: str,
+    file_id: str,
+    mcp_ctx: Context,
+    path: Optional[str] = None,
+    overwrite: bool = False,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Downloads a binary Google Drive file into the transfer directory.
+
+    Args:
+        drive_user_id: User identifier for OAuth credentials
+        file_id: Drive file id
+        mcp_ctx: MCP context for logging and progress reporting
+        path: Target path relative to `drive_transfer_dir`; defaults to the
+            Drive file name
+        overwrite: Replace an existing local file
+        verbose: Include the Drive file resource and transfer statistics
+
+    Returns:
+        Dict containing success status, the file id, the local path and size,
+        plus the Drive file and transfer statistics when verbose
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        await notifier.info("Starting Drive download", file_id=file_id)
+
+        try:
+            creds, client_auth_id = await get_user_credentials(drive_user_id)
+            metadata = await get_file_metadata(creds, client_auth_id, file_id)
+
+            path = path or Path(metadata["name"]).name
+            target = resolve_transfer_path(path)
+            if target.exists() and not overwrite:
+                raise ValueError(f"File already exists: {path}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            async def on_progress(written: int, total: int) -> None:
+                await notifier.progress(
+                    progress=written,
+                    total=total,
+                    message=f"Downloaded {written}/{total} bytes",
+                )
+
+            started = time.perf_counter()
+            file = await download_file(
+                creds, client_auth_id, metadata, target, on_progress=on_progress
+            )
+            stats = _transfer_stats(int(file["size"]), time.perf_counter() - started)
+            await notifier.info(
+                "Drive download done: file_id=%s, %.2f MB/s",
+                file_id,
+                stats["megabytes_per_second"],
+                file_id=file_id,
+                **stats,
+            )
+
+            result = {
+                "success": True,
+                "file_id": file_id,
+                "path": path,
+                "file": file,
+                **stats,
+            }
+            return result if verbose else compact_result(result, TRANSFER_RESULT_FIELDS)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Drive download failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
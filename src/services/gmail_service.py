@@ -1,17 +1,196 @@
+import asyncio
 import base64
 import logging
-import re
+import time
 from datetime import datetime, timezone
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ToolError
+from pydantic import EmailStr, TypeAdapter, ValidationError
 
-from services.auth_service import get_creds
+from config.settings_config import get_settings
+from google_mcp.notifier import ToolNotifier
+from google_mcp.results import compact_result
+from services.auth_service import get_user_credentials
+from services.google_api import (
+    GMAIL_GET,
+    GMAIL_LABELS,
+    GMAIL_LIST,
+    GMAIL_MODIFY,
+    GMAIL_SEND,
+    execute,
+)
+from services.google_client import build_google_service
+from services.idempotency import fingerprint, idempotency_store
+from services.mail_template import compile_template, is_html
+from services.message_cache import (
+    cache_message,
+    get_cached_message,
+    immutable_content,
+    invalidate_messages,
+)
+from services.write_behind import write_behind
 
 logger = logging.getLogger(__name__)
 
+# Gmail API limits
+LIST_PAGE_SIZE = 500
+BATCH_MODIFY_MAX_IDS = 1000
+
+SEND_IDEMPOTENCY_SCOPE = "send_gmail"
+
+# Validates whole recipient lists in one call (built once, at import)
+EMAIL_LIST_ADAPTER = TypeAdapter(List[EmailStr])
+
+# Fields of compact (non-verbose) tool results
+SEND_RESULT_FIELDS = (
+    "success",
+    "message_id",
+    "total_recipients",
+    "duplicates_removed",
+    "message_ids",
+    "messages",
+    "moved_to_bcc",
+    "failed_recipients",
+    "errors",
+    "idempotent_replay",
+)
+MERGE_RESULT_FIELDS = (
+    "success",
+    "sent",
+    "failed",
+    "elapsed_seconds",
+    "messages_per_second",
+    "failures",
+)
+MODIFY_RESULT_FIELDS = ("success", "modified")
+READ_RESULT_FIELDS = ("success", "messages", "errors", "cached")
+
+# Label ids that need no lookup (user labels are `Label_<n>`)
+SYSTEM_LABEL_IDS = {
+    "INBOX",
+    "UNREAD",
+    "STARRED",
+    "IMPORTANT",
+    "SPAM",
+    "TRASH",
+    "CATEGORY_PERSONAL",
+    "CATEGORY_SOCIAL",
+    "CATEGORY_PROMOTIONS",
+    "CATEGORY_UPDATES",
+    "CATEGORY_FORUMS",
+}
+
+
+def has_line_break(value: str) -> bool:
+    """Header values with CR/LF could add headers (e.g. `Bcc:`) to a message."""
+    return "\r" in value or "\n" in value
+
+
+def build_raw_message(
+    to: List[str],
+    subject: str,
+    body: str,
+    cc: Optional[List[str]] = None,
+    bcc: Optional[List[str]] = None,
+) -> str:
+    """Builds an RFC 5322 message, base64url-encoded for `messages.send`."""
+    message_parts = []
+
+    # Add To header (fan-out copies may be BCC-only)
+    if to:
+        message_parts.append(f"To: {', '.join(to)}")
+
+    # Add CC header if provided
+    if cc:
+        message_parts.append(f"Cc: {', '.join(cc)}")
+
+    # Add BCC header if provided (note: BCC won't be visible in sent email)
+    if bcc:
+        message_parts.append(f"Bcc: {', '.join(bcc)}")
+
+    # Add subject
+    message_parts.append(f"Subject: {subject}")
+
+    # Detect if body contains HTML
+    if is_html(body):
+        message_parts.append("Content-Type: text/html; charset=utf-8")
+    else:
+        message_parts.append("Content-Type: text/plain; charset=utf-8")
+
+    # Add empty line before body (RFC 5322 requirement)
+    message_parts.append("")
+    message_parts.append(body)
+
+    # Join all parts with CRLF line endings
+    message = "\r\n".join(message_parts)
+
+    # Encode message for Gmail API
+    return base64.urlsafe_b64encode(message.encode("utf-8")).decode("ascii")
+
+
+def prepare_recipients(
+    to: List[str], cc: Optional[List[str]] = None, bcc: Optional[List[str]] = None
+) -> Tuple[List[str], List[str], List[str], int]:
+    """
+    De-duplicates to/cc/bcc case-insensitively, keeping each address in its
+    most visible field (to, then cc, then bcc), and validates all addresses in
+    one pass. Returns the three lists and the number of duplicates dropped.
+    """
+    seen: set = set()
+    fields: List[List[str]] = []
+    given = 0
+    for addresses in (to, cc or [], bcc or []):
+        unique = []
+        for address in addresses:
+            given += 1
+            address = address.strip()
+            if address.lower() not in seen:
+                seen.add(address.lower())
+                unique.append(address)
+        fields.append(unique)
+
+    flat = [address for field in fields for address in field]
+    try:
+        valid = EMAIL_LIST_ADAPTER.validate_python(flat)
+    except ValidationError as e:
+        invalid = list(dict.fromkeys(flat[error["loc"][0]] for error in e.errors()))
+        shown = ", ".join(repr(address) for address in invalid[:10])
+        more = f" and {len(invalid) - 10} more" if len(invalid) > 10 else ""
+        raise ValueError(f"Invalid email address(es): {shown}{more}")
+
+    to_count, cc_count = len(fields[0]), len(fields[1])
+    return (
+        valid[:to_count],
+        valid[to_count : to_count + cc_count],
+        valid[to_count + cc_count :],
+        given - len(flat),
+    )
+
+
+def plan_recipient_chunks(
+    to: List[str], cc: List[str], bcc: List[str], limit: int
+) -> List[Tuple[List[str], List[str], List[str]]]:
+    """
+    Splits recipients into `(to, cc, bcc)` messages of at most `limit`
+    recipients. The first message keeps the to/cc recipients that fit and is
+    topped up with bcc; everyone else gets BCC-only copies.
+    """
+    if len(to) + len(cc) + len(bcc) <= limit:
+        return [(to, cc, bcc)]
+
+    first_to = to[:limit]
+    first_cc = cc[: limit - len(first_to)]
+    room = limit - len(first_to) - len(first_cc)
+    # Visible recipients that do not fit are moved to BCC
+    overflow = to[len(first_to) :] + cc[len(first_cc) :] + bcc
+    chunks = [(first_to, first_cc, overflow[:room])]
+    for start in range(room, len(overflow), limit):
+        chunks.append(([], [], overflow[start : start + limit]))
+    return chunks
+
 
 async def send_gmail_mcp(
     gmail_user_id: str,
@@ -21,10 +200,17 @@ async def send_gmail_mcp(
     mcp_ctx: Context,
     cc: Optional[List[str]] = None,
     bcc: Optional[List[str]] = None,
+    idempotency_key: Optional[str] = None,
+    verbose: bool = False,
 ) -> dict[str, Any]:
     """
     Send an email via Gmail API using stored OAuth credentials.
 
+    Recipients are de-duplicated and validated up front. Sets larger than
+    `gmail_max_recipients_per_message` are fanned out into several messages
+    (see `plan_recipient_chunks`), sent by `gmail_fanout_concurrency` workers
+    that each own a Gmail client.
+
     Args:
         gmail_user_id: User identifier for OAuth credentials
         to: List of primary recipient email addresses
@@ -33,149 +219,671 @@ async def send_gmail_mcp(
         mcp_ctx: MCP context for logging and progress reporting
         cc: Optional list of CC recipient email addresses
         bcc: Optional list of BCC recipient email addresses
+        idempotency_key: Optional key; repeats with the same key return the
+            stored result instead of sending again (per message when fanned
+            out, so a retry only sends the messages that failed)
+        verbose: Include the subject, timestamp and recipient lists
 
     Returns:
-        Dict containing success status, message ID, timestamp, and recipient summary
+        Dict containing success status, message ID(s) and recipient counts,
+        plus timestamp and recipient summary when verbose
     """
-    await mcp_ctx.info(
-        f"Starting email send (request_id={mcp_ctx.request_id}, client_id={mcp_ctx.client_id})"
-    )
-    logger.info(
-        "Starting email send",
-        extra={
-            "request_id": mcp_ctx.request_id,
-            "client_id": mcp_ctx.client_id,
-            "to_count": len(to),
-            "cc_count": len(cc) if cc else 0,
-            "bcc_count": len(bcc) if bcc else 0,
-        },
-    )
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        await notifier.info(
+            "Starting email send",
+            to_count=len(to),
+            cc_count=len(cc) if cc else 0,
+            bcc_count=len(bcc) if bcc else 0,
+        )
 
-    try:
-        # Validate inputs
-        if not to:
-            raise ValueError("At least one recipient in 'to' field is required")
+        try:
+            to, cc, bcc, duplicates = prepare_recipients(to, cc, bcc)
+            # Validate inputs
+            if not to:
+                raise ValueError("At least one recipient in 'to' field is required")
+            if has_line_break(subject):
+                raise ValueError("Subject must not contain line breaks")
 
-        creds = await get_creds(gmail_user_id)
-        await mcp_ctx.info(
-            f"Retrieved user credentials (request_id={mcp_ctx.request_id}, client_id={mcp_ctx.client_id})"
-        )
-        logger.info(
-            "Retrieved user credentials",
-            extra={
-                "request_id": mcp_ctx.request_id,
-                "client_id": mcp_ctx.client_id,
-            },
-        )
+            settings = get_settings()
+            chunks = plan_recipient_chunks(
+                to, cc, bcc, settings.gmail_max_recipients_per_message
+            )
+            total = len(chunks)
+            if total > 1:
+                await notifier.info(
+                    "Fanning out %d recipients into %d messages",
+                    len(to) + len(cc) + len(bcc),
+                    total,
+                    messages=total,
+                )
 
-        service = build("gmail", "v1", credentials=creds)
-        await mcp_ctx.info("Built Gmail service client")
+            creds, client_auth_id = await get_user_credentials(gmail_user_id)
+            await notifier.info("Retrieved user credentials")
+            outcomes: List[dict] = [{}] * total
+            pending = iter(enumerate(chunks))
+            done = 0
 
-        # Build email message with proper RFC 5322 formatting
-        message_parts = []
+            async def worker() -> None:
+                nonlocal done
+                # One client per worker: httplib2 connections are not thread-safe
+                service = build_google_service("gmail", "v1", creds)
+                for index, (chunk_to, chunk_cc, chunk_bcc) in pending:
 
-        # Add To header
-        message_parts.append(f"To: {', '.join(to)}")
+                    async def deliver() -> dict[str, Any]:
+                        raw = build_raw_message(
+                            chunk_to, subject, body, cc=chunk_cc, bcc=chunk_bcc
+                        )
+                        sent = await execute(
+                            service.users()
+                            .messages()
+                            .send(userId="me", body={"raw": raw}),
+                            GMAIL_SEND,
+                            client_auth_id,
+                        )
+                        write_behind.add_send_audit(
+                            gmail_user_id,
+                            "send_gmail",
+                            sent.get("id"),
+                            len(chunk_to) + len(chunk_cc) + len(chunk_bcc),
+                            idempotency_key,
+                        )
+                        return {"message_id": sent.get("id")}
 
-        # Add CC header if provided
-        if cc:
-            message_parts.append(f"Cc: {', '.join(cc)}")
+                    try:
+                        if not idempotency_key:
+                            outcome = await deliver()
+                        else:
+                            # A single message keeps the key of unchunked sends
+                            key = f"{gmail_user_id}:{idempotency_key}"
+                            outcome, replayed = await idempotency_store.run(
+                                SEND_IDEMPOTENCY_SCOPE,
+                                key if total == 1 else f"{key}:{index}",
+                                fingerprint(
+                                    chunk_to, chunk_cc, chunk_bcc, subject, body
+                                ),
+                                deliver,
+                            )
+                            outcome = {**outcome, "idempotent_replay": replayed}
+                    except Exception as e:
+                        if total == 1:
+                            raise
+                        outcome = {"error": str(e)}
+                    outcomes[index] = outcome
 
-        # Add BCC header if provided (note: BCC won't be visible in sent email)
-        if bcc:
-            message_parts.append(f"Bcc: {', '.join(bcc)}")
+                    done += 1
+                    await notifier.progress(
+                        progress=done, total=total, message=f"Sent {done}/{total}"
+                    )
 
-        # Add subject
-        message_parts.append(f"Subject: {subject}")
+            await asyncio.gather(
+                *(
+                    worker()
+                    for _ in range(min(settings.gmail_fanout_concurrency, total))
+                )
+            )
 
-        # Detect if body contains HTML
-        is_html = bool(re.search(r"<[^>]+>", body))
-        if is_html:
-            message_parts.append("Content-Type: text/html; charset=utf-8")
-        else:
-            message_parts.append("Content-Type: text/plain; charset=utf-8")
+            sent = [outcome for outcome in outcomes if "error" not in outcome]
+            failed = [
+                (index, chunk, outcome["error"])
+                for index, (chunk, outcome) in enumerate(zip(chunks, outcomes))
+                if "error" in outcome
+            ]
+            if not sent:
+                raise RuntimeError(failed[0][2])
+            message_ids = [outcome.get("message_id") for outcome in sent]
+            await notifier.info(
+                "Email sent successfully, messageId=%s (%d/%d messages)",
+                message_ids[0],
+                len(sent),
+                total,
+                message_id=message_ids[0],
+            )
 
-        # Add empty line before body (RFC 5322 requirement)
-        message_parts.append("")
-        message_parts.append(body)
+            result: dict[str, Any] = {
+                "success": not failed,
+                "message_id": message_ids[0],
+                "subject": subject,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "recipients": {"to": to, "cc": cc, "bcc": bcc},
+                "total_recipients": len(to) + len(cc) + len(bcc),
+                "duplicates_removed": duplicates,
+            }
+            if total > 1:
+                first_to, first_cc, _ = chunks[0]
+                result["message_ids"] = message_ids
+                result["messages"] = total
+                result["moved_to_bcc"] = (
+                    len(to) + len(cc) - len(first_to) - len(first_cc)
+                )
+                result["failed_recipients"] = sum(
+                    sum(map(len, chunk)) for _, chunk, _ in failed
+                )
+                result["errors"] = [
+                    {"message": index, "recipients": sum(map(len, chunk)), "error": e}
+                    for index, chunk, e in failed
+                ]
+            # Nothing was sent again: every message was a stored result
+            if all(outcome.get("idempotent_replay") for outcome in sent):
+                await notifier.info(
+                    "Duplicate send suppressed, idempotency_key=%s",
+                    idempotency_key,
+                )
+                result["idempotent_replay"] = True
+            return result if verbose else compact_result(result, SEND_RESULT_FIELDS)
 
-        # Join all parts with CRLF line endings
-        message = "\r\n".join(message_parts)
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
 
-        # Encode message for Gmail API
-        raw = base64.urlsafe_b64encode(message.encode("utf-8")).decode("ascii")
+        except Exception as e:
+            error_msg = f"Gmail send failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
 
-        # Report progress at 50%
-        await mcp_ctx.report_progress(
-            progress=50, total=100, message="Calling Gmail API"
-        )
 
-        # Send the message
-        request_body = {"raw": raw}
-        sent = service.users().messages().send(userId="me", body=request_body).execute()
+def _render_merge_rows(
+    subject_template: str, body_template: str, recipients: List[Dict[str, Any]]
+) -> Iterator[Tuple[int, str, Optional[Tuple[str, str]], Optional[str]]]:
+    """
+    Lazily renders each recipient record, yielding
+    `(index, email, (subject, body) or None, error or None)`.
+    """
+    subject_tpl = compile_template(subject_template)
+    # Variable values are escaped in HTML bodies
+    body_tpl = compile_template(body_template, escape=is_html(body_template))
 
-        message_id = sent.get("id")
-        timestamp = datetime.now(timezone.utc).isoformat()
+    for index, record in enumerate(recipients):
+        email = str(record.get("email") or "").strip()
+        if not email:
+            yield index, email, None, "Missing 'email'"
+            continue
+        try:
+            (email,) = EMAIL_LIST_ADAPTER.validate_python([email])
+        except ValidationError:
+            yield index, email, None, f"Invalid email address: {email!r}"
+            continue
+        try:
+            subject = subject_tpl.render(record)
+            body = body_tpl.render(record)
+        except KeyError as e:
+            yield index, email, None, f"Missing variable: {e.args[0]}"
+            continue
+        # Variables are inserted verbatim, so a value may break the header
+        if has_line_break(subject):
+            yield index, email, None, "Rendered subject contains a line break"
+            continue
+        yield index, email, (subject, body), None
 
-        await mcp_ctx.info(
-            f"Email sent successfully, messageId={message_id} (request_id={mcp_ctx.request_id}, client_id={mcp_ctx.client_id})"
-        )
-        logger.info(
-            f"Email sent successfully, messageId={message_id}",
-            extra={
-                "request_id": mcp_ctx.request_id,
-                "client_id": mcp_ctx.client_id,
-                "message_id": message_id,
-            },
-        )
 
-        # Report completion at 100%
-        await mcp_ctx.report_progress(
-            progress=100, total=100, message="Email sent successfully"
-        )
+def merge_result(
+    rows: List[Optional[dict]], elapsed: float, verbose: bool = False
+) -> dict[str, Any]:
+    """
+    Mail merge tool result: counts and throughput, with the failed rows, or
+    with every row when verbose.
+    """
+    sent = sum(1 for row in rows if row is not None and row["success"])
+    failed = len(rows) - sent
+    result: dict[str, Any] = {
+        "success": failed == 0,
+        "sent": sent,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "messages_per_second": round(sent / elapsed, 2) if elapsed > 0 else 0.0,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    if verbose:
+        return {**result, "results": rows}
+    result["failures"] = [
+        {k: row[k] for k in ("index", "email", "error")}
+        for row in rows
+        if row is not None and not row["success"]
+    ]
+    return compact_result(result, MERGE_RESULT_FIELDS)
 
-        # Build recipient summary for response
-        recipients_summary = {
-            "to": to,
-            "cc": cc if cc else [],
-            "bcc": bcc if bcc else [],
-        }
-
-        return {
-            "success": True,  # Return boolean instead of string
-            "subject": subject,
-            "timestamp": timestamp,
-            "recipients": recipients_summary,
-            "total_recipients": len(to)
-            + (len(cc) if cc else 0)
-            + (len(bcc) if bcc else 0),
-        }
-
-    except ValueError as ve:
-        error_msg = f"Invalid input: {ve}"
-        await mcp_ctx.error(
-            f"{error_msg} (request_id={mcp_ctx.request_id}, client_id={mcp_ctx.client_id})"
-        )
-        logger.error(
-            error_msg,
-            extra={
-                "request_id": mcp_ctx.request_id,
-                "client_id": mcp_ctx.client_id,
-            },
-        )
-        raise ToolError(error_msg)
 
-    except Exception as e:
-        error_msg = f"Gmail send failed: {str(e)}"
-        await mcp_ctx.error(
-            f"{error_msg} (request_id={mcp_ctx.request_id}, client_id={mcp_ctx.client_id})"
+async def send_gmail_merge_mcp(
+    gmail_user_id: str,
+    subject_template: str,
+    body_template: str,
+    recipients: List[Dict[str, Any]],
+    mcp_ctx: Context,
+    idempotency_key: Optional[str] = None,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Sends one templated email per recipient record (mail merge).
+
+    The templates are compiled once; rows are rendered as they are sent, by
+    `gmail_merge_concurrency` workers that each own a Gmail client (httplib2
+    connections are not thread-safe).
+
+    Args:
+        gmail_user_id: User identifier for OAuth credentials
+        subject_template: Subject with `{{ variable }}` placeholders
+        body_template: Body (plain text or HTML) with `{{ variable }}` placeholders
+        recipients: Records with an `email` key plus the template variables
+        mcp_ctx: MCP context for logging and progress reporting
+        idempotency_key: Optional key; retrying the merge with the same key
+            only sends the rows that did not succeed before
+        verbose: Return one result per recipient row instead of the failed
+            rows only
+
+    Returns:
+        Dict containing overall success, sent/failed counts, throughput and
+        the failed rows (or all rows when verbose)
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        total = len(recipients)
+        await notifier.info("Starting mail merge", total=total)
+
+        try:
+            if not recipients:
+                raise ValueError("At least one recipient record is required")
+            if total > get_settings().gmail_merge_max_recipients:
+                raise ValueError(
+                    f"At most {get_settings().gmail_merge_max_recipients} "
+                    "recipients per merge"
+                )
+
+            creds, client_auth_id = await get_user_credentials(gmail_user_id)
+            rows = _render_merge_rows(subject_template, body_template, recipients)
+            results: List[Optional[dict]] = [None] * total
+            sent = 0
+
+            async def send_row(
+                service: Any, email: str, subject: str, body: str
+            ) -> dict[str, Any]:
+                response = await execute(
+                    service.users()
+                    .messages()
+                    .send(
+                        userId="me",
+                        body={"raw": build_raw_message([email], subject, body)},
+                    ),
+                    GMAIL_SEND,
+                    client_auth_id,
+                )
+                return {"message_id": response.get("id")}
+
+            async def worker() -> None:
+                nonlocal sent
+                service = build_google_service("gmail", "v1", creds)
+                # Rendering is synchronous, so workers can share the iterator
+                for index, email, rendered, error in rows:
+                    row: dict[str, Any] = {"index": index, "email": email}
+                    if rendered is None:
+                        results[index] = {**row, "success": False, "error": error}
+                        continue
+                    subject, body = rendered
+
+                    async def deliver() -> dict[str, Any]:
+                        outcome = await send_row(service, email, subject, body)
+                        write_behind.add_send_audit(
+                            gmail_user_id,
+                            "send_gmail_merge",
+                            outcome["message_id"],
+                            1,
+                            idempotency_key,
+                        )
+                        return outcome
+
+                    try:
+                        if idempotency_key:
+                            outcome, replayed = await idempotency_store.run(
+                                SEND_IDEMPOTENCY_SCOPE,
+                                f"{gmail_user_id}:{idempotency_key}:{index}",
+                                fingerprint([email], [], [], subject, body),
+                                deliver,
+                            )
+                            if replayed:
+                                outcome = {**outcome, "idempotent_replay": True}
+                        else:
+                            outcome = await deliver()
+                        results[index] = {**row, "success": True, **outcome}
+                        sent += 1
+                    except Exception as e:
+                        results[index] = {**row, "success": False, "error": str(e)}
+
+                    await notifier.progress(
+                        progress=sent, total=total, message=f"Sent {sent}/{total}"
+                    )
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    worker()
+                    for _ in range(min(get_settings().gmail_merge_concurrency, total))
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+            failed = total - sent
+            messages_per_second = round(sent / elapsed, 2) if elapsed > 0 else 0.0
+            await notifier.info(
+                "Mail merge done: %d sent, %d failed, %.2f msg/s",
+                sent,
+                failed,
+                messages_per_second,
+                sent=sent,
+                failed=failed,
+                messages_per_second=messages_per_second,
+            )
+
+            return merge_result(results, elapsed, verbose)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Gmail merge failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
+
+
+async def read_gmail_messages_mcp(
+    gmail_user_id: str,
+    message_ids: List[str],
+    mcp_ctx: Context,
+    message_format: str = "full",
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Reads messages by id, from the message content cache where possible.
+
+    Message content never changes once delivered, so fetched messages are
+    cached (without their labels) until evicted, deleted or trashed. The
+    rest are fetched by `gmail_read_concurrency` workers that each own a
+    Gmail client.
+
+    Args:
+        gmail_user_id: User identifier for OAuth credentials
+        message_ids: Gmail message ids to read
+        mcp_ctx: MCP context for logging and progress reporting
+        message_format: Gmail format: 'full', 'metadata' (headers only) or
+            'raw' (the RFC 2822 message, attachments included)
+        verbose: Include the format and a timestamp
+
+    Returns:
+        Dict containing the messages in request order, the ids that could not
+        be read with reasons and how many messages came from the cache
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        # Ordered and de-duplicated
+        message_ids = list(dict.fromkeys(i.strip() for i in message_ids))
+        await notifier.info("Starting message read", total=len(message_ids))
+
+        try:
+            if not message_ids:
+                raise ValueError("At least one message id is required")
+            max_messages = get_settings().gmail_read_max_messages
+            if len(message_ids) > max_messages:
+                raise ValueError(f"At most {max_messages} messages per read")
+
+            messages: Dict[str, dict] = {}
+            for message_id in message_ids:
+                cached = await get_cached_message(
+                    gmail_user_id, message_id, message_format
+                )
+                if cached is not None:
+                    messages[message_id] = cached
+            cached_count = len(messages)
+
+            errors: Dict[str, str] = {}
+            missing = iter([i for i in message_ids if i not in messages])
+            if cached_count < len(message_ids):
+                creds, client_auth_id = await get_user_credentials(gmail_user_id)
+
+                async def worker() -> None:
+                    service = build_google_service("gmail", "v1", creds)
+                    for message_id in missing:
+                        try:
+                            message = await execute(
+                                service.users()
+                                .messages()
+                                .get(userId="me", id=message_id, format=message_format),
+                                GMAIL_GET,
+                                client_auth_id,
+                            )
+                        except HttpError as e:
+                            errors[message_id] = (
+                                "notFound" if e.resp.status == 404 else str(e)
+                            )
+                            continue
+                        messages[message_id] = immutable_content(message)
+                        await cache_message(
+                            gmail_user_id,
+                            message_id,
+                            message_format,
+                            messages[message_id],
+                        )
+                        await notifier.progress(
+                            progress=len(messages),
+                            total=len(message_ids),
+                            message=f"Read {len(messages)}/{len(message_ids)}",
+                        )
+
+                workers = min(
+                    get_settings().gmail_read_concurrency,
+                    len(message_ids) - cached_count,
+                )
+                try:
+                    # A failure cancels the other workers
+                    async with asyncio.TaskGroup() as group:
+                        for _ in range(workers):
+                            group.create_task(worker())
+                except ExceptionGroup as eg:
+                    raise eg.exceptions[0]
+
+            await notifier.info(
+                "Read %d messages (%d cached), %d failed",
+                len(messages),
+                cached_count,
+                len(errors),
+                cached=cached_count,
+                failed=len(errors),
+            )
+
+            result = {
+                "success": not errors,
+                "format": message_format,
+                "messages": [messages[i] for i in message_ids if i in messages],
+                "errors": errors,
+                "cached": cached_count,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            return result if verbose else compact_result(result, READ_RESULT_FIELDS)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Gmail read failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
+
+
+async def iter_message_id_pages(
+    service: Any, client_auth_id: str, query: str, limit: int
+) -> AsyncIterator[List[str]]:
+    """Yields the ids of messages matching `query`, one result page at a time."""
+    page_token: Optional[str] = None
+    remaining = limit
+
+    while remaining > 0:
+        page = await execute(
+            service.users()
+            .messages()
+            .list(
+                userId="me",
+                q=query,
+                maxResults=min(LIST_PAGE_SIZE, remaining),
+                pageToken=page_token,
+                fields="messages/id,nextPageToken",
+            ),
+            GMAIL_LIST,
+            client_auth_id,
         )
-        logger.error(
-            error_msg,
-            extra={
-                "request_id": mcp_ctx.request_id,
-                "client_id": mcp_ctx.client_id,
-                "error_type": type(e).__name__,
-            },
+        ids = [message["id"] for message in page.get("messages", [])][:remaining]
+        if ids:
+            yield ids
+        remaining -= len(ids)
+
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+
+async def _resolve_label_ids(
+    service: Any, client_auth_id: str, labels: List[str]
+) -> List[str]:
+    """Maps label names to ids; system and `Label_` ids are used as given."""
+    if all(label in SYSTEM_LABEL_IDS or label.startswith("Label_") for label in labels):
+        return labels
+
+    response = await execute(
+        service.users().labels().list(userId="me"), GMAIL_LABELS, client_auth_id
+    )
+    by_name: Dict[str, str] = {
+        label["name"].lower(): label["id"] for label in response.get("labels", [])
+    }
+
+    resolved = []
+    for label in labels:
+        if label in SYSTEM_LABEL_IDS or label.startswith("Label_"):
+            resolved.append(label)
+        elif label.upper() in SYSTEM_LABEL_IDS:
+            resolved.append(label.upper())
+        elif label.lower() in by_name:
+            resolved.append(by_name[label.lower()])
+        else:
+            raise ValueError(f"Unknown label: {label}")
+    return resolved
+
+
+async def modify_gmail_messages_mcp(
+    gmail_user_id: str,
+    mcp_ctx: Context,
+    action: str,
+    message_ids: Optional[List[str]] = None,
+    query: Optional[str] = None,
+    add_labels: Optional[List[str]] = None,
+    remove_labels: Optional[List[str]] = None,
+    max_messages: int = 10000,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Add/remove labels on many messages with `users.messages.batchModify`.
+
+    Messages are given as ids and/or a Gmail search query. Query results are
+    paged in full before any change is applied, since modifying messages can
+    move them out of the query and shift later pages.
+
+    Args:
+        gmail_user_id: User identifier for OAuth credentials
+        mcp_ctx: MCP context for logging and progress reporting
+        action: Name of the calling tool, for logs
+        message_ids: Optional message ids to modify
+        query: Optional Gmail search query selecting messages to modify
+        add_labels: Label ids or names to add
+        remove_labels: Label ids or names to remove
+        max_messages: Upper bound on messages selected by `query`
+        verbose: Include the action, label ids and timestamp
+
+    Returns:
+        Dict containing success status and modified count, plus label ids and
+        timestamp when verbose
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        await notifier.info(
+            "Starting %s",
+            action,
+            action=action,
+            message_id_count=len(message_ids) if message_ids else 0,
+            has_query=bool(query),
         )
-        raise ToolError(error_msg)
+
+        try:
+            if not message_ids and not query:
+                raise ValueError("Provide 'message_ids' or 'query'")
+            if not add_labels and not remove_labels:
+                raise ValueError("No labels to add or remove")
+
+            creds, client_auth_id = await get_user_credentials(gmail_user_id)
+            service = build_google_service("gmail", "v1", creds)
+
+            add_ids = await _resolve_label_ids(
+                service, client_auth_id, add_labels or []
+            )
+            remove_ids = await _resolve_label_ids(
+                service, client_auth_id, remove_labels or []
+            )
+
+            # Ordered and de-duplicated
+            selected: Dict[str, None] = dict.fromkeys(message_ids or [])
+            if query:
+                async for page in iter_message_id_pages(
+                    service, client_auth_id, query, max_messages
+                ):
+                    selected.update(dict.fromkeys(page))
+                    await notifier.progress(
+                        progress=len(selected),
+                        message=f"Found {len(selected)} messages",
+                    )
+
+            ids = list(selected)
+            total = len(ids)
+            await notifier.info("Modifying %d messages", total, total=total)
+
+            modified = 0
+            for start in range(0, total, BATCH_MODIFY_MAX_IDS):
+                chunk = ids[start : start + BATCH_MODIFY_MAX_IDS]
+                await execute(
+                    service.users()
+                    .messages()
+                    .batchModify(
+                        userId="me",
+                        body={
+                            "ids": chunk,
+                            "addLabelIds": add_ids,
+                            "removeLabelIds": remove_ids,
+                        },
+                    ),
+                    GMAIL_MODIFY,
+                    client_auth_id,
+                )
+                modified += len(chunk)
+                await notifier.progress(
+                    progress=modified,
+                    total=total,
+                    message=f"Modified {modified}/{total} messages",
+                )
+
+            if "TRASH" in add_ids:
+                invalidate_messages(gmail_user_id, ids)
+            await notifier.info("%s done: %d messages", action, modified)
+
+            result = {
+                "success": True,
+                "action": action,
+                "modified": modified,
+                "added_label_ids": add_ids,
+                "removed_label_ids": remove_ids,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            return result if verbose else compact_result(result, MODIFY_RESULT_FIELDS)
+
+        except ValueError as ve:
+            error_msg = f"Invalid input: {ve}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Gmail {action} failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi import HTTPException
+from googleapiclient.errors import HttpError
+from mcp.server.fastmcp import Context
+from mcp.server.fastmcp.exceptions import ToolError
+
+from config.settings_config import get_settings
+from core.cache.tiered import get_cache_backend
+from db.prisma.utils import get_db
+from google_mcp.notifier import ToolNotifier
+from google_mcp.subscriptions import resource_subscriptions
+from services.auth_service import get_user_credentials
+from services.google_api import GMAIL_HISTORY, GMAIL_WATCH, execute
+from services.google_client import build_google_service
+from services.message_cache import invalidate_messages, removed_message_ids
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+# Recent mailbox changes per user token, served by the changes resource when no
+# shared cache backend is configured
+_recent_changes: Dict[str, Deque[dict]] = {}
+# Serializes history syncs per user token; later pushes coalesce behind it
+_sync_locks: Dict[str, asyncio.Lock] = {}
+
+
+def changes_resource_uri(user_token_id: str) -> str:
+    return f"gmail://{user_token_id}/changes"
+
+
+def _changes_cache_key(user_token_id: str) -> str:
+    return f"gmail_changes:{user_token_id}"
+
+
+async def get_recent_changes(user_token_id: str) -> List[dict]:
+    backend = get_cache_backend()
+    if backend is None:
+        return list(_recent_changes.get(user_token_id, ()))
+
+    raw = await backend.get(_changes_cache_key(user_token_id))
+    return json.loads(raw) if raw else []
+
+
+async def _record_changes(user_token_id: str, changes: List[dict]) -> None:
+    settings = get_settings()
+    backend = get_cache_backend()
+    if backend is None:
+        buffer = _recent_changes.get(user_token_id)
+        if buffer is None:
+            buffer = _recent_changes[user_token_id] = deque(
+                maxlen=settings.gmail_changes_buffer_size
+            )
+        buffer.extend(changes)
+        return
+
+    # Kept in the shared cache, so any replica can serve the changes resource
+    buffer = await get_recent_changes(user_token_id) + changes
+    await backend.set(
+        _changes_cache_key(user_token_id),
+        json.dumps(buffer[-settings.gmail_changes_buffer_size :]),
+        settings.gmail_changes_ttl_seconds,
+    )
+
+
+def _expiration(watch: dict) -> datetime:
+    # `expiration` is epoch milliseconds
+    return datetime.fromtimestamp(int(watch["expiration"]) / 1000, tz=timezone.utc)
+
+
+async def start_gmail_watch(user_token_id: str) -> dict[str, Any]:
+    """
+    Registers (or renews) `users.watch` for a user token, so Gmail publishes
+    mailbox changes to `gmail_watch_topic`.
+    """
+    settings = get_settings()
+    if not settings.gmail_watch_topic:
+        raise HTTPException(400, "Gmail push notifications are not configured")
+
+    creds, client_auth_id = await get_user_credentials(user_token_id)
+    service = build_google_service("gmail", "v1", creds)
+
+    watch = await execute(
+        service.users().watch(
+            userId="me",
+            body={
+                "topicName": settings.gmail_watch_topic,
+                "labelIds": settings.gmail_watch_label_ids,
+                "labelFilterBehavior": "include",
+            },
+        ),
+        GMAIL_WATCH,
+        client_auth_id,
+    )
+    profile = await execute(
+        service.users().getProfile(userId="me"), GMAIL_WATCH, client_auth_id
+    )
+
+    db = await get_db()
+    existing = await db.usertoken.find_unique(where={"id": user_token_id})
+    expiration = _expiration(watch)
+    await db.usertoken.update(
+        where={"id": user_token_id},
+        data={
+            "emailAddress": profile["emailAddress"].lower(),
+            # Keep the sync position across renewals so no change is skipped
+            "watchHistoryId": (existing and existing.watchHistoryId)
+            or str(watch["historyId"]),
+            "watchExpiration": expiration,
+        },
+    )
+
+    logger.info(
+        f"Gmail watch registered for {user_token_id} until {expiration.isoformat()}",
+        extra={"user_token_id": user_token_id},
+    )
+    return {
+        "history_id": str(watch["historyId"]),
+        "expiration": expiration.isoformat(),
+    }
+
+
+async def stop_gmail_watch(user_token_id: str) -> None:
+    creds, client_auth_id = await get_user_credentials(user_token_id)
+    service = build_google_service("gmail", "v1", creds)
+    await execute(service.users().stop(userId="me"), GMAIL_WATCH, client_auth_id)
+
+    db = await get_db()
+    await db.usertoken.update(
+        where={"id": user_token_id},
+        data={"watchHistoryId": None, "watchExpiration": None},
+    )
+    logger.info(f"Gmail watch stopped for {user_token_id}")
+
+
+async def renew_gmail_watches() -> int:
+    """
+    Renews watches expiring within `gmail_watch_renew_before_seconds`
+    (Gmail expires them after 7 days).
+    """
+    db = await get_db()
+    cutoff = datetime.now(timezone.utc) + timedelta(
+        seconds=get_settings().gmail_watch_renew_before_seconds
+    )
+    expiring = await db.usertoken.find_many(
+        where={"watchExpiration": {"not": None, "lt": cutoff}}
+    )
+
+    renewed = 0
+    for user_token in expiring:
+        try:
+            await start_gmail_watch(user_token.id)
+            renewed += 1
+        except Exception as e:
+            logger.error(f"Failed to renew Gmail watch for {user_token.id}: {e}")
+
+    if expiring:
+        logger.info(f"Renewed {renewed}/{len(expiring)} Gmail watches")
+    return renewed
+
+
+async def _sync_history(user_token_id: str) -> List[dict]:
+    """Reads history since the stored position and advances it."""
+    db = await get_db()
+    user_token = await db.usertoken.find_unique(where={"id": user_token_id})
+    if not user_token or not user_token.watchHistoryId:
+        return []
+
+    creds, client_auth_id = await get_user_credentials(user_token_id)
+    service = build_google_service("gmail", "v1", creds)
+
+    changes: List[dict] = []
+    history_id = user_token.watchHistoryId
+    page_token: Optional[str] = None
+    while True:
+        try:
+            page = await execute(
+                service.users()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=user_token.watchHistoryId,
+                    historyTypes=HISTORY_TYPES,
+                    pageToken=page_token,
+                ),
+                GMAIL_HISTORY,
+                client_auth_id,
+            )
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            # The position is older than Gmail keeps history for: restart from
+            # the current mailbox state and tell readers to resync fully
+            profile = await execute(
+                service.users().getProfile(userId="me"), GMAIL_HISTORY, client_auth_id
+            )
+            history_id = profile["historyId"]
+            changes = [{"id": str(history_id), "resyncRequired": True}]
+            break
+        changes.extend(page.get("history", []))
+        history_id = page.get("historyId", history_id)
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+
+    await db.usertoken.update(
+        where={"id": user_token_id}, data={"watchHistoryId": str(history_id)}
+    )
+    return changes
+
+
+async def sync_gmail_changes(user_token_id: str) -> int:
+    """
+    Incrementally syncs one mailbox and notifies subscribers of its changes
+    resource. Returns the number of history records found.
+    """
+    lock = _sync_locks.setdefault(user_token_id, asyncio.Lock())
+    async with lock:
+        changes = await _sync_history(user_token_id)
+        if changes:
+            invalidate_messages(user_token_id, removed_message_ids(changes))
+            await _record_changes(user_token_id, changes)
+
+    if changes:
+        notified = await resource_subscriptions.notify_updated(
+            changes_resource_uri(user_token_id)
+        )
+        logger.info(
+            f"Synced {len(changes)} Gmail changes for {user_token_id}, "
+            f"notified {notified} subscribers",
+            extra={"user_token_id": user_token_id},
+        )
+    return len(changes)
+
+
+async def handle_gmail_push(email_address: str, history_id: str) -> int:
+    """
+    Handles one Gmail push notification: syncs every watched user token of the
+    mailbox that is behind `history_id`. Returns the number of tokens synced.
+    """
+    db = await get_db()
+    user_tokens = await db.usertoken.find_many(
+        where={"emailAddress": email_address.lower(), "watchHistoryId": {"not": None}}
+    )
+
+    synced = 0
+    for user_token in user_tokens:
+        # Pushes can arrive late or out of order; skip positions already synced
+        if int(user_token.watchHistoryId) >= int(history_id):
+            continue
+        try:
+            await sync_gmail_changes(user_token.id)
+            synced += 1
+        except Exception as e:
+            logger.error(f"Gmail sync failed for {user_token.id}: {e}")
+    return synced
+
+
+async def watch_gmail_mcp(
+    gmail_user_id: str, enabled: bool, mcp_ctx: Context
+) -> dict[str, Any]:
+    """
+    Turns push notifications for a mailbox on or off.
+
+    Args:
+        gmail_user_id: User identifier for OAuth credentials
+        enabled: Register (or renew) the watch when True, stop it when False
+        mcp_ctx: MCP context for logging
+
+    Returns:
+        Dict containing success status, the changes resource URI and, when
+        enabled, the watch expiration
+    """
+    async with ToolNotifier(mcp_ctx, logger) as notifier:
+        try:
+            result: dict[str, Any] = {
+                "success": True,
+                "watching": enabled,
+                "resource_uri": changes_resource_uri(gmail_user_id),
+            }
+            if enabled:
+                result.update(await start_gmail_watch(gmail_user_id))
+                await notifier.info("Watching mailbox until %s", result["expiration"])
+            else:
+                await stop_gmail_watch(gmail_user_id)
+                await notifier.info("Stopped watching mailbox")
+            return result
+
+        except HTTPException as he:
+            error_msg = f"Gmail watch failed: {he.detail}"
+            await notifier.error(error_msg)
+            raise ToolError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Gmail watch failed: {str(e)}"
+            await notifier.error(error_msg, error_type=type(e).__name__)
+            raise ToolError(error_msg)
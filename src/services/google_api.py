@@ -0,0 +1,109 @@
+import asyncio
+import socket
+from typing import Any, Callable, TypeVar
+
+from google.auth.exceptions import RefreshError, TransportError
+from googleapiclient.errors import HttpError
+
+from config.settings_config import get_settings
+from core.adaptive_limit import AdaptiveLimiter, AdaptiveLimiterGroup
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerGroup
+
+T = TypeVar("T")
+
+# Upstream endpoints, used for breaker and limiter keys and metric labels
+GMAIL_SEND = "gmail_send"
+GMAIL_LIST = "gmail_list"
+GMAIL_GET = "gmail_get"
+GMAIL_MODIFY = "gmail_modify"
+GMAIL_LABELS = "gmail_labels"
+GMAIL_HISTORY = "gmail_history"
+GMAIL_WATCH = "gmail_watch"
+DRIVE_FILES = "drive_files"
+DRIVE_UPLOAD = "drive_upload"
+DRIVE_DOWNLOAD = "drive_download"
+CALENDAR_FREEBUSY = "calendar_freebusy"
+# `Settings.google_token_uri`
+OAUTH2_TOKEN = "oauth2_token"
+OAUTH2_USERINFO = "oauth2_userinfo"
+
+_THROTTLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True for errors that mean the upstream is throttling or overloaded."""
+    if isinstance(error, HttpError):
+        if error.resp.status in (429, 503):
+            return True
+        # `error_details` is a list of dicts for JSON errors, otherwise a string
+        details = error.error_details if isinstance(error.error_details, list) else []
+        reasons = {d.get("reason") for d in details if isinstance(d, dict)}
+        return error.resp.status == 403 and bool(reasons & _THROTTLE_REASONS)
+    return isinstance(error, (TimeoutError, socket.timeout, TransportError))
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    True for errors that count against the upstream's circuit breaker. 429s
+    are left to the adaptive limiter: Gmail quotas are mostly per user, and
+    the breaker is shared by every tenant.
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status >= 500
+    if isinstance(error, RefreshError):
+        # Token endpoint 5xx/429 are retryable; invalid grants are the caller's
+        return error.retryable
+    # Connection errors, timeouts and `requests`/`httplib2` transport failures
+    return isinstance(error, (OSError, TransportError))
+
+
+def _create_limiter(upstream: str, key: str) -> AdaptiveLimiter:
+    settings = get_settings()
+    return AdaptiveLimiter(
+        upstream,
+        key,
+        initial_limit=settings.upstream_initial_limit,
+        min_limit=settings.upstream_min_limit,
+        max_limit=settings.upstream_max_limit,
+        latency_tolerance=settings.upstream_latency_tolerance,
+        backoff_ratio=settings.upstream_backoff_ratio,
+        baseline_window=settings.upstream_baseline_window_seconds,
+        is_overload=is_overload_error,
+    )
+
+
+def _create_breaker(upstream: str) -> CircuitBreaker:
+    settings = get_settings()
+    return CircuitBreaker(
+        upstream,
+        failure_threshold=settings.circuit_failure_threshold,
+        recovery_timeout=settings.circuit_recovery_timeout_seconds,
+        half_open_max_calls=settings.circuit_half_open_max_calls,
+        is_failure=is_upstream_failure,
+    )
+
+
+upstream_limiters = AdaptiveLimiterGroup(
+    _create_limiter, idle_timeout=get_settings().upstream_limiter_idle_seconds
+)
+upstream_breakers = CircuitBreakerGroup(_create_breaker)
+
+
+async def call_upstream(
+    upstream: str, client_auth_id: str, func: Callable[..., T], *args: Any
+) -> T:
+    """
+    Runs a blocking Google client call in a worker thread, behind the circuit
+    breaker of `upstream` and under its adaptive concurrency limit for the given
+    `ClientAuth`.
+
+    Raises `CircuitOpenError` without waiting while the circuit is open.
+    """
+    async with upstream_breakers.get(upstream).call():
+        async with upstream_limiters.get(upstream, client_auth_id).acquire():
+            return await asyncio.to_thread(func, *args)
+
+
+async def execute(request: Any, upstream: str, client_auth_id: str) -> Any:
+    """Executes a googleapiclient `HttpRequest` via `call_upstream`."""
+    return await call_upstream(upstream, client_auth_id, request.execute)
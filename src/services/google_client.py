@@ -0,0 +1,52 @@
+import json
+from typing import Any
+from urllib.parse import urljoin, urlparse
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+from config.settings_config import get_settings
+
+
+def build_google_service(api: str, version: str, credentials: Credentials) -> Any:
+    """
+    Builds a Google API client from the bundled discovery document.
+
+    Honors `google_api_endpoint`, so every client can be pointed at a local
+    fake or private endpoint.
+    """
+    endpoint = get_settings().google_api_endpoint
+    if not endpoint:
+        return build(
+            api,
+            version,
+            credentials=credentials,
+            cache_discovery=False,
+            static_discovery=True,
+        )
+
+    # `api_endpoint` replaces the root URL and the service path; keep the
+    # service path (e.g. `drive/v3/`) for APIs whose method paths are
+    # relative to it
+    document = json.loads(get_static_doc(api, version))
+    return build_from_document(
+        document,
+        credentials=credentials,
+        client_options={
+            "api_endpoint": urljoin(str(endpoint), document.get("servicePath", ""))
+        },
+    )
+
+
+def match_endpoint_scheme(uri: str) -> str:
+    """
+    Gives a media upload URI the scheme of `google_api_endpoint`.
+
+    googleapiclient moves upload URIs onto the endpoint's host but keeps
+    `https`, which breaks plain-http endpoints.
+    """
+    endpoint = get_settings().google_api_endpoint
+    if not endpoint:
+        return uri
+    return urlparse(uri)._replace(scheme=urlparse(str(endpoint)).scheme).geturl()
@@ -0,0 +1,131 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import rsa
+from google.auth import jwt
+from google.auth.transport.requests import Request as GRequest
+
+from config.settings_config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Never refetch for an unknown `kid` more often than this
+_MIN_REFETCH_SECONDS = 30.0
+
+
+def _b64_int(value: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+
+
+def jwk_to_pem(jwk: Mapping[str, str]) -> str:
+    """
+    Converts an RSA JWK to a PKCS#1 PEM public key, which both crypto
+    backends of `google.auth.jwt` (python-rsa and cryptography) can load.
+    """
+    public_key = rsa.PublicKey(n=_b64_int(jwk["n"]), e=_b64_int(jwk["e"]))
+    return public_key.save_pkcs1("PEM").decode("ascii")
+
+
+def parse_key_set(document: Mapping[str, Any]) -> Dict[str, str]:
+    """
+    Returns `{kid: PEM}` from a JWK set, or from Google's legacy
+    `{kid: x509 certificate}` format.
+    """
+    if "keys" not in document:
+        return dict(document)
+    return {
+        key["kid"]: jwk_to_pem(key)
+        for key in document["keys"]
+        if key.get("kty") == "RSA" and key.get("use", "sig") == "sig"
+    }
+
+
+class GoogleKeySet:
+    """
+    Google's ID-token signing keys, fetched from `google_certs_uri` and kept in
+    memory. Refreshed periodically by a background job, and on demand when a
+    token names a key id that is not cached yet (Google rotates keys).
+    """
+
+    def __init__(self) -> None:
+        self._keys: Dict[str, str] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fetch(self) -> Dict[str, str]:
+        uri = str(get_settings().google_certs_uri)
+        response = GRequest()(uri, method="GET", timeout=10)
+        if response.status != 200:
+            raise RuntimeError(f"Fetching {uri} returned {response.status}")
+        return parse_key_set(json.loads(response.data.decode("utf-8")))
+
+    def _needs_refresh(self, kid: Optional[str]) -> bool:
+        age = time.monotonic() - self._fetched_at
+        if not self._keys or age > get_settings().google_certs_refresh_seconds:
+            return True
+        return kid not in self._keys and age > _MIN_REFETCH_SECONDS
+
+    async def _refresh_locked(self) -> None:
+        self._keys = await asyncio.to_thread(self._fetch)
+        self._fetched_at = time.monotonic()
+        logger.info(f"Refreshed Google signing keys: {sorted(self._keys)}")
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._refresh_locked()
+
+    async def get(self, kid: Optional[str]) -> Dict[str, str]:
+        if not self._needs_refresh(kid):
+            return self._keys
+
+        async with self._lock:
+            # Another caller may have refreshed while this one waited
+            if self._needs_refresh(kid):
+                try:
+                    await self._refresh_locked()
+                except Exception as e:
+                    if not self._keys:
+                        raise
+                    # Keys rotate slowly; keep verifying with the cached set and
+                    # retry after `_MIN_REFETCH_SECONDS`
+                    logger.warning(f"Google signing key refresh failed: {e}")
+                    self._fetched_at = (
+                        time.monotonic()
+                        - get_settings().google_certs_refresh_seconds
+                        + _MIN_REFETCH_SECONDS
+                    )
+        return self._keys
+
+
+google_key_set = GoogleKeySet()
+
+
+async def verify_google_id_token(token: str, audience: str) -> Mapping[str, Any]:
+    """
+    Verifies an ID token's signature against the cached key set, and its
+    audience, issuer and expiry, without a round trip to Google.
+
+    Raises:
+        ValueError: If the token is malformed, expired or not issued by Google
+            for `audience`.
+    """
+    settings = get_settings()
+    certs = await google_key_set.get(jwt.decode_header(token).get("kid"))
+    claims = jwt.decode(
+        token,
+        certs=certs,
+        audience=audience,
+        clock_skew_in_seconds=settings.google_id_token_clock_skew_seconds,
+    )
+
+    if claims.get("iss") not in settings.google_id_token_issuers:
+        raise ValueError(f"Unexpected ID token issuer: {claims.get('iss')}")
+    return claims
+
+
+async def refresh_google_key_set() -> None:
+    await google_key_set.refresh()
@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from prisma.errors import UniqueViolationError
+
+from config.settings_config import get_settings
+from core.cache.local import MISSING, LocalCache
+from core.monitoring import idempotency_requests_counter
+from core.shutdown import shutdown_coordinator
+from db.prisma.utils import get_db
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+# Poll interval while another replica runs the first attempt
+_PENDING_POLL_SECONDS = 0.25
+# Claim attempts while other attempts keep claiming and releasing the key
+_CLAIM_ATTEMPTS = 3
+
+
+class IdempotencyConflict(ValueError):
+    """The key was already used with different arguments."""
+
+
+class IdempotencyInProgress(RuntimeError):
+    """Another replica still runs the first attempt for the key."""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of JSON-serializable request arguments."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Runs an operation at most once per (scope, key) within
+    `idempotency_ttl_seconds`, replaying the stored result for repeats.
+
+    Completed results are kept in an in-process table in front of Postgres.
+    Concurrent duplicates in this process wait on the first attempt's task;
+    duplicates on other replicas find its `pending` row and poll until it
+    completes. A failed attempt removes its claim, so it can be retried; a
+    claim whose replica died lapses after `idempotency_pending_lease_seconds`.
+    An attempt runs to completion even if its caller is cancelled.
+    """
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._results: LocalCache[Tuple[str, Any]] = LocalCache(
+            max_entries=settings.idempotency_l1_max_entries,
+            ttl=settings.idempotency_ttl_seconds,
+        )
+        # (fingerprint, task) of the attempt running in this process
+        self._in_flight: Dict[
+            Tuple[str, str], Tuple[str, "asyncio.Task[Tuple[Any, bool]]"]
+        ] = {}
+
+    def _record(self, scope: str, result: str) -> None:
+        idempotency_requests_counter.labels(scope=scope, result=result).inc()
+
+    @staticmethod
+    def _check(stored_fingerprint: str, request_fingerprint: str) -> None:
+        if stored_fingerprint != request_fingerprint:
+            raise IdempotencyConflict(
+                "Idempotency key was already used with different arguments"
+            )
+
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        request_fingerprint: str,
+        operation: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Returns `(result, replayed)`; `replayed` is True when the result was
+        stored by an earlier call with the same key.
+        """
+        cache_key = (scope, key)
+
+        cached = self._results.get(cache_key)
+        if cached is not MISSING:
+            self._check(cached[0], request_fingerprint)
+            self._record(scope, "memory_hit")
+            return cached[1], True
+
+        in_flight = self._in_flight.get(cache_key)
+        if in_flight is not None:
+            self._check(in_flight[0], request_fingerprint)
+            self._record(scope, "in_flight_wait")
+            result, _ = await asyncio.shield(in_flight[1])
+            return result, True
+
+        # The attempt outlives a cancelled caller (e.g. a client timeout): the
+        # operation may already have taken effect, so its claim must stay
+        # until it finishes and its result is stored for the retry
+        attempt = shutdown_coordinator.track(
+            asyncio.create_task(
+                self._run_once(scope, key, request_fingerprint, operation)
+            )
+        )
+        self._in_flight[cache_key] = (request_fingerprint, attempt)
+        attempt.add_done_callback(
+            lambda task: self._settle(cache_key, request_fingerprint, task)
+        )
+        return await asyncio.shield(attempt)
+
+    def _settle(
+        self,
+        cache_key: Tuple[str, str],
+        request_fingerprint: str,
+        attempt: "asyncio.Task[Tuple[Any, bool]]",
+    ) -> None:
+        del self._in_flight[cache_key]
+        if attempt.cancelled():
+            return
+        if attempt.exception() is None:
+            result, _ = attempt.result()
+            self._results.set(cache_key, (request_fingerprint, result))
+
+    async def _run_once(
+        self,
+        scope: str,
+        key: str,
+        request_fingerprint: str,
+        operation: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        db = await get_db()
+        where = {"scope_key": {"scope": scope, "key": key}}
+        record = await self._claim(scope, key, request_fingerprint)
+
+        if record is not None:
+            self._check(record.fingerprint, request_fingerprint)
+            if record.status != COMPLETED:
+                self._record(scope, "pending_wait")
+                record = await self._wait_for_completion(where)
+            else:
+                self._record(scope, "db_hit")
+            return json.loads(record.result or "null"), True
+
+        self._record(scope, "miss")
+        try:
+            result = await operation()
+        except Exception:
+            # Release the claim so that a retry can run the operation. A
+            # cancelled attempt (shutdown) keeps it until the lease expires,
+            # since the operation may have taken effect.
+            await db.idempotencyrecord.delete_many(
+                where={"scope": scope, "key": key, "status": PENDING}
+            )
+            raise
+
+        completed = await db.idempotencyrecord.update_many(
+            where={"scope": scope, "key": key, "status": PENDING},
+            data={
+                "status": COMPLETED,
+                "result": json.dumps(result, default=str),
+                "expiresAt": datetime.now(timezone.utc)
+                + timedelta(seconds=get_settings().idempotency_ttl_seconds),
+            },
+        )
+        if not completed:
+            # The operation took effect; only the replay record is lost
+            logger.warning(
+                f"Idempotency claim for {scope} lapsed before completion; "
+                "raise idempotency_pending_lease_seconds",
+                extra={"scope": scope},
+            )
+        return result, False
+
+    async def _claim(self, scope: str, key: str, request_fingerprint: str) -> Any:
+        """
+        Claims the key with a `pending` row. Returns None once claimed, or the
+        existing record of another attempt. The operation only ever runs
+        under a claim this call created.
+        """
+        db = await get_db()
+        where = {"scope_key": {"scope": scope, "key": key}}
+
+        for _ in range(_CLAIM_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            record = await db.idempotencyrecord.find_unique(where=where)
+            if record and record.expiresAt <= now:
+                await db.idempotencyrecord.delete_many(
+                    where={"scope": scope, "key": key, "expiresAt": {"lte": now}}
+                )
+                record = None
+            if record is not None:
+                return record
+
+            try:
+                # A short lease, so a replica that dies mid-attempt does not
+                # block the key for the whole TTL
+                await db.idempotencyrecord.create(
+                    data={
+                        "scope": scope,
+                        "key": key,
+                        "fingerprint": request_fingerprint,
+                        "status": PENDING,
+                        "expiresAt": now
+                        + timedelta(
+                            seconds=get_settings().idempotency_pending_lease_seconds
+                        ),
+                    }
+                )
+                return None
+            except UniqueViolationError:
+                # Another attempt claimed the key first; it may also have
+                # failed and released it since, so look again
+                continue
+
+        raise IdempotencyInProgress(
+            "A request with this idempotency key is still in progress"
+        )
+
+    async def _wait_for_completion(self, where: dict) -> Any:
+        db = await get_db()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + get_settings().idempotency_pending_timeout_seconds
+
+        while loop.time() < deadline:
+            await asyncio.sleep(_PENDING_POLL_SECONDS)
+            record = await db.idempotencyrecord.find_unique(where=where)
+            if record is None:
+                # The first attempt failed and released the key
+                raise IdempotencyInProgress(
+                    "The original request failed; retry with the same key"
+                )
+            if record.status == COMPLETED:
+                return record
+            if record.expiresAt <= datetime.now(timezone.utc):
+                # Its replica died; the next retry claims the key again
+                raise IdempotencyInProgress(
+                    "The original request did not complete; retry with the same key"
+                )
+
+        raise IdempotencyInProgress(
+            "A request with this idempotency key is still in progress"
+        )
+
+
+async def purge_expired_idempotency_records() -> int:
+    db = await get_db()
+    deleted = await db.idempotencyrecord.delete_many(
+        where={"expiresAt": {"lt": datetime.now(timezone.utc)}}
+    )
+    if deleted:
+        logger.info(f"Purged {deleted} expired idempotency records")
+    return deleted
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,43 @@
+import html
+import re
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Tuple
+
+# `{{ name }}` placeholders; anything else is literal text
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def is_html(text: str) -> bool:
+    return bool(HTML_TAG.search(text))
+
+
+class MailTemplate:
+    """
+    A template parsed once into alternating literal and variable parts, so
+    rendering one recipient is a single join with no re-parsing.
+    """
+
+    __slots__ = ("_literals", "_names", "_escape", "variables")
+
+    def __init__(self, source: str, escape: bool = False):
+        parts = PLACEHOLDER.split(source)
+        # split() alternates literal, name, literal, ..., literal
+        self._literals: Tuple[str, ...] = tuple(parts[0::2])
+        self._names: Tuple[str, ...] = tuple(parts[1::2])
+        self._escape: Callable[[str], str] = html.escape if escape else str
+        self.variables = frozenset(self._names)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Raises `KeyError` naming the first variable missing from `values`."""
+        out = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            value = values[name]
+            out.append(self._escape("" if value is None else str(value)))
+            out.append(literal)
+        return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str, escape: bool = False) -> MailTemplate:
+    return MailTemplate(source, escape=escape)
@@ -0,0 +1,69 @@
+import logging
+from typing import Iterable, List, Optional
+
+from config.settings_config import get_settings
+from core.cache.content import ContentCache
+from core.cache.local import MISSING
+from core.shutdown import shutdown_coordinator
+
+logger = logging.getLogger(__name__)
+
+# Message formats whose content never changes once delivered
+CACHED_FORMATS = ("full", "metadata", "raw")
+# Fields of a message resource that do change (labels move, history advances);
+# they are left out of cached and returned messages alike
+MUTABLE_FIELDS = ("labelIds", "historyId")
+
+
+def _create_cache() -> ContentCache:
+    settings = get_settings()
+    return ContentCache(
+        "gmail_content",
+        settings.gmail_content_cache_max_bytes,
+        settings.gmail_content_cache_inline_max_bytes,
+        settings.gmail_content_cache_dir,
+    )
+
+
+message_cache = _create_cache()
+shutdown_coordinator.add_flush_hook("gmail_content_cache", message_cache.close)
+
+
+def immutable_content(message: dict) -> dict:
+    return {k: v for k, v in message.items() if k not in MUTABLE_FIELDS}
+
+
+async def get_cached_message(
+    user_id: str, message_id: str, message_format: str
+) -> Optional[dict]:
+    message = await message_cache.get((user_id, message_id, message_format))
+    return None if message is MISSING else message
+
+
+async def cache_message(
+    user_id: str, message_id: str, message_format: str, message: dict
+) -> None:
+    if message_format in CACHED_FORMATS:
+        await message_cache.set((user_id, message_id, message_format), message)
+
+
+def invalidate_messages(user_id: str, message_ids: Iterable[str]) -> None:
+    """
+    Drops deleted or trashed messages in every format. The cache is local to
+    the process, so other replicas keep serving such messages until eviction.
+    """
+    for message_id in message_ids:
+        for message_format in CACHED_FORMATS:
+            message_cache.delete((user_id, message_id, message_format))
+
+
+def removed_message_ids(history: List[dict]) -> List[str]:
+    """Ids of messages deleted or moved to the trash in Gmail history records."""
+    removed = []
+    for record in history:
+        for deleted in record.get("messagesDeleted", []):
+            removed.append(deleted["message"]["id"])
+        for added in record.get("labelsAdded", []):
+            if "TRASH" in added.get("labelIds", []):
+                removed.append(added["message"]["id"])
+    return removed
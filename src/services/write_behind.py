@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config.settings_config import get_settings
+from core.monitoring import (
+    write_behind_age_histogram,
+    write_behind_dropped_counter,
+    write_behind_flush_histogram,
+    write_behind_pending_gauge,
+)
+from core.shutdown import shutdown_coordinator
+from db.prisma.utils import get_db
+
+logger = logging.getLogger(__name__)
+
+# Rows per `create_many` (Postgres allows 65535 bind parameters per statement)
+AUDIT_INSERT_BATCH = 1000
+
+# (fields, monotonic time of the first update)
+TokenUpdate = Tuple[dict, float]
+# (row, monotonic time it was buffered)
+AuditRecord = Tuple[dict, float]
+
+
+class WriteBehind:
+    """
+    Buffers database writes that a tool call does not need to wait for and
+    writes them in bulk: every `write_behind_flush_interval_seconds` (a
+    background job), as soon as `write_behind_flush_threshold` writes are
+    pending, and on shutdown (a flush hook).
+
+    Token updates (a refreshed `accessToken` and its `expiry`) are coalesced
+    per `UserToken.id`, the last write winning, and are skipped if the stored
+    token already expires later (e.g. after a new OAuth consent or another
+    replica's refresh). Other writes to the row, such as the watch history
+    position, do not make them stale. Send audit records are inserted with
+    `create_many`.
+    Failed flushes are buffered again; at most `write_behind_max_pending`
+    writes of each kind are kept, the oldest being dropped beyond that.
+    Losing a token update only costs another refresh.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, TokenUpdate] = {}
+        self._audits: List[AuditRecord] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._tokens) + len(self._audits)
+
+    def update_token(self, user_token_id: str, data: dict) -> None:
+        """Buffers a token update; `data` must include the new `expiry`."""
+        if "expiry" not in data:
+            raise ValueError("Token updates must include 'expiry'")
+        previous = self._tokens.pop(user_token_id, None)
+        self._tokens[user_token_id] = (
+            {**previous[0], **data} if previous else dict(data),
+            previous[1] if previous else time.monotonic(),
+        )
+        self._buffered()
+
+    def add_send_audit(
+        self,
+        user_token_id: str,
+        tool: str,
+        message_id: Optional[str],
+        recipients: int,
+        idempotency_key: Optional[str] = None,
+    ) -> None:
+        self._audits.append(
+            (
+                {
+                    "userTokenId": user_token_id,
+                    "tool": tool,
+                    "messageId": message_id,
+                    "recipients": recipients,
+                    "idempotencyKey": idempotency_key,
+                    "sentAt": datetime.now(timezone.utc),
+                },
+                time.monotonic(),
+            )
+        )
+        self._buffered()
+
+    async def flush(self) -> None:
+        """Writes everything buffered so far."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            tokens, self._tokens = self._tokens, {}
+            audits, self._audits = self._audits, []
+            self._report()
+            if tokens:
+                await self._flush_tokens(tokens)
+            if audits:
+                await self._flush_audits(audits)
+
+    async def _flush_tokens(self, tokens: Dict[str, TokenUpdate]) -> None:
+        started = time.perf_counter()
+        try:
+            db = await get_db()
+            # One round trip and one transaction for the whole flush
+            async with db.batch_() as batcher:
+                for user_token_id, (data, _) in tokens.items():
+                    batcher.usertoken.update_many(
+                        where={"id": user_token_id, "expiry": {"lt": data["expiry"]}},
+                        data=data,
+                    )
+        except Exception as e:
+            self._failed("token", started, e, len(tokens))
+            # Updates buffered meanwhile are newer and win
+            self._tokens = {
+                **{k: v for k, v in tokens.items() if k not in self._tokens},
+                **self._tokens,
+            }
+            self._trim()
+            return
+        self._flushed("token", started, [first for _, first in tokens.values()])
+
+    async def _flush_audits(self, audits: List[AuditRecord]) -> None:
+        for start in range(0, len(audits), AUDIT_INSERT_BATCH):
+            chunk = audits[start : start + AUDIT_INSERT_BATCH]
+            started = time.perf_counter()
+            try:
+                db = await get_db()
+                await db.sendaudit.create_many(data=[row for row, _ in chunk])
+            except Exception as e:
+                self._failed("audit", started, e, len(audits) - start)
+                self._audits = audits[start:] + self._audits
+                self._trim()
+                return
+            self._flushed("audit", started, [buffered for _, buffered in chunk])
+
+    def _buffered(self) -> None:
+        self._trim()
+        settings = get_settings()
+        if self.pending >= settings.write_behind_flush_threshold and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = shutdown_coordinator.track(
+                asyncio.create_task(self.flush())
+            )
+
+    def _trim(self) -> None:
+        max_pending = get_settings().write_behind_max_pending
+        while len(self._tokens) > max_pending:
+            del self._tokens[next(iter(self._tokens))]
+            write_behind_dropped_counter.labels(kind="token").inc()
+        if len(self._audits) > max_pending:
+            dropped = len(self._audits) - max_pending
+            del self._audits[:dropped]
+            write_behind_dropped_counter.labels(kind="audit").inc(dropped)
+        self._report()
+
+    def _report(self) -> None:
+        write_behind_pending_gauge.labels(kind="token").set(len(self._tokens))
+        write_behind_pending_gauge.labels(kind="audit").set(len(self._audits))
+
+    @staticmethod
+    def _flushed(kind: str, started: float, buffered_at: List[float]) -> None:
+        write_behind_flush_histogram.labels(kind=kind, outcome="ok").observe(
+            time.perf_counter() - started
+        )
+        now = time.monotonic()
+        for buffered in buffered_at:
+            write_behind_age_histogram.labels(kind=kind).observe(now - buffered)
+
+    @staticmethod
+    def _failed(kind: str, started: float, error: Exception, count: int) -> None:
+        write_behind_flush_histogram.labels(kind=kind, outcome="error").observe(
+            time.perf_counter() - started
+        )
+        logger.error(
+            f"Write-behind flush of {count} {kind} writes failed: "
+            f"{type(error).__name__}: {error}",
+            extra={"kind": kind, "count": count},
+        )
+
+
+write_behind = WriteBehind()
+shutdown_coordinator.add_flush_hook("write_behind", write_behind.flush)
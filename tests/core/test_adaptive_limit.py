@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+
+from core import adaptive_limit
+from core.adaptive_limit import AdaptiveLimiter, AdaptiveLimiterGroup
+from core.monitoring import upstream_concurrency_limit, upstream_limiters_gauge
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(adaptive_limit, "time", clock)
+    return clock
+
+
+class Overloaded(Exception):
+    pass
+
+
+def limiter(**overrides) -> AdaptiveLimiter:
+    settings = {
+        "initial_limit": 10,
+        "min_limit": 2,
+        "max_limit": 20,
+        "latency_tolerance": 2.0,
+        "backoff_ratio": 0.5,
+        "baseline_window": 60.0,
+        "is_overload": lambda e: isinstance(e, Overloaded),
+    }
+    return AdaptiveLimiter("gmail_send", "tenant", **{**settings, **overrides})
+
+
+async def call(limiter, clock, rtt, error=None):
+    async with limiter.acquire():
+        clock.now += rtt
+        if error is not None:
+            raise error
+
+
+async def busy_call(limiter, clock, rtt, concurrent):
+    """A call made while `concurrent - 1` others are in flight."""
+    limiter._in_flight += concurrent - 1
+    try:
+        await call(limiter, clock, rtt)
+    finally:
+        limiter._in_flight -= concurrent - 1
+
+
+def test_initial_limit_is_clamped():
+    assert limiter(initial_limit=50).limit == 20
+    assert limiter(initial_limit=1).limit == 2
+
+
+@pytest.mark.asyncio
+async def test_grows_by_one_per_limit_of_calls_when_used(clock):
+    lim = limiter()
+    for _ in range(10):
+        await busy_call(lim, clock, 0.1, concurrent=5)
+    assert lim.limit == 10
+
+    await busy_call(lim, clock, 0.1, concurrent=5)
+    assert lim.limit == 11
+
+
+@pytest.mark.asyncio
+async def test_does_not_grow_when_underused(clock):
+    lim = limiter()
+    for _ in range(50):
+        await call(lim, clock, 0.1)
+
+    assert lim.limit == 10
+
+
+@pytest.mark.asyncio
+async def test_slow_round_trip_backs_off_once_per_congestion_event(clock):
+    lim = limiter()
+    await call(lim, clock, 0.1)
+
+    await call(lim, clock, 0.5)
+    assert lim.limit == 5
+
+    # Within one baseline round trip of the last decrease: the same event
+    with pytest.raises(Overloaded):
+        await call(lim, clock, 0.0, Overloaded())
+    assert lim.limit == 5
+
+    clock.now += 0.1
+    with pytest.raises(Overloaded):
+        await call(lim, clock, 0.0, Overloaded())
+    assert lim.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_only_overload_errors_back_off(clock):
+    lim = limiter()
+
+    with pytest.raises(ValueError):
+        await call(lim, clock, 0.1, ValueError("bad request"))
+    assert lim.limit == 10
+
+    with pytest.raises(Overloaded):
+        await call(lim, clock, 0.1, Overloaded())
+    assert lim.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_never_drops_below_min_limit(clock):
+    lim = limiter()
+    for _ in range(10):
+        clock.now += 10
+        with pytest.raises(Overloaded):
+            await call(lim, clock, 0.1, Overloaded())
+
+    assert lim.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_calls_over_the_limit_wait():
+    lim = limiter(initial_limit=2)
+    release = asyncio.Event()
+
+    async def hold():
+        async with lim.acquire():
+            await release.wait()
+
+    tasks = [asyncio.create_task(hold()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert lim.in_flight == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert lim.in_flight == 0
+
+
+def group(idle_timeout=600.0) -> AdaptiveLimiterGroup:
+    return AdaptiveLimiterGroup(
+        lambda upstream, key: AdaptiveLimiter(
+            upstream,
+            key,
+            initial_limit=10,
+            min_limit=1,
+            max_limit=20,
+            latency_tolerance=2.0,
+            backoff_ratio=0.5,
+            baseline_window=60.0,
+            is_overload=lambda e: False,
+        ),
+        idle_timeout=idle_timeout,
+    )
+
+
+def test_group_reuses_limiters_per_upstream_and_key(clock):
+    limiters = group()
+
+    assert limiters.get("gmail_send", "a") is limiters.get("gmail_send", "a")
+    assert limiters.get("gmail_send", "a") is not limiters.get("gmail_send", "b")
+    assert limiters.get("gmail_send", "a") is not limiters.get("gmail_list", "a")
+    assert len(limiters) == 3
+
+
+def test_group_evicts_idle_limiters_and_reports_per_upstream(clock):
+    limiters = group(idle_timeout=60)
+    for key in ("a", "b", "c"):
+        limiters.get("test_upstream", key)
+    busy = limiters.get("test_upstream", "busy")
+    busy._in_flight = 1
+    limiters.get("test_upstream", "throttled")._set_limit(3)
+
+    limiters.sweep()
+    assert upstream_limiters_gauge.labels(upstream="test_upstream")._value.get() == 5
+    assert upstream_concurrency_limit.labels(upstream="test_upstream")._value.get() == 3
+
+    clock.now += 61
+    limiters.get("test_upstream", "a")
+    limiters.sweep()
+    # Idle limiters go; recently used and in-flight ones stay
+    assert len(limiters) == 2
+    assert limiters.get("test_upstream", "busy") is busy
+    assert upstream_limiters_gauge.labels(upstream="test_upstream")._value.get() == 2
+    assert (
+        upstream_concurrency_limit.labels(upstream="test_upstream")._value.get() == 10
+    )
+
+    clock.now += 61
+    busy._in_flight = 0
+    limiters.sweep()
+    assert len(limiters) == 0
+    assert upstream_limiters_gauge.labels(upstream="test_upstream")._value.get() == 0
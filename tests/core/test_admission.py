@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionRejected
+
+
+def controller(**overrides) -> AdmissionController:
+    settings = {
+        "max_concurrency": 2,
+        "client_max_concurrency": 1,
+        "max_queue": 2,
+        "queue_timeout": 1.0,
+    }
+    return AdmissionController("test", **{**settings, **overrides})
+
+
+async def hold(admission, release: asyncio.Event, client_key=None, admitted=None):
+    async with admission.admit(client_key):
+        if admitted is not None:
+            admitted.append(client_key)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_waiting_call_is_admitted_when_a_slot_frees():
+    admission, release, admitted = controller(), asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(admission, release, admitted=admitted))
+        for _ in range(3)
+    ]
+    await settle()
+
+    assert (admission.in_flight, admission.waiting) == (2, 1)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(admitted) == 3
+    assert (admission.in_flight, admission.waiting) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately():
+    admission, release = controller(max_queue=1), asyncio.Event()
+    tasks = [asyncio.create_task(hold(admission, release)) for _ in range(3)]
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.admit():
+            pass
+    assert rejected.value.reason == "queue_full"
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects():
+    admission, release = (
+        controller(max_concurrency=1, queue_timeout=0.05),
+        asyncio.Event(),
+    )
+    task = asyncio.create_task(hold(admission, release))
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.admit():
+            pass
+    assert rejected.value.reason == "timeout"
+    assert admission.waiting == 0
+
+    release.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_busy_client_queues_behind_itself():
+    admission, release, admitted = controller(), asyncio.Event(), []
+    first = asyncio.create_task(hold(admission, release, "a", admitted))
+    second = asyncio.create_task(hold(admission, release, "a", admitted))
+    await settle()
+
+    # "a" waits for its own slot without taking the second global slot
+    assert admitted == ["a"]
+    async with admission.admit("b"):
+        assert admission.in_flight == 2
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert admitted == ["a", "a"]
+    assert admission._clients == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_no_trace():
+    admission, release = controller(max_concurrency=1), asyncio.Event()
+    holder = asyncio.create_task(hold(admission, release, "a"))
+    waiter = asyncio.create_task(hold(admission, release, "b"))
+    await settle()
+    assert admission.waiting == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert admission.waiting == 0
+
+    release.set()
+    await holder
+    assert admission._clients == {}
+    async with admission.admit("b"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_closed_controller_rejects_as_draining():
+    admission, release = controller(), asyncio.Event()
+    running = asyncio.create_task(hold(admission, release))
+    await settle()
+    admission.close()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with admission.admit():
+            pass
+    assert rejected.value.reason == "draining"
+    assert rejected.value.retry_after_header == "1"
+
+    # Calls already admitted finish
+    assert not await admission.wait_idle(0.05)
+    release.set()
+    assert await admission.wait_idle(1.0)
+    await running
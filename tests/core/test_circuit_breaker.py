@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from core import circuit_breaker
+from core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerGroup,
+    CircuitOpenError,
+)
+from core.monitoring import circuit_state_gauge
+from enums.circuit_state import CircuitState
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+class Unavailable(Exception):
+    pass
+
+
+def breaker(**overrides) -> CircuitBreaker:
+    settings = {
+        "failure_threshold": 3,
+        "recovery_timeout": 30.0,
+        "half_open_max_calls": 1,
+        "is_failure": lambda e: isinstance(e, Unavailable),
+    }
+    return CircuitBreaker("test_upstream", **{**settings, **overrides})
+
+
+async def succeed(breaker):
+    async with breaker.call():
+        pass
+
+
+async def fail(breaker, error=None):
+    with pytest.raises(type(error or Unavailable())):
+        async with breaker.call():
+            raise error or Unavailable()
+
+
+async def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        await fail(breaker)
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures(clock):
+    cb = breaker()
+    await fail(cb)
+    await fail(cb)
+    await succeed(cb)
+    await fail(cb)
+    await fail(cb)
+    assert cb.state == CircuitState.CLOSED
+
+    await fail(cb)
+    assert cb.state == CircuitState.OPEN
+    assert circuit_state_gauge.labels(upstream="test_upstream")._value.get() == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_failures(clock):
+    cb = breaker()
+    for _ in range(5):
+        await fail(cb, ValueError("bad request"))
+
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_until_recovery_timeout(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 10
+
+    called = False
+    with pytest.raises(CircuitOpenError) as exc_info:
+        async with cb.call():
+            called = True
+
+    assert not called
+    assert exc_info.value.retry_after == 20
+    assert "retry after 20s" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_successful_probe_closes_the_circuit(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 30
+
+    await succeed(cb)
+    assert cb.state == CircuitState.CLOSED
+    # The failure count starts over
+    await fail(cb)
+    await fail(cb)
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_the_circuit(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 30
+
+    await fail(cb)
+    assert cb.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await succeed(cb)
+
+
+@pytest.mark.asyncio
+async def test_probe_answered_with_other_error_closes_the_circuit(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 30
+
+    await fail(cb, ValueError("not found"))
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_limited_probes(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 30
+    release = asyncio.Event()
+
+    async def probe():
+        async with cb.call():
+            await release.wait()
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    assert cb.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await succeed(cb)
+
+    release.set()
+    await task
+    assert cb.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_its_slot(clock):
+    cb = breaker()
+    await open_circuit(cb)
+    clock.now += 30
+
+    async def probe():
+        async with cb.call():
+            await asyncio.Event().wait()
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cb.state == CircuitState.HALF_OPEN
+
+    await succeed(cb)
+    assert cb.state == CircuitState.CLOSED
+
+
+def test_group_reuses_breakers_per_upstream():
+    breakers = CircuitBreakerGroup(
+        lambda upstream: CircuitBreaker(upstream, 3, 30.0, 1, lambda e: True)
+    )
+
+    assert breakers.get("gmail_send") is breakers.get("gmail_send")
+    assert breakers.get("gmail_send") is not breakers.get("drive")
+    assert breakers.get("drive").upstream == "drive"
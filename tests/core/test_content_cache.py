@@ -0,0 +1,110 @@
+import orjson
+import pytest
+
+from core.cache.content import ContentCache
+from core.cache.local import MISSING
+
+
+def value(size: int, fill: str = "x") -> str:
+    """A JSON string value that encodes to exactly `size` bytes."""
+    return fill * (size - 2)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ContentCache(
+        "test", max_bytes=1000, inline_max_bytes=100, directory=tmp_path
+    )
+    yield cache
+    cache.close()
+
+
+def spilled_files(cache):
+    return list(cache._spill_dir.iterdir()) if cache._spill_dir else []
+
+
+@pytest.mark.asyncio
+async def test_round_trips_inline_and_spilled_values(cache):
+    message = {"id": "m1", "labelIds": ["INBOX"], "snippet": "hi"}
+    await cache.set("small", message)
+    await cache.set("large", value(500))
+
+    assert await cache.get("small") == message
+    assert await cache.get("large") == value(500)
+    assert await cache.get("absent") is MISSING
+    assert cache._bytes == {"memory": len(orjson.dumps(message)), "disk": 500}
+    assert len(spilled_files(cache)) == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once(cache):
+    await cache.set("a", value(500))
+    await cache.set("b", value(500))
+
+    assert len(cache) == 2
+    assert cache.size_bytes == 500
+    assert len(spilled_files(cache)) == 1
+
+    cache.delete("a")
+    assert await cache.get("b") == value(500)
+    cache.delete("b")
+    assert cache.size_bytes == 0
+    assert spilled_files(cache) == []
+
+
+@pytest.mark.asyncio
+async def test_overwriting_a_key_releases_the_old_content(cache):
+    await cache.set("a", value(500))
+    await cache.set("a", value(300))
+
+    assert await cache.get("a") == value(300)
+    assert cache.size_bytes == 300
+    assert len(spilled_files(cache)) == 1
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_over_budget(cache):
+    await cache.set("a", value(400, "a"))
+    await cache.set("b", value(400, "b"))
+    await cache.get("a")
+    await cache.set("c", value(400, "c"))
+
+    assert await cache.get("b") is MISSING
+    assert await cache.get("a") == value(400, "a")
+    assert await cache.get("c") == value(400, "c")
+    assert cache.size_bytes == 800
+
+
+@pytest.mark.asyncio
+async def test_values_over_budget_are_not_stored(cache):
+    await cache.set("a", value(100))
+    await cache.set("huge", value(1001))
+
+    assert await cache.get("huge") is MISSING
+    assert await cache.get("a") == value(100)
+
+
+@pytest.mark.asyncio
+async def test_missing_spill_file_is_a_miss(cache):
+    await cache.set("a", value(500))
+    for path in spilled_files(cache):
+        path.unlink()
+
+    assert await cache.get("a") is MISSING
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_close_removes_the_spill_directory(tmp_path):
+    cache = ContentCache(
+        "test", max_bytes=1000, inline_max_bytes=100, directory=tmp_path
+    )
+    await cache.set("a", value(500))
+    spill_dir = cache._spill_dir
+
+    cache.close()
+
+    assert not spill_dir.exists()
+    assert len(cache) == 0
+    assert await cache.get("a") is MISSING
@@ -0,0 +1,105 @@
+import pytest
+from prisma.errors import RawQueryError
+
+from core.cache.postgres_backend import PostgresCacheBackend
+
+
+def undefined_table(relation: str) -> RawQueryError:
+    return RawQueryError(
+        {
+            "user_facing_error": {
+                "error_code": "P2010",
+                "meta": {
+                    "code": "42P01",
+                    "message": f'relation "{relation}" does not exist',
+                },
+            }
+        }
+    )
+
+
+class FakeDb:
+    """Fails statements on `cache_entry` while the table is dropped."""
+
+    def __init__(self):
+        self.dropped = False
+        self.statements = []
+
+    async def execute_raw(self, query, *args):
+        return await self._run(query, args, 1)
+
+    async def query_raw(self, query, *args):
+        return await self._run(query, args, [{"value": "cached", "version": 7}])
+
+    async def _run(self, query, args, result):
+        query = " ".join(query.split())
+        self.statements.append(query)
+        if query.startswith("CREATE UNLOGGED TABLE"):
+            self.dropped = False
+        elif self.dropped and "cache_entry" in query:
+            raise undefined_table("cache_entry")
+        return result
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeDb()
+
+    async def get_db():
+        return db
+
+    monkeypatch.setattr("db.prisma.utils.get_db", get_db)
+    return db
+
+
+def setup_statements(db):
+    return [
+        s.split(" (")[0]
+        for s in db.statements
+        if not s.startswith(("SELECT", "INSERT", "DELETE"))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_creates_the_table_once(db):
+    backend = PostgresCacheBackend(prefix="app:", poll_interval=2)
+
+    assert await backend.get("k") == "cached"
+    await backend.set("k", "value", ttl=60)
+
+    assert setup_statements(db) == [
+        "CREATE UNLOGGED TABLE IF NOT EXISTS cache_entry",
+        "ALTER TABLE cache_entry SET UNLOGGED",
+        "CREATE SEQUENCE IF NOT EXISTS cache_entry_version_seq",
+        "CREATE INDEX IF NOT EXISTS cache_entry_version_idx ON cache_entry",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_recreates_a_dropped_table(db):
+    backend = PostgresCacheBackend(prefix="app:", poll_interval=2)
+    await backend.get("k")
+    db.dropped = True
+
+    await backend.set("k", "value", ttl=60)
+
+    assert not db.dropped
+    assert len(setup_statements(db)) == 8
+    assert db.statements[-1].startswith("INSERT INTO cache_entry")
+    assert backend._generation == 1
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised(db):
+    backend = PostgresCacheBackend(prefix="app:", poll_interval=2)
+    await backend.get("k")
+
+    async def cancelled(query, *args):
+        raise RawQueryError(
+            {"user_facing_error": {"meta": {"code": "57014", "message": "canceled"}}}
+        )
+
+    db.query_raw = cancelled
+    with pytest.raises(RawQueryError):
+        await backend.get("k")
+    assert len(setup_statements(db)) == 4
@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+
+from api.v1.schema.client import ClientImportRow, ImportRowError
+from config.settings_config import get_settings
+from services.client_service import _run_import
+
+
+@pytest.fixture
+def batch_size(monkeypatch):
+    monkeypatch.setenv("ADMIN_IMPORT_BATCH_SIZE", "2")
+    monkeypatch.setenv("ADMIN_IMPORT_MAX_LINE_BYTES", "1024")
+    get_settings.cache_clear()
+    yield 2
+    get_settings.cache_clear()
+
+
+async def stream(body: bytes, chunk_size: int = 7):
+    for start in range(0, len(body), chunk_size):
+        yield body[start : start + chunk_size]
+
+
+def ndjson(*rows) -> bytes:
+    return b"\n".join(
+        row if isinstance(row, bytes) else json.dumps(row).encode() for row in rows
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_end_to_end(batch_size, caplog):
+    # Records are only built (and `extra` checked) when the level is enabled
+    caplog.set_level(logging.INFO, logger="services.client_service")
+    batches = []
+
+    async def insert_batch(rows, errors):
+        batches.append([line for line, _ in rows])
+        return len(rows)
+
+    body = ndjson(
+        {"name": "a"},
+        b"",
+        {"name": "b"},
+        {"name": ""},
+        b"not json",
+        {"name": "c"},
+    )
+    result = await _run_import(stream(body), ClientImportRow, insert_batch)
+
+    assert (result.received, result.created, result.failed) == (5, 3, 2)
+    assert [error.line for error in result.errors] == [4, 5]
+    # Blank lines keep their line number but are not rows
+    assert batches == [[1, 3], [6]]
+    assert "Imported 3/5 ClientImportRow rows" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_reports_each_row(batch_size):
+    async def insert_batch(rows, errors):
+        errors.append(ImportRowError(line=0, error="from insert_batch"))
+        if rows[0][1].name == "b":
+            raise RuntimeError("db down")
+        return len(rows)
+
+    body = ndjson({"name": "a"}, {"name": "x"}, {"name": "b"}, {"name": "y"})
+    result = await _run_import(stream(body), ClientImportRow, insert_batch)
+
+    assert (result.created, result.failed) == (2, 2)
+    # The failed batch's own row errors are replaced by the batch failure
+    assert [(e.line, e.error) for e in result.errors] == [
+        (0, "from insert_batch"),
+        (3, "Batch failed: db down"),
+        (4, "Batch failed: db down"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_overlong_line_is_a_row_error(batch_size):
+    async def insert_batch(rows, errors):
+        return len(rows)
+
+    body = ndjson({"name": "a" * 2000}, {"name": "b"})
+    result = await _run_import(stream(body, 256), ClientImportRow, insert_batch)
+
+    assert (result.received, result.created) == (2, 1)
+    assert result.errors[0].line == 1
+    assert "exceeds 1024 bytes" in result.errors[0].error
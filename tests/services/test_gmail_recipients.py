@@ -0,0 +1,84 @@
+import pytest
+
+from services.gmail_service import plan_recipient_chunks, prepare_recipients
+
+
+def addresses(prefix: str, count: int):
+    return [f"{prefix}{i}@example.com" for i in range(count)]
+
+
+def flatten(chunks):
+    return [address for chunk in chunks for field in chunk for address in field]
+
+
+def test_prepare_keeps_each_address_in_its_most_visible_field():
+    to, cc, bcc, duplicates = prepare_recipients(
+        [" a@example.com", "A@example.com"],
+        ["b@example.com", "a@EXAMPLE.com"],
+        ["c@example.com", "B@example.com", "a@example.com"],
+    )
+
+    assert (to, cc, bcc) == (["a@example.com"], ["b@example.com"], ["c@example.com"])
+    assert duplicates == 4
+
+
+def test_prepare_without_cc_and_bcc():
+    assert prepare_recipients(["a@example.com"]) == (["a@example.com"], [], [], 0)
+
+
+def test_prepare_reports_all_invalid_addresses_at_once():
+    with pytest.raises(ValueError) as error:
+        prepare_recipients(["bad", "a@example.com"], ["also bad@"], ["bad"])
+
+    assert str(error.value) == "Invalid email address(es): 'bad', 'also bad@'"
+
+
+def test_prepare_truncates_long_invalid_lists():
+    with pytest.raises(ValueError, match=r"'bad9' and 5 more$"):
+        prepare_recipients([f"bad{i}" for i in range(15)])
+
+
+def test_small_sends_are_one_message():
+    to, cc, bcc = addresses("t", 2), addresses("c", 2), addresses("b", 2)
+
+    assert plan_recipient_chunks(to, cc, bcc, limit=6) == [(to, cc, bcc)]
+
+
+def test_first_message_keeps_visible_recipients_and_tops_up_with_bcc():
+    to, cc, bcc = addresses("t", 3), addresses("c", 2), addresses("b", 10)
+
+    chunks = plan_recipient_chunks(to, cc, bcc, limit=6)
+
+    assert chunks[0] == (to, cc, bcc[:1])
+    assert chunks[1:] == [([], [], bcc[1:7]), ([], [], bcc[7:])]
+
+
+def test_visible_recipients_that_do_not_fit_move_to_bcc():
+    to, cc = addresses("t", 5), addresses("c", 3)
+
+    chunks = plan_recipient_chunks(to, cc, [], limit=4)
+
+    assert chunks[0] == (to[:4], [], [])
+    assert chunks[1] == ([], [], [to[4], *cc])
+
+
+def test_cc_partially_fits():
+    to, cc, bcc = addresses("t", 2), addresses("c", 3), addresses("b", 1)
+
+    chunks = plan_recipient_chunks(to, cc, bcc, limit=4)
+
+    assert chunks[0] == (to, cc[:2], [])
+    assert chunks[1] == ([], [], [cc[2], *bcc])
+
+
+@pytest.mark.parametrize(
+    "counts", [(150, 0, 0), (40, 70, 333), (0, 0, 1000), (1, 99, 1)]
+)
+def test_every_recipient_gets_exactly_one_message(counts):
+    to, cc, bcc = (addresses(p, n) for p, n in zip("tcb", counts))
+
+    chunks = plan_recipient_chunks(to, cc, bcc, limit=100)
+
+    assert sorted(flatten(chunks)) == sorted(to + cc + bcc)
+    assert all(0 < sum(map(len, chunk)) <= 100 for chunk in chunks)
+    assert all(not chunk[0] and not chunk[1] for chunk in chunks[1:])
@@ -0,0 +1,112 @@
+import base64
+import time
+
+import pytest
+import rsa
+from google.auth import crypt, jwt
+
+from services import google_id_token
+from services.google_id_token import GoogleKeySet, parse_key_set
+
+AUDIENCE = "client-id.apps.googleusercontent.com"
+KID = "test-key-1"
+
+
+def _b64_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8)
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    # Small key: generating it in pure Python is slow, and size is irrelevant
+    return rsa.newkeys(1024)
+
+
+@pytest.fixture
+def key_set(key_pair, monkeypatch):
+    public_key, _ = key_pair
+    document = {
+        "keys": [
+            {
+                "kid": KID,
+                "kty": "RSA",
+                "alg": "RS256",
+                "use": "sig",
+                "n": _b64_uint(public_key.n),
+                "e": _b64_uint(public_key.e),
+            }
+        ]
+    }
+    key_set = GoogleKeySet()
+    key_set.fetches = 0
+
+    def fetch():
+        key_set.fetches += 1
+        return parse_key_set(document)
+
+    monkeypatch.setattr(key_set, "_fetch", fetch)
+    monkeypatch.setattr(google_id_token, "google_key_set", key_set)
+    return key_set
+
+
+def make_token(key_pair, kid=KID, audience=AUDIENCE, expires_in=3600):
+    _, private_key = key_pair
+    signer = crypt.RSASigner.from_string(private_key.save_pkcs1("PEM"), key_id=kid)
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": audience,
+        "sub": "1234567890",
+        "email": "user@example.com",
+        "iat": now - 60,
+        "exp": now + expires_in,
+    }
+    return jwt.encode(signer, payload).decode("ascii")
+
+
+@pytest.mark.asyncio
+async def test_valid_token(key_pair, key_set):
+    claims = await google_id_token.verify_google_id_token(
+        make_token(key_pair), AUDIENCE
+    )
+
+    assert claims["sub"] == "1234567890"
+    assert claims["email"] == "user@example.com"
+    assert key_set.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_cached(key_pair, key_set):
+    for _ in range(3):
+        await google_id_token.verify_google_id_token(make_token(key_pair), AUDIENCE)
+
+    assert key_set.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_wrong_audience(key_pair, key_set):
+    token = make_token(key_pair, audience="another-client")
+
+    with pytest.raises(ValueError):
+        await google_id_token.verify_google_id_token(token, AUDIENCE)
+
+
+@pytest.mark.asyncio
+async def test_expired_token(key_pair, key_set):
+    token = make_token(key_pair, expires_in=-3600)
+
+    with pytest.raises(ValueError):
+        await google_id_token.verify_google_id_token(token, AUDIENCE)
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid(key_pair, key_set):
+    await google_id_token.verify_google_id_token(make_token(key_pair), AUDIENCE)
+
+    with pytest.raises(ValueError):
+        await google_id_token.verify_google_id_token(
+            make_token(key_pair, kid="rotated-key"), AUDIENCE
+        )
+    # A fresh key set is not refetched for every unknown kid
+    assert key_set.fetches == 1
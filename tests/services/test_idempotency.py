@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from prisma.errors import UniqueViolationError
+
+from services import idempotency
+from services.idempotency import (
+    COMPLETED,
+    PENDING,
+    IdempotencyConflict,
+    IdempotencyStore,
+)
+
+
+class FakeRecords:
+    """In-memory `db.idempotencyrecord` with the calls the store makes."""
+
+    def __init__(self):
+        self.rows = {}
+        # Rows "another replica" inserts just before our next `create`
+        self.racing = []
+
+    async def find_unique(self, where):
+        key = where["scope_key"]
+        return self.rows.get((key["scope"], key["key"]))
+
+    def _matches(self, row, where):
+        if (row.scope, row.key) != (where["scope"], where["key"]):
+            return False
+        if "status" in where and row.status != where["status"]:
+            return False
+        return "expiresAt" not in where or row.expiresAt <= where["expiresAt"]["lte"]
+
+    async def delete_many(self, where):
+        matched = [k for k, row in self.rows.items() if self._matches(row, where)]
+        for k in matched:
+            del self.rows[k]
+        return len(matched)
+
+    async def create(self, data):
+        key = (data["scope"], data["key"])
+        if self.racing:
+            self.racing.pop(0)
+            raise UniqueViolationError({}, message="claimed elsewhere")
+        if key in self.rows:
+            raise UniqueViolationError({}, message="duplicate")
+        self.rows[key] = SimpleNamespace(result=None, **data)
+
+    async def update_many(self, where, data):
+        matched = [row for row in self.rows.values() if self._matches(row, where)]
+        for row in matched:
+            row.__dict__.update(data)
+        return len(matched)
+
+
+@pytest.fixture
+def records(monkeypatch):
+    records = FakeRecords()
+    db = SimpleNamespace(idempotencyrecord=records)
+
+    async def get_db():
+        return db
+
+    monkeypatch.setattr(idempotency, "get_db", get_db)
+    return records
+
+
+class Send:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"message_id": f"m{self.calls}"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_replays_the_result(records):
+    store, send = IdempotencyStore(), Send()
+
+    first = await store.run("send", "k", "fp", send)
+    # A fresh store (another replica) replays from the database
+    second = await IdempotencyStore().run("send", "k", "fp", send)
+
+    assert first == ({"message_id": "m1"}, False)
+    assert second == ({"message_id": "m1"}, True)
+    assert send.calls == 1
+    assert records.rows[("send", "k")].status == COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_different_arguments_conflict(records):
+    store = IdempotencyStore()
+    await store.run("send", "k", "fp", Send())
+
+    with pytest.raises(IdempotencyConflict):
+        await store.run("send", "k", "other", Send())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_attempt(records):
+    store, send = IdempotencyStore(), Send(delay=0.05)
+
+    results = await asyncio.gather(
+        *(store.run("send", "k", "fp", send) for _ in range(5))
+    )
+
+    assert send.calls == 1
+    assert [replayed for _, replayed in results].count(False) == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_released_by_racing_attempt_is_claimed_again(records):
+    """The other attempt's claim is gone by the time we look: claim again."""
+    records.racing = [True]
+    send = Send()
+
+    result = await IdempotencyStore().run("send", "k", "fp", send)
+
+    assert result == ({"message_id": "m1"}, False)
+    assert send.calls == 1
+    assert records.rows[("send", "k")].status == COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_failure_releases_the_claim(records):
+    async def fail():
+        raise RuntimeError("Gmail down")
+
+    store = IdempotencyStore()
+    with pytest.raises(RuntimeError):
+        await store.run("send", "k", "fp", fail)
+
+    assert ("send", "k") not in records.rows
+    assert (await store.run("send", "k", "fp", Send()))[1] is False
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_the_claim(records):
+    store, send = IdempotencyStore(), Send(delay=0.1)
+
+    caller = asyncio.create_task(store.run("send", "k", "fp", send))
+    await asyncio.sleep(0.02)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert records.rows[("send", "k")].status == PENDING
+
+    # The retry waits for the running attempt instead of sending again
+    result = await store.run("send", "k", "fp", send)
+
+    assert result == ({"message_id": "m1"}, True)
+    assert send.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lapsed_claim_is_taken_over(records):
+    records.rows[("send", "k")] = SimpleNamespace(
+        scope="send",
+        key="k",
+        fingerprint="fp",
+        status=PENDING,
+        result=None,
+        expiresAt=datetime.now(timezone.utc) - timedelta(seconds=1),
+    )
+    send = Send()
+
+    result = await IdempotencyStore().run("send", "k", "fp", send)
+
+    assert result == ({"message_id": "m1"}, False)
+    assert send.calls == 1
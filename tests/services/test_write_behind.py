@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from config.settings_config import get_settings
+from services import write_behind
+from services.write_behind import WriteBehind
+
+
+class FakeDb:
+    """Records the token updates and audit inserts of each flush."""
+
+    def __init__(self):
+        self.token_batches = []
+        self.audit_batches = []
+        self.down = False
+        self.usertoken = self
+        self.sendaudit = self
+        self._batch = None
+
+    def batch_(self):
+        return self
+
+    async def __aenter__(self):
+        self._batch = []
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if exc_info[0] is None:
+            if self.down:
+                raise ConnectionError("database unavailable")
+            self.token_batches.append(self._batch)
+        return False
+
+    def update_many(self, where, data):
+        self._batch.append((where, data))
+
+    async def create_many(self, data):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.audit_batches.append(data)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setenv("WRITE_BEHIND_FLUSH_THRESHOLD", "5")
+    monkeypatch.setenv("WRITE_BEHIND_MAX_PENDING", "8")
+    get_settings.cache_clear()
+    db = FakeDb()
+
+    async def get_db():
+        return db
+
+    monkeypatch.setattr(write_behind, "get_db", get_db)
+    yield db
+    get_settings.cache_clear()
+
+
+def test_token_update_requires_expiry():
+    with pytest.raises(ValueError):
+        WriteBehind().update_token("t1", {"accessToken": "a"})
+
+
+@pytest.mark.asyncio
+async def test_token_updates_coalesce_and_skip_later_stored_expiry(db):
+    writes = WriteBehind()
+    writes.update_token("t1", {"accessToken": "a1", "expiry": 1})
+    writes.update_token("t2", {"accessToken": "b1", "expiry": 1})
+    writes.update_token("t1", {"accessToken": "a2", "expiry": 2})
+
+    await writes.flush()
+
+    assert db.token_batches == [
+        [
+            ({"id": "t2", "expiry": {"lt": 1}}, {"accessToken": "b1", "expiry": 1}),
+            ({"id": "t1", "expiry": {"lt": 2}}, {"accessToken": "a2", "expiry": 2}),
+        ]
+    ]
+    assert writes.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_audits_are_inserted_in_batches(db, monkeypatch):
+    monkeypatch.setattr(write_behind, "AUDIT_INSERT_BATCH", 2)
+    writes = WriteBehind()
+    for n in range(3):
+        writes.add_send_audit("t1", "send_gmail", f"m{n}", 1)
+
+    await writes.flush()
+
+    assert [[row["messageId"] for row in rows] for rows in db.audit_batches] == [
+        ["m0", "m1"],
+        ["m2"],
+    ]
+    assert db.audit_batches[0][0]["userTokenId"] == "t1"
+
+
+@pytest.mark.asyncio
+async def test_reaching_the_threshold_starts_a_flush(db):
+    writes = WriteBehind()
+    for n in range(4):
+        writes.add_send_audit("t1", "send_gmail", f"m{n}", 1)
+    await asyncio.sleep(0)
+    assert db.audit_batches == []
+
+    writes.add_send_audit("t1", "send_gmail", "m4", 1)
+    await writes._flush_task
+
+    assert len(db.audit_batches[0]) == 5
+    assert writes.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_buffered_again_and_newer_updates_win(db):
+    writes = WriteBehind()
+    writes.update_token("t1", {"accessToken": "a1", "expiry": 1})
+    writes.update_token("t2", {"accessToken": "b1", "expiry": 1})
+    writes.add_send_audit("t1", "send_gmail", "m0", 1)
+    db.down = True
+
+    await writes.flush()
+    assert writes.pending == 3
+
+    writes.update_token("t1", {"accessToken": "a2", "expiry": 2})
+    db.down = False
+    await writes.flush()
+
+    assert {
+        where["id"]: data["accessToken"] for where, data in db.token_batches[0]
+    } == {"t1": "a2", "t2": "b1"}
+    assert [row["messageId"] for row in db.audit_batches[0]] == ["m0"]
+    assert writes.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_oldest_writes_are_dropped_beyond_max_pending(db):
+    writes = WriteBehind()
+    db.down = True
+    for n in range(12):
+        writes.add_send_audit("t1", "send_gmail", f"m{n}", 1)
+    await writes._flush_task
+    await writes.flush()
+
+    assert len(writes._audits) == 8
+    db.down = False
+    await writes.flush()
+    assert [row["messageId"] for row in db.audit_batches[0]] == [
+        f"m{n}" for n in range(4, 12)
+    ]